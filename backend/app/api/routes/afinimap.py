@@ -8,11 +8,13 @@ Excel TGI de Kantar Ibope Media.
 
 import logging
 from typing import Dict, Any
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.executor import cpu_executor
+from app.core.uploads import UploadEnDisco, upload_en_disco
 from app.api.deps import get_current_user, require_module
 from app.models.user import User
 from app.processors.afinimap_processor import AfinimapProcessor, generar_afinimap_matplotlib
@@ -21,11 +23,14 @@ logger = logging.getLogger('afinimap.api')
 
 router = APIRouter()
 
+# Excel TGI copiado a disco (se rechaza apenas supera los 50MB)
+excel_tgi = upload_en_disco("excel", [".xlsx", ".xls"], 50, "Archivo")
+
 
 @router.post("/procesar-excel")
 async def procesar_excel(
-    excel: UploadFile = File(...),
-    current_user: User = Depends(require_module("AfiniMap"))
+    current_user: User = Depends(require_module("AfiniMap")),
+    excel: UploadEnDisco = Depends(excel_tgi)
 ) -> Dict[str, Any]:
     """
     Procesa archivo Excel TGI y retorna metadatos de variables
@@ -37,7 +42,7 @@ async def procesar_excel(
     - Formato TGI válido
 
     Args:
-        excel: Archivo Excel TGI de Kantar Ibope Media
+        excel: Archivo Excel TGI de Kantar Ibope Media (ya copiado a disco)
 
     Returns:
         {
@@ -58,41 +63,12 @@ async def procesar_excel(
         HTTPException 403: Sin acceso al módulo
         HTTPException 500: Error interno de procesamiento
     """
-    logger.info(f"Usuario {current_user.email} procesando Excel: {excel.filename}")
-
-    # 1. Validar extensión
-    if not excel.filename.endswith(('.xlsx', '.xls')):
-        logger.warning(f"Extensión inválida: {excel.filename}")
-        raise HTTPException(
-            status_code=400,
-            detail="Archivo debe ser Excel (.xlsx o .xls)"
-        )
-
-    # 2. Leer contenido y validar tamaño
-    try:
-        content = await excel.read()
-    except Exception as e:
-        logger.error(f"Error leyendo archivo: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Error leyendo archivo"
-        )
-
-    size_mb = len(content) / (1024 * 1024)
-
-    if size_mb > 50:
-        logger.warning(f"Archivo muy grande: {size_mb:.1f}MB")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Archivo muy grande ({size_mb:.1f}MB). Máximo: 50MB"
-        )
-
-    logger.info(f"Archivo leído: {size_mb:.2f}MB")
+    logger.info(f"Usuario {current_user.email} procesando Excel: {excel.filename} ({excel.tamano_mb:.2f}MB)")
 
-    # 3. Procesar Excel
+    # 1. Procesar Excel (la extensión y el tamaño ya los validó la ingesta)
     try:
         processor = AfinimapProcessor()
-        result = processor.procesar_excel(content)
+        result = processor.procesar_excel(excel.ruta)
 
         logger.info(
             f"Procesamiento exitoso: {len(result['variables'])} variables "
@@ -101,6 +77,8 @@ async def procesar_excel(
 
         return result
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Error de validación: {e}")
         raise HTTPException(
@@ -145,6 +123,7 @@ async def generar_grafico(
     Raises:
         HTTPException 400: Configuración inválida (< 2 variables, colores inválidos)
         HTTPException 500: Error generando gráfico
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After)
     """
     logger.info("Generando gráfico AfiniMap")
 
@@ -178,9 +157,10 @@ async def generar_grafico(
         f"para target '{target_name}'"
     )
 
-    # 3. Generar gráfico
+    # 3. Generar gráfico (matplotlib en el pool de procesos)
     try:
-        img_bytes = generar_afinimap_matplotlib(
+        img_bytes = await cpu_executor.ejecutar(
+            generar_afinimap_matplotlib,
             variables=vars_visibles,
             target_name=target_name,
             linea_afinidad=linea_afinidad,
@@ -197,6 +177,8 @@ async def generar_grafico(
             }
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Error de validación: {e}")
         raise HTTPException(
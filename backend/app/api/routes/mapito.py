@@ -2,17 +2,20 @@
 """
 Endpoints para Mapito - Mapas interactivos de Perú
 """
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional, List, Tuple
+from typing import Literal, Optional, List, Tuple
 from pathlib import Path
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.api.deps import require_module
+from app.core.map_cache import coincide_etag, map_cache
 from app.models.user import User
 from app.processors import mapito_processor as mapito
+from app.processors.gadm_store import clave_nombre, gadm_store
 
 router = APIRouter()
 
@@ -25,24 +28,55 @@ class MapRequest(BaseModel):
     grosor_borde: float = 0.8
     show_borders: bool = True
     show_basemap: bool = True
+    # Detalle de las geometrías: auto elige según la extensión de la vista
+    # (todo Perú → bajo, una región → medio, provincias/distritos → alto)
+    detalle: Literal["auto", "bajo", "medio", "alto"] = "auto"
     # Selecciones opcionales
     regions: Optional[List[str]] = None
     provinces: Optional[List[Tuple[str, str]]] = None
     districts: Optional[List[Tuple[str, str, str]]] = None
 
+
+def _parametros_mapa(request: MapRequest, data_dir: Path) -> dict:
+    """
+    Parámetros que determinan el mapa, normalizados para la clave de caché:
+    colores y nombres en minúsculas, selecciones sin duplicados ni orden
+    (build_map las trata como conjuntos) y la huella de los archivos GADM
+    """
+    parametros = request.model_dump()
+    for campo in ("color_general", "color_selected", "color_border"):
+        parametros[campo] = parametros[campo].strip().lower()
+    parametros["regions"] = sorted({clave_nombre(r) for r in request.regions or []})
+    parametros["provinces"] = sorted({tuple(map(clave_nombre, p)) for p in request.provinces or []})
+    parametros["districts"] = sorted({tuple(map(clave_nombre, d)) for d in request.districts or []})
+    parametros["gadm"] = gadm_store(data_dir).huella()
+    return parametros
+
+
+def _headers_meta(meta: dict) -> dict:
+    return {
+        "X-Map-Regions": str(meta.get("n_regions", 0)),
+        "X-Map-Selected": str(meta.get("n_selected", 0)),
+        "X-Map-Detail": meta.get("detalle", "")
+    }
+
+
 @router.post("/generate", response_class=HTMLResponse)
 async def generate_map(
     request: MapRequest,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(require_module("Mapito"))
 ):
     """
     Generar mapa interactivo de Perú
 
-    Retorna HTML con mapa Folium embebido
+    Retorna HTML con mapa Folium embebido. Los mapas iguales se sirven desde
+    la caché en memoria (app.core.map_cache); con If-None-Match igual al
+    ETag responde 304 sin cuerpo.
     """
     try:
-        # Path a datos GADM
-        data_dir = Path(__file__).parent.parent.parent.parent.parent / "data"
+        # Path a datos GADM (se leen del store en memoria)
+        data_dir = Path(settings.GADM_DATA_DIR)
 
         if not data_dir.exists():
             raise HTTPException(
@@ -50,6 +84,23 @@ async def generate_map(
                 detail=f"Directorio de datos no encontrado: {data_dir}"
             )
 
+        clave = map_cache.clave(_parametros_mapa(request, data_dir))
+        cache_headers = {
+            "ETag": map_cache.etag(clave),
+            "Cache-Control": "private, no-cache"
+        }
+
+        # El ETag sale de los parámetros, no del HTML: se revalida sin renderizar
+        if coincide_etag(if_none_match, cache_headers["ETag"]):
+            return Response(status_code=304, headers=cache_headers)
+
+        mapa = map_cache.obtener(clave)
+        if mapa is not None:
+            return HTMLResponse(
+                content=mapa.contenido,
+                headers={**_headers_meta(mapa.meta), **cache_headers, "X-Map-Cache": "HIT"}
+            )
+
         # Preparar configuraciones
         colores = {
             "fill": request.color_general,
@@ -78,16 +129,16 @@ async def generate_map(
             style=style,
             selections=selections,
             fit_selected=bool(selections),
-            background_color="#ffffff"
+            background_color="#ffffff",
+            detalle=request.detalle
         )
 
+        mapa = map_cache.guardar(clave, html, meta)
+
         # Retornar HTML con metadata en headers
         return HTMLResponse(
-            content=html,
-            headers={
-                "X-Map-Regions": str(meta.get("n_regions", 0)),
-                "X-Map-Selected": str(meta.get("n_selected", 0))
-            }
+            content=mapa.contenido,
+            headers={**_headers_meta(meta), **cache_headers, "X-Map-Cache": "MISS"}
         )
 
     except FileNotFoundError as e:
@@ -106,20 +157,14 @@ async def list_regions(
     current_user: User = Depends(require_module("Mapito"))
 ):
     """
-    Listar todas las regiones disponibles
+    Listar todas las regiones disponibles (índice precalculado del store GADM)
     """
     try:
-        data_dir = Path(__file__).parent.parent.parent.parent.parent / "data"
-        gj1 = mapito._load_gadm(data_dir, 1)
-
-        regions = [
-            feature["properties"]["NAME_1"]
-            for feature in gj1["features"]
-        ]
+        regions = gadm_store().regiones()
 
         return {
             "total": len(regions),
-            "regions": sorted(regions)
+            "regions": regions
         }
 
     except Exception as e:
@@ -134,22 +179,15 @@ async def list_provinces(
     current_user: User = Depends(require_module("Mapito"))
 ):
     """
-    Listar provincias de una región específica
+    Listar provincias de una región específica (índice NAME_1 → provincias)
     """
     try:
-        data_dir = Path(__file__).parent.parent.parent.parent.parent / "data"
-        gj2 = mapito._load_gadm(data_dir, 2)
-
-        provinces = [
-            feature["properties"]["NAME_2"]
-            for feature in gj2["features"]
-            if feature["properties"]["NAME_1"].lower() == region.lower()
-        ]
+        provinces = gadm_store().provincias(region)
 
         return {
             "region": region,
             "total": len(provinces),
-            "provinces": sorted(provinces)
+            "provinces": provinces
         }
 
     except Exception as e:
@@ -157,3 +195,33 @@ async def list_provinces(
             status_code=500,
             detail=f"Error cargando provincias: {str(e)}"
         )
+
+@router.get("/districts/{region}/{province}")
+async def list_districts(
+    region: str,
+    province: str,
+    current_user: User = Depends(require_module("Mapito"))
+):
+    """
+    Listar distritos de una provincia (índice (NAME_1, NAME_2) → distritos)
+    """
+    try:
+        districts = gadm_store().distritos(region, province)
+
+        return {
+            "region": region,
+            "province": province,
+            "total": len(districts),
+            "districts": districts
+        }
+
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Archivo de datos no encontrado: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error cargando distritos: {str(e)}"
+        )
@@ -6,33 +6,71 @@ Procesa archivos de Kantar Ibope Media:
 - Monitor: Inversión publicitaria en medios ATL (TV, Cable, Radio, Revista, Diarios)
 - OutView: Publicidad exterior (OOH)
 - Consolidado: Ambos unificados en Excel con 3 hojas
+- Lote: Varias entregas de cada uno (p. ej. meses) en un solo Excel
+- Dataset: Consolidado acumulado por usuario, al que se agregan entregas
+
+Los endpoints de procesamiento aceptan ?format=parquet|arrow para recibir
+las tablas procesadas en lugar del Excel (un zip si son varias tablas).
 """
 
 import logging
-from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.executor import cpu_executor
+from app.core.jobs import job_store, ESTADOS_ACTIVOS
+from app.core.result_cache import result_cache
+from app.core.output_sink import (
+    MEDIA_TYPE_ARROW, MEDIA_TYPE_PARQUET, MEDIA_TYPE_XLSX, MEDIA_TYPE_ZIP,
+    OutputSink, ruta_temporal, borrar_temporal
+)
+from app.core.uploads import UploadEnDisco, upload_en_disco, uploads_en_disco
 from app.api.deps import get_current_user, require_module
 from app.models.user import User
-from app.processors.monitor_processor import procesar_monitor_txt, MonitorProcessor
-from app.processors.outview_processor import procesar_outview_excel, OutViewProcessor
-from app.processors.excel_generator import generar_excel_mougli_completo
+from app.processors.mougli_tareas import (
+    EntregaProcesada, ErrorTarea, tarea_monitor, tarea_outview, tarea_consolidado, tarea_lote, tarea_job,
+    tarea_entrega, tarea_dataset_agregar, tarea_dataset_excel, tarea_dataset_resumen, tarea_dataset_vaciar
+)
+from app.processors.tabla_writer import EXTENSIONES, FormatoSalida
 
 logger = logging.getLogger('mougli.api')
 
 router = APIRouter()
 
+# Tamaño máximo por archivo subido
+MAX_UPLOAD_MB = 100
+
+# Uploads copiados a disco (se rechazan apenas superan MAX_UPLOAD_MB)
+monitor_txt = upload_en_disco("monitor", [".txt"], MAX_UPLOAD_MB, "Monitor")
+outview_xlsx = upload_en_disco("outview", [".xlsx"], MAX_UPLOAD_MB, "OutView")
+monitor_opcional = upload_en_disco("monitor", [".txt"], MAX_UPLOAD_MB, "Monitor", requerido=False)
+outview_opcional = upload_en_disco("outview", [".xlsx"], MAX_UPLOAD_MB, "OutView", requerido=False)
+
+# Archivos por tipo en /procesar-lote (24 = dos años de entregas mensuales)
+MAX_ARCHIVOS_LOTE = 24
+monitores_lote = uploads_en_disco("monitor", [".txt"], MAX_UPLOAD_MB, "Monitor", MAX_ARCHIVOS_LOTE)
+outviews_lote = uploads_en_disco("outview", [".xlsx"], MAX_UPLOAD_MB, "OutView", MAX_ARCHIVOS_LOTE)
+
+# Formato de salida: ?format=xlsx (por defecto), parquet o arrow
+formato_salida = Query("xlsx", alias="format")
+
+MEDIA_TYPES = {'xlsx': MEDIA_TYPE_XLSX, 'parquet': MEDIA_TYPE_PARQUET, 'arrow': MEDIA_TYPE_ARROW}
+
 
 @router.post("/procesar-monitor")
 async def procesar_monitor(
-    monitor: UploadFile,
-    current_user: User = Depends(require_module("Mougli"))
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad),
+    monitor: UploadEnDisco = Depends(monitor_txt),
+    formato: FormatoSalida = formato_salida
 ) -> StreamingResponse:
     """
-    Procesa archivo Monitor .txt y retorna Excel
+    Procesa archivo Monitor .txt y retorna Excel (o Parquet/Arrow según format)
 
     Valida:
     - Usuario tiene acceso al módulo Mougli
@@ -41,74 +79,34 @@ async def procesar_monitor(
     - Encoding válido (UTF-8, Latin-1, CP1252)
 
     Args:
-        monitor: Archivo .txt de Kantar Ibope Media
+        monitor: Archivo .txt de Kantar Ibope Media (ya copiado a disco)
+        formato: xlsx (por defecto), parquet o arrow
 
     Returns:
-        StreamingResponse con Excel procesado
+        StreamingResponse con Excel procesado (o la tabla en el formato pedido)
 
     Raises:
         HTTPException 400: Archivo inválido (extensión, tamaño, formato)
         HTTPException 403: Sin acceso al módulo
         HTTPException 500: Error interno de procesamiento
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After)
     """
-    logger.info(f"Usuario {current_user.email} procesando Monitor: {monitor.filename}")
-
-    # 1. Validar extensión
-    if not monitor.filename.endswith('.txt'):
-        logger.warning(f"Extensión inválida: {monitor.filename}")
-        raise HTTPException(
-            status_code=400,
-            detail="Archivo debe ser .txt"
-        )
+    logger.info(f"Usuario {current_user.email} procesando Monitor: {monitor.filename} ({monitor.tamano_mb:.2f}MB)")
 
-    # 2. Leer contenido y validar tamaño
-    try:
-        content = await monitor.read()
-        logger.info(f"✅ Archivo leído exitosamente: {len(content)} bytes")
-    except Exception as e:
-        logger.error(f"❌ Error leyendo archivo: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error leyendo archivo: {str(e)}"
-        )
-
-    size_mb = len(content) / (1024 * 1024)
-
-    if size_mb > 100:
-        logger.warning(f"Archivo muy grande: {size_mb:.1f}MB")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Archivo muy grande ({size_mb:.1f}MB). Máximo: 100MB"
-        )
-
-    logger.info(f"Archivo leído: {size_mb:.2f}MB")
-
-    # 3. Detectar encoding y convertir a string
-    file_content = None
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-
-    for encoding in encodings:
-        try:
-            file_content = content.decode(encoding)
-            logger.info(f"Archivo decodificado con encoding: {encoding}")
-            break
-        except UnicodeDecodeError:
-            continue
-
-    if file_content is None:
-        logger.error("No se pudo detectar encoding del archivo")
-        raise HTTPException(
-            status_code=400,
-            detail="No se pudo leer archivo. Encoding inválido. Intenta guardar como UTF-8."
-        )
-
-    # 4. Procesar archivo
+    # 1. Procesar archivo en el pool (detecta el encoding y decodifica en
+    #    streaming, o reutiliza la caché; el Excel se escribe en un temporal)
+    ruta = ruta_temporal(EXTENSIONES[formato])
     try:
         logger.info("🔄 Iniciando procesamiento de Monitor...")
-        excel_output = procesar_monitor_txt(file_content)
+        await cpu_executor.ejecutar(tarea_monitor, monitor, ruta, result_cache, formato)
         logger.info("✅ Procesamiento completado exitosamente")
 
+    except HTTPException:
+        borrar_temporal(ruta)
+        raise
+
     except ValueError as e:
+        borrar_temporal(ruta)
         logger.error(f"❌ Error de validación: {e}", exc_info=True)
         raise HTTPException(
             status_code=400,
@@ -116,6 +114,7 @@ async def procesar_monitor(
         )
 
     except Exception as e:
+        borrar_temporal(ruta)
         logger.error(f"❌ Error procesando Monitor: {e}", exc_info=True)
         logger.error(f"   Tipo de error: {type(e).__name__}")
         logger.error(f"   Args: {e.args}")
@@ -124,23 +123,19 @@ async def procesar_monitor(
             detail=f"Error interno al procesar archivo: {str(e)}"
         )
 
-    # 5. Retornar Excel
-    return StreamingResponse(
-        excel_output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=Monitor_Procesado.xlsx"
-        }
-    )
+    # 2. Retornar Excel (en chunks desde disco)
+    return OutputSink.desde_archivo(ruta).streaming_response(*_salida("Monitor_Procesado", formato))
 
 
 @router.post("/procesar-outview")
 async def procesar_outview(
-    outview: UploadFile,
-    current_user: User = Depends(require_module("Mougli"))
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad),
+    outview: UploadEnDisco = Depends(outview_xlsx),
+    formato: FormatoSalida = formato_salida
 ) -> StreamingResponse:
     """
-    Procesa archivo OutView .xlsx y retorna Excel
+    Procesa archivo OutView .xlsx y retorna Excel (o Parquet/Arrow según format)
 
     Valida:
     - Usuario tiene acceso al módulo Mougli
@@ -149,66 +144,41 @@ async def procesar_outview(
     - Formato Excel válido
 
     Args:
-        outview: Archivo .xlsx de Kantar Ibope Media
+        outview: Archivo .xlsx de Kantar Ibope Media (ya copiado a disco)
+        formato: xlsx (por defecto), parquet o arrow
 
     Returns:
-        StreamingResponse con Excel procesado
+        StreamingResponse con Excel procesado (o la tabla en el formato pedido)
 
     Raises:
         HTTPException 400: Archivo inválido (extensión, tamaño, formato)
         HTTPException 403: Sin acceso al módulo
         HTTPException 500: Error interno de procesamiento
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After)
     """
     logger.info("=" * 80)
     logger.info("🚀 INICIANDO ENDPOINT /procesar-outview")
     logger.info("=" * 80)
     logger.info(f"👤 Usuario: {current_user.email}")
     logger.info(f"📄 Archivo: {outview.filename}")
-    logger.info(f"📦 Content-Type: {outview.content_type}")
-
-    # 1. Validar extensión
-    logger.info("📋 PASO 1: Validando extensión del archivo...")
-    if not outview.filename.endswith('.xlsx'):
-        logger.warning(f"❌ Extensión inválida: {outview.filename}")
-        raise HTTPException(
-            status_code=400,
-            detail="Archivo debe ser .xlsx"
-        )
-    logger.info("✅ Extensión válida: .xlsx")
-
-    # 2. Leer contenido y validar tamaño
-    logger.info("📋 PASO 2: Leyendo contenido del archivo...")
-    try:
-        content = await outview.read()
-        logger.info(f"✅ Archivo leído exitosamente: {len(content)} bytes ({len(content) / 1024:.2f} KB)")
-    except Exception as e:
-        logger.error(f"❌ Error leyendo archivo: {type(e).__name__}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error leyendo archivo: {str(e)}"
-        )
-
-    size_mb = len(content) / (1024 * 1024)
-    logger.info(f"📊 Tamaño del archivo: {size_mb:.2f} MB")
-
-    if size_mb > 100:
-        logger.warning(f"❌ Archivo muy grande: {size_mb:.1f}MB")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Archivo muy grande ({size_mb:.1f}MB). Máximo: 100MB"
-        )
-    logger.info("✅ Tamaño válido (< 100MB)")
+    logger.info(f"📊 Tamaño del archivo: {outview.tamano_mb:.2f} MB")
 
-    # 3. Procesar archivo
-    logger.info("📋 PASO 3: Iniciando procesamiento de OutView...")
-    logger.info(f"🔄 Llamando a procesar_outview_excel() con {len(content)} bytes...")
+    # 1. Procesar archivo (la extensión y el tamaño ya los validó la ingesta)
+    logger.info("📋 PASO 1: Iniciando procesamiento de OutView...")
+    logger.info(f"🔄 Llamando a procesar_outview_excel() con {outview.ruta}...")
 
+    ruta = ruta_temporal(EXTENSIONES[formato])
     try:
-        excel_output = procesar_outview_excel(content)
+        tamano = await cpu_executor.ejecutar(tarea_outview, outview, ruta, result_cache, formato)
         logger.info("✅ Procesamiento completado exitosamente")
-        logger.info(f"📊 Tamaño del Excel generado: {len(excel_output.getvalue())} bytes")
+        logger.info(f"📊 Tamaño del archivo generado ({formato}): {tamano} bytes")
+
+    except HTTPException:
+        borrar_temporal(ruta)
+        raise
 
     except ValueError as e:
+        borrar_temporal(ruta)
         logger.error("=" * 80)
         logger.error(f"❌ ERROR DE VALIDACIÓN en procesar_outview_excel()")
         logger.error(f"   Tipo: {type(e).__name__}")
@@ -221,6 +191,7 @@ async def procesar_outview(
         )
 
     except Exception as e:
+        borrar_temporal(ruta)
         logger.error("=" * 80)
         logger.error(f"❌ ERROR INESPERADO en procesar_outview_excel()")
         logger.error(f"   Tipo: {type(e).__name__}")
@@ -232,46 +203,47 @@ async def procesar_outview(
             detail=f"Error interno al procesar archivo: {str(e)}"
         )
 
-    # 4. Retornar Excel
-    logger.info("📋 PASO 4: Retornando Excel al cliente...")
+    # 2. Retornar Excel
+    logger.info("📋 PASO 2: Retornando Excel al cliente...")
     logger.info("=" * 80)
     logger.info("✅ ENDPOINT /procesar-outview COMPLETADO")
     logger.info("=" * 80)
 
-    return StreamingResponse(
-        excel_output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=OutView_Procesado.xlsx"
-        }
-    )
+    return OutputSink.desde_archivo(ruta).streaming_response(*_salida("OutView_Procesado", formato))
 
 
 @router.post("/procesar-consolidado")
 async def procesar_consolidado(
-    monitor: Optional[UploadFile] = File(None),
-    outview: Optional[UploadFile] = File(None),
-    current_user: User = Depends(require_module("Mougli"))
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad),
+    monitor: Optional[UploadEnDisco] = Depends(monitor_opcional),
+    outview: Optional[UploadEnDisco] = Depends(outview_opcional),
+    formato: FormatoSalida = formato_salida
 ) -> StreamingResponse:
     """
     Procesa Monitor y/o OutView y genera Excel con 1-3 hojas
 
+    Con format=parquet|arrow devuelve las mismas tablas: un archivo con un
+    solo tipo, o SiReset_Mougli.zip con Monitor, OutView y Consolidado.
+
     Hojas generadas:
     - Solo Monitor → 1 hoja (Monitor)
     - Solo OutView → 1 hoja (OutView)
     - Ambos → 3 hojas (Monitor, OutView, Consolidado)
 
     Args:
-        monitor: Archivo .txt Monitor (opcional)
-        outview: Archivo .xlsx OutView (opcional)
+        monitor: Archivo .txt Monitor (opcional, ya copiado a disco)
+        outview: Archivo .xlsx OutView (opcional, ya copiado a disco)
+        formato: xlsx (por defecto), parquet o arrow
 
     Returns:
-        StreamingResponse con Excel SiReset_Mougli.xlsx
+        StreamingResponse con Excel SiReset_Mougli.xlsx (o .parquet/.arrow/.zip)
 
     Raises:
         HTTPException 400: Si no se provee ningún archivo o archivos inválidos
         HTTPException 403: Sin acceso al módulo
         HTTPException 500: Error interno de procesamiento
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After)
     """
 
     logger.info(f"Usuario {current_user.email} procesando Consolidado")
@@ -287,155 +259,33 @@ async def procesar_consolidado(
             detail="Debe proveer al menos un archivo (Monitor o OutView)"
         )
 
-    df_monitor = None
-    df_outview = None
-
-    # ==========================================
-    # Procesar Monitor (si existe)
-    # ==========================================
-
     if monitor is not None:
-        logger.info(f"Procesando Monitor: {monitor.filename}")
-
-        # Validar extensión
-        if not monitor.filename.endswith('.txt'):
-            logger.warning(f"Extensión inválida Monitor: {monitor.filename}")
-            raise HTTPException(
-                status_code=400,
-                detail="Archivo Monitor debe ser .txt"
-            )
-
-        # Leer contenido
-        try:
-            content = await monitor.read()
-            logger.info(f"✅ Monitor leído exitosamente: {len(content)} bytes")
-        except Exception as e:
-            logger.error(f"❌ Error leyendo Monitor: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error leyendo archivo Monitor: {str(e)}"
-            )
-
-        # Validar tamaño
-        size_mb = len(content) / (1024 * 1024)
-        if size_mb > 100:
-            logger.warning(f"Monitor muy grande: {size_mb:.1f}MB")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Monitor muy grande ({size_mb:.1f}MB). Máximo: 100MB"
-            )
-
-        logger.info(f"Monitor leído: {size_mb:.2f}MB")
-
-        # Detectar encoding
-        file_content = None
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-
-        for encoding in encodings:
-            try:
-                file_content = content.decode(encoding)
-                logger.info(f"Monitor decodificado con encoding: {encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
-
-        if file_content is None:
-            logger.error("No se pudo detectar encoding de Monitor")
-            raise HTTPException(
-                status_code=400,
-                detail="No se pudo leer Monitor. Encoding inválido."
-            )
-
-        # Procesar Monitor
-        try:
-            processor = MonitorProcessor()
-            df_monitor = processor.procesar(file_content)
-            logger.info(f"Monitor procesado: {len(df_monitor)} filas")
-
-        except ValueError as e:
-            logger.error(f"Error de validación Monitor: {e}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Monitor inválido: {str(e)}"
-            )
-
-        except Exception as e:
-            logger.error(f"Error procesando Monitor: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error interno procesando Monitor: {str(e)}"
-            )
-
-    # ==========================================
-    # Procesar OutView (si existe)
-    # ==========================================
-
+        logger.info(f"Monitor: {monitor.filename} ({monitor.tamano_mb:.2f}MB)")
     if outview is not None:
-        logger.info(f"Procesando OutView: {outview.filename}")
-
-        # Validar extensión
-        if not outview.filename.endswith('.xlsx'):
-            logger.warning(f"Extensión inválida OutView: {outview.filename}")
-            raise HTTPException(
-                status_code=400,
-                detail="Archivo OutView debe ser .xlsx"
-            )
-
-        # Leer contenido
-        try:
-            content = await outview.read()
-            logger.info(f"✅ OutView leído exitosamente: {len(content)} bytes")
-        except Exception as e:
-            logger.error(f"❌ Error leyendo OutView: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error leyendo archivo OutView: {str(e)}"
-            )
-
-        # Validar tamaño
-        size_mb = len(content) / (1024 * 1024)
-        if size_mb > 100:
-            logger.warning(f"OutView muy grande: {size_mb:.1f}MB")
-            raise HTTPException(
-                status_code=400,
-                detail=f"OutView muy grande ({size_mb:.1f}MB). Máximo: 100MB"
-            )
-
-        logger.info(f"OutView leído: {size_mb:.2f}MB")
-
-        # Procesar OutView
-        try:
-            processor = OutViewProcessor()
-            df_outview = processor.procesar(content)
-            logger.info(f"OutView procesado: {len(df_outview)} filas")
-
-        except ValueError as e:
-            logger.error(f"Error de validación OutView: {e}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"OutView inválido: {str(e)}"
-            )
-
-        except Exception as e:
-            logger.error(f"Error procesando OutView: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error interno procesando OutView: {str(e)}"
-            )
+        logger.info(f"OutView: {outview.filename} ({outview.tamano_mb:.2f}MB)")
 
     # ==========================================
-    # Generar Excel Consolidado
+    # Procesar y generar Excel Consolidado (en el pool)
     # ==========================================
 
+    ruta = ruta_temporal(EXTENSIONES[formato])
     try:
-        logger.info("🔄 Generando Excel consolidado...")
-        excel_output = generar_excel_mougli_completo(
-            df_monitor=df_monitor,
-            df_outview=df_outview
+        logger.info("🔄 Procesando archivos y generando Excel consolidado...")
+        await cpu_executor.ejecutar(
+            tarea_consolidado, monitor, outview, ruta, cache=result_cache, formato=formato
         )
         logger.info("✅ Excel consolidado generado exitosamente")
 
+    except HTTPException:
+        borrar_temporal(ruta)
+        raise
+
+    except ErrorTarea as e:
+        borrar_temporal(ruta)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
     except Exception as e:
+        borrar_temporal(ruta)
         logger.error(f"❌ Error generando Excel consolidado: {e}", exc_info=True)
         logger.error(f"   Tipo de error: {type(e).__name__}")
         logger.error(f"   Args: {e.args}")
@@ -448,14 +298,423 @@ async def procesar_consolidado(
     # Retornar Excel
     # ==========================================
 
-    return StreamingResponse(
-        excel_output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=SiReset_Mougli.xlsx"
-        }
+    varias = monitor is not None and outview is not None
+    return OutputSink.desde_archivo(ruta).streaming_response(*_salida("SiReset_Mougli", formato, varias))
+
+
+@router.post("/procesar-lote")
+async def procesar_lote(
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad),
+    monitores: List[UploadEnDisco] = Depends(monitores_lote),
+    outviews: List[UploadEnDisco] = Depends(outviews_lote),
+    formato: FormatoSalida = formato_salida
+) -> StreamingResponse:
+    """
+    Consolida varias entregas Monitor y/o OutView en un único Excel
+
+    Mismos campos que /procesar-consolidado, repetidos (un campo "monitor"
+    por cada .txt y un "outview" por cada .xlsx). Cada archivo se procesa en
+    su propia tarea del pool, en paralelo; luego las entregas de un mismo
+    tipo se unen en orden: si dos cubren fechas en común, se conservan las
+    filas de la que se envió después.
+
+    Args:
+        monitores: Archivos .txt Monitor, en orden de entrega
+        outviews: Archivos .xlsx OutView, en orden de entrega
+        formato: xlsx (por defecto), parquet o arrow (como en /procesar-consolidado)
+
+    Returns:
+        StreamingResponse con Excel SiReset_Mougli.xlsx (o .parquet/.arrow/.zip)
+
+    Raises:
+        HTTPException 400: Sin archivos, demasiados archivos o archivos inválidos
+        HTTPException 403: Sin acceso al módulo
+        HTTPException 500: Error interno de procesamiento
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After)
+    """
+    logger.info(
+        f"Usuario {current_user.email} procesando lote: "
+        f"{len(monitores)} Monitor, {len(outviews)} OutView"
+    )
+
+    if not monitores and not outviews:
+        raise HTTPException(
+            status_code=400,
+            detail="Debe proveer al menos un archivo (Monitor o OutView)"
+        )
+
+    ruta = ruta_temporal(EXTENSIONES[formato])
+    procesados: List[str] = []
+    try:
+        entregas_monitor, entregas_outview = await _procesar_entregas(monitores, outviews, procesados)
+        await cpu_executor.ejecutar(tarea_lote, entregas_monitor, entregas_outview, ruta, formato=formato)
+        logger.info("✅ Excel del lote generado exitosamente")
+
+    except HTTPException:
+        borrar_temporal(ruta)
+        raise
+
+    except ErrorTarea as e:
+        borrar_temporal(ruta)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    except Exception as e:
+        borrar_temporal(ruta)
+        logger.error(f"❌ Error generando Excel del lote: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generando Excel: {str(e)}"
+        )
+
+    finally:
+        for procesado in procesados:
+            borrar_temporal(procesado)
+
+    varias = bool(monitores) and bool(outviews)
+    return OutputSink.desde_archivo(ruta).streaming_response(*_salida("SiReset_Mougli", formato, varias))
+
+
+async def _procesar_entregas(
+    monitores: List[UploadEnDisco],
+    outviews: List[UploadEnDisco],
+    procesados: List[str]
+) -> Tuple[List[EntregaProcesada], List[EntregaProcesada]]:
+    """
+    Procesa cada archivo de un lote en su propia tarea del pool
+
+    Las tareas se reparten entre los workers (cpu_executor.ejecutar_varios);
+    cada una deja el DataFrame en un Parquet temporal, cuya ruta se agrega a
+    procesados para que el endpoint lo borre al terminar.
+
+    Returns:
+        EntregaProcesada de Monitor y de OutView, en el orden de entrega
+    """
+    archivos = [('Monitor', f) for f in monitores] + [('OutView', f) for f in outviews]
+    rutas = [ruta_temporal('.parquet') for _ in archivos]
+    procesados.extend(rutas)
+
+    entregas = await cpu_executor.ejecutar_varios(
+        tarea_entrega,
+        [(origen, fuente, ruta, result_cache) for (origen, fuente), ruta in zip(archivos, rutas)]
+    )
+    return entregas[:len(monitores)], entregas[len(monitores):]
+
+
+def _salida(base: str, formato: str, varias_tablas: bool = False) -> Tuple[str, str]:
+    """Nombre de archivo y media type de la respuesta (zip si son varias tablas)"""
+    if varias_tablas and formato != 'xlsx':
+        return f"{base}.zip", MEDIA_TYPE_ZIP
+    return f"{base}{EXTENSIONES[formato]}", MEDIA_TYPES[formato]
+
+
+# ==========================================
+# Dataset consolidado incremental
+# ==========================================
+
+@router.post("/dataset")
+async def agregar_al_dataset(
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad),
+    monitores: List[UploadEnDisco] = Depends(monitores_lote),
+    outviews: List[UploadEnDisco] = Depends(outviews_lote)
+) -> Dict[str, Any]:
+    """
+    Agrega entregas Monitor y/o OutView al dataset consolidado del usuario
+
+    Mismos campos que /procesar-lote (cada archivo se procesa en su propia
+    tarea del pool). Solo se reescriben los meses que cubren las entregas:
+    dentro de cada tipo, las filas ya guardadas en el rango de fechas de la
+    entrega nueva se reemplazan por las nuevas.
+
+    Returns:
+        {"filas_agregadas", "filas_reemplazadas", "filas_sin_fecha",
+         "particiones", "dataset"}
+
+    Raises:
+        HTTPException 400: Sin archivos, demasiados archivos o archivos inválidos
+        HTTPException 403: Sin acceso al módulo
+        HTTPException 500: Error interno de procesamiento
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After) o
+            DATASET_DIR sin configurar
+    """
+    ruta_dataset = _ruta_dataset(current_user)
+    logger.info(
+        f"Usuario {current_user.email} agregando al dataset: "
+        f"{len(monitores)} Monitor, {len(outviews)} OutView"
+    )
+
+    if not monitores and not outviews:
+        raise HTTPException(
+            status_code=400,
+            detail="Debe proveer al menos un archivo (Monitor o OutView)"
+        )
+
+    procesados: List[str] = []
+    try:
+        entregas_monitor, entregas_outview = await _procesar_entregas(monitores, outviews, procesados)
+        cambios = await cpu_executor.ejecutar(
+            tarea_dataset_agregar, ruta_dataset, entregas_monitor, entregas_outview
+        )
+
+    except HTTPException:
+        raise
+
+    except ErrorTarea as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    except Exception as e:
+        logger.error(f"❌ Error actualizando dataset: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error actualizando dataset: {str(e)}"
+        )
+
+    finally:
+        for procesado in procesados:
+            borrar_temporal(procesado)
+
+    logger.info(f"✅ Dataset actualizado: particiones {', '.join(cambios['particiones']) or '-'}")
+    return cambios
+
+
+@router.get("/dataset")
+async def resumen_dataset(
+    current_user: User = Depends(require_module("Mougli"))
+) -> Dict[str, Any]:
+    """
+    Resumen del dataset del usuario (solo lee los metadatos de cada partición)
+
+    Corre en el pool, fuera del event loop.
+
+    Returns:
+        {"filas", "fecha_min", "fecha_max", "marcas", "particiones": [...]}
+
+    Raises:
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After) o
+            DATASET_DIR sin configurar
+    """
+    return await cpu_executor.ejecutar(tarea_dataset_resumen, _ruta_dataset(current_user))
+
+
+@router.get("/dataset/excel")
+async def descargar_dataset(
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad)
+) -> StreamingResponse:
+    """
+    Descarga el dataset como Excel con la hoja Consolidado
+
+    Raises:
+        HTTPException 404: Dataset vacío
+        HTTPException 500: Error generando el Excel
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After) o
+            DATASET_DIR sin configurar
+    """
+    ruta_dataset = _ruta_dataset(current_user)
+    ruta = ruta_temporal()
+    try:
+        await cpu_executor.ejecutar(tarea_dataset_excel, ruta_dataset, ruta)
+
+    except HTTPException:
+        borrar_temporal(ruta)
+        raise
+
+    except ErrorTarea as e:
+        borrar_temporal(ruta)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    except Exception as e:
+        borrar_temporal(ruta)
+        logger.error(f"❌ Error generando Excel del dataset: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generando Excel: {str(e)}"
+        )
+
+    return OutputSink.desde_archivo(ruta).streaming_response("SiReset_Mougli_Dataset.xlsx")
+
+
+@router.delete("/dataset")
+async def vaciar_dataset(
+    current_user: User = Depends(require_module("Mougli"))
+) -> Dict[str, Any]:
+    """
+    Borra todas las particiones del dataset del usuario
+
+    Corre en el pool: si hay un agregado en curso espera su bloqueo sin
+    frenar el event loop.
+
+    Raises:
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After) o
+            DATASET_DIR sin configurar
+    """
+    await cpu_executor.ejecutar(tarea_dataset_vaciar, _ruta_dataset(current_user))
+    logger.info(f"Usuario {current_user.email} vació su dataset")
+    return {"status": "deleted"}
+
+
+def _ruta_dataset(user: User) -> str:
+    """
+    Directorio del dataset de un usuario
+
+    Raises:
+        HTTPException 503: DATASET_DIR sin configurar (el dataset necesita
+            almacenamiento persistente, no el temporal de la instancia)
+    """
+    if not settings.DATASET_DIR:
+        raise HTTPException(
+            status_code=503,
+            detail="Dataset no disponible: el servidor no tiene DATASET_DIR configurado"
+        )
+    return os.path.join(settings.DATASET_DIR, str(user.id))
+
+
+# ==========================================
+# Jobs asíncronos
+# ==========================================
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def crear_job(
+    current_user: User = Depends(require_module("Mougli")),
+    _capacidad: None = Depends(cpu_executor.verificar_capacidad),
+    monitor: Optional[UploadEnDisco] = Depends(monitor_opcional),
+    outview: Optional[UploadEnDisco] = Depends(outview_opcional)
+) -> Dict[str, Any]:
+    """
+    Encola el procesamiento consolidado y responde de inmediato con el id del job
+
+    Mismo resultado que /procesar-consolidado, pero el cliente consulta el
+    avance en GET /jobs/{job_id} y descarga el Excel de GET /jobs/{job_id}/resultado.
+
+    Args:
+        monitor: Archivo .txt Monitor (opcional)
+        outview: Archivo .xlsx OutView (opcional)
+
+    Returns:
+        {"job_id", "status", "status_url", "download_url"}
+
+    Raises:
+        HTTPException 400: Si no se provee ningún archivo o archivos inválidos
+        HTTPException 403: Sin acceso al módulo
+        HTTPException 503: Pool de procesamiento lleno (con Retry-After)
+    """
+    logger.info(f"Usuario {current_user.email} creando job Mougli")
+
+    if monitor is None and outview is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Debe proveer al menos un archivo (Monitor o OutView)"
+        )
+
+    job_id = job_store.crear(current_user.id, "SiReset_Mougli.xlsx")
+    job_dir = job_store.ruta(job_id)
+
+    # Los uploads ya están en disco: se mueven al directorio del job
+    if monitor is not None:
+        monitor.mover_a(job_dir / "uploads" / "monitor.txt")
+    if outview is not None:
+        outview.mover_a(job_dir / "uploads" / "outview.xlsx")
+
+    job_store.lanzar(
+        job_id,
+        tarea_job,
+        monitor,
+        outview,
+        str(job_dir / "SiReset_Mougli.xlsx"),
+        result_cache,
+        errores=_mensaje_error_job
     )
 
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/mougli/jobs/{job_id}",
+        "download_url": f"/api/mougli/jobs/{job_id}/resultado"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def estado_job(
+    job_id: str,
+    current_user: User = Depends(require_module("Mougli"))
+) -> Dict[str, Any]:
+    """
+    Avance del job: {"status", "step", "total", "message", ...}
+
+    status: queued | running | done | error
+
+    Raises:
+        HTTPException 404: Job inexistente, expirado o de otro usuario
+    """
+    _verificar_dueno(job_id, current_user)
+    return {"job_id": job_id, **job_store.leer_progreso(job_id)}
+
+
+@router.get("/jobs/{job_id}/resultado")
+async def descargar_job(
+    job_id: str,
+    current_user: User = Depends(require_module("Mougli"))
+) -> FileResponse:
+    """
+    Descarga el Excel de un job terminado (se puede descargar hasta que expire)
+
+    Raises:
+        HTTPException 404: Job inexistente, expirado o de otro usuario
+        HTTPException 409: El job todavía no terminó o terminó con error
+    """
+    _verificar_dueno(job_id, current_user)
+
+    progreso = job_store.leer_progreso(job_id)
+    if progreso.get("status") != "done":
+        raise HTTPException(
+            status_code=409,
+            detail=f"El job no tiene resultado (estado: {progreso.get('status')})"
+        )
+
+    ruta = job_store.ruta_resultado(job_id)
+    if ruta is None or not ruta.exists():
+        raise HTTPException(status_code=404, detail="Resultado no encontrado")
+
+    return FileResponse(ruta, media_type=MEDIA_TYPE_XLSX, filename=ruta.name)
+
+
+@router.delete("/jobs/{job_id}")
+async def eliminar_job(
+    job_id: str,
+    current_user: User = Depends(require_module("Mougli"))
+) -> Dict[str, Any]:
+    """
+    Borra un job terminado y sus archivos
+
+    Raises:
+        HTTPException 404: Job inexistente, expirado o de otro usuario
+        HTTPException 409: El job sigue en curso
+    """
+    _verificar_dueno(job_id, current_user)
+
+    if job_store.en_curso(job_id) or job_store.leer_progreso(job_id).get("status") in ESTADOS_ACTIVOS:
+        raise HTTPException(status_code=409, detail="El job sigue en curso")
+
+    job_store.eliminar(job_id)
+    return {"job_id": job_id, "status": "deleted"}
+
+
+def _verificar_dueno(job_id: str, user: User) -> None:
+    """404 si el job no existe o no es del usuario (no revela jobs ajenos)"""
+    meta = job_store.leer_meta(job_id)
+    if meta is None or meta.get("dueno") != user.id:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+
+
+def _mensaje_error_job(e: Exception) -> str:
+    """Mensaje de error que verá el usuario en el progreso del job"""
+    if isinstance(e, ErrorTarea):
+        return e.detail
+    if isinstance(e, HTTPException):
+        return str(e.detail)
+    return f"Error interno procesando archivos: {str(e)}"
+
 
 @router.get("/health")
 async def health_check():
@@ -471,6 +730,12 @@ async def health_check():
         "endpoints": {
             "procesar-monitor": "POST /api/mougli/procesar-monitor",
             "procesar-outview": "POST /api/mougli/procesar-outview",
-            "procesar-consolidado": "POST /api/mougli/procesar-consolidado"
+            "procesar-consolidado": "POST /api/mougli/procesar-consolidado",
+            "procesar-lote": "POST /api/mougli/procesar-lote",
+            "dataset": "POST|GET|DELETE /api/mougli/dataset",
+            "dataset-excel": "GET /api/mougli/dataset/excel",
+            "jobs": "POST /api/mougli/jobs",
+            "estado-job": "GET /api/mougli/jobs/{job_id}",
+            "resultado-job": "GET /api/mougli/jobs/{job_id}/resultado"
         }
     }
@@ -3,8 +3,10 @@
 Configuración centralizada usando Pydantic Settings
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
+import tempfile
+from pathlib import Path
 
 class Settings(BaseSettings):
     # Básico
@@ -33,8 +35,45 @@ class Settings(BaseSettings):
     # PBKDF2 con iteraciones seguras
     PBKDF2_ITERATIONS: int = 600_000  # NIST 2023 compliant
 
-    # Límites de upload
+    # Límites de upload (por request, contando el body recibido; cada endpoint
+    # tiene además su límite por archivo)
     MAX_UPLOAD_SIZE_MB: int = 500
+    # Uploads copiados a disco por chunks (None = directorio temporal del sistema)
+    UPLOAD_TMP_DIR: Optional[str] = os.getenv("UPLOAD_TMP_DIR") or None
+    UPLOAD_CHUNK_KB: int = 1024
+
+    # Archivos de salida: se envían desde disco en chunks de este tamaño
+    OUTPUT_CHUNK_KB: int = 256
+
+    # Pool de procesos para Mougli/AfiniMap (0 = un worker por CPU disponible)
+    CPU_WORKERS: int = int(os.getenv("CPU_WORKERS", "0"))
+    # Tareas que pueden esperar worker antes de responder 503 (-1 = 2 por worker)
+    CPU_MAX_COLA: int = int(os.getenv("CPU_MAX_COLA", "-1"))
+    CPU_RETRY_AFTER_S: int = 30
+
+    # Jobs asíncronos de Mougli (directorio por job, borrado tras el TTL)
+    JOBS_DIR: str = os.getenv("JOBS_DIR", os.path.join(tempfile.gettempdir(), "sireset_jobs"))
+    JOBS_TTL_HORAS: float = float(os.getenv("JOBS_TTL_HORAS", "6"))
+    JOBS_LIMPIEZA_MIN: int = 10
+
+    # Caché de DataFrames procesados (Parquet, LRU por tamaño; 0 = desactivada).
+    # En Cloud Run /tmp vive en memoria: el tope se descuenta del límite de la
+    # instancia (--memory 1Gi en deploy-to-cloudrun.sh) junto con uploads, jobs
+    # y los workers del pool. Subirlo solo con RESULT_CACHE_DIR en disco real.
+    RESULT_CACHE_DIR: str = os.getenv("RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sireset_cache"))
+    RESULT_CACHE_MAX_MB: int = int(os.getenv("RESULT_CACHE_MAX_MB", "128"))
+
+    # Límites GADM de Mapito (gadm41_PER_{1,2,3}.json), precargados al iniciar
+    GADM_DATA_DIR: str = os.getenv("GADM_DATA_DIR", str(Path(__file__).resolve().parents[3] / "data"))
+    # Caché en memoria de mapas renderizados (LRU por tamaño + TTL; 0 = desactivada)
+    MAP_CACHE_MAX_MB: int = int(os.getenv("MAP_CACHE_MAX_MB", "64"))
+    MAP_CACHE_TTL_S: int = int(os.getenv("MAP_CACHE_TTL_S", "900"))
+
+    # Dataset consolidado incremental (Parquet por AÑO/MES, un subdirectorio por usuario).
+    # Debe ser almacenamiento persistente (p. ej. un bucket montado): sin
+    # DATASET_DIR los endpoints /dataset responden 503. En Cloud Run /tmp es por
+    # instancia y en memoria, el historial se perdería al reciclarla.
+    DATASET_DIR: Optional[str] = os.getenv("DATASET_DIR") or None
 
     # Supabase (para autenticación)
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "https://jmzlfdbooafivioaapti.supabase.co")
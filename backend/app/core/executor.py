@@ -0,0 +1,175 @@
+# backend/app/core/executor.py
+"""
+Pool de procesos acotado para trabajo CPU-bound (Mougli, AfiniMap)
+
+Los procesadores (pandas, xlsxwriter, matplotlib) bloquean el event loop si
+se llaman directo desde un endpoint async. cpu_executor los corre en un
+ProcessPoolExecutor de CPU_WORKERS procesos y limita cuántas tareas pueden
+esperar turno: si la cola está llena responde 503 con Retry-After en vez de
+aceptar trabajo que no va a poder atender.
+
+ejecutar_varios reparte un lote (p. ej. un archivo por tarea) entre los
+workers: se admite como una sola tarea y envía hasta CPU_WORKERS a la vez,
+así un lote grande no se rechaza a mitad de camino.
+
+Las funciones y argumentos enviados al pool deben ser picklables (funciones
+de módulo, bytes, str, rutas); los resultados grandes se devuelven en archivo.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+logger = logging.getLogger('sireset.executor')
+
+
+def cpus_disponibles() -> int:
+    """CPUs que el proceso puede usar (respeta cgroups/affinity si existe)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class CPUExecutor:
+    """
+    ProcessPoolExecutor con límite de tareas en espera
+
+    Admite como máximo max_workers tareas corriendo + max_cola esperando.
+    El conteo vive en el event loop (un solo hilo), no necesita locks.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_cola: Optional[int] = None,
+        retry_after: int = 30
+    ):
+        self.max_workers = max_workers or cpus_disponibles()
+        self.max_cola = max_cola if max_cola is not None else 2 * self.max_workers
+        self.retry_after = retry_after
+        self.en_curso = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def capacidad(self) -> int:
+        """Tareas admitidas a la vez (corriendo + en cola)"""
+        return self.max_workers + self.max_cola
+
+    def verificar_capacidad(self) -> None:
+        """
+        Rechaza con 503 si el pool está lleno
+
+        Se llama al inicio de los endpoints para no copiar a disco ni
+        procesar uploads que no se van a poder atender (el body ya fue
+        recibido por Starlette).
+
+        Raises:
+            HTTPException 503: Con header Retry-After
+        """
+        if self.en_curso >= self.capacidad:
+            logger.warning(f"⚠️ Pool saturado: {self.en_curso}/{self.capacidad} tareas")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado procesando otros archivos. Intenta de nuevo en unos segundos.",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+    async def ejecutar(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Corre fn(*args, **kwargs) en un proceso del pool sin bloquear el event loop
+
+        Raises:
+            HTTPException 503: Si el pool está lleno
+            Exception: La excepción que haya lanzado fn (se re-lanza tal cual)
+        """
+        self.verificar_capacidad()
+        return await self._correr(fn, *args, **kwargs)
+
+    async def ejecutar_varios(self, fn: Callable[..., Any], argumentos: Sequence[tuple]) -> List[Any]:
+        """
+        Corre fn(*args) por cada tupla de argumentos, repartidas entre los workers
+
+        Se admite como una sola tarea (verificar_capacidad al entrar) y envía
+        hasta max_workers a la vez; cada una cuenta en en_curso mientras
+        corre. Si una falla no se envían las que faltan y, cuando terminan
+        las que ya corrían, se re-lanza su excepción.
+
+        Returns:
+            Resultados en el orden de argumentos
+
+        Raises:
+            HTTPException 503: Si el pool está lleno
+            Exception: La primera excepción que haya lanzado fn
+        """
+        self.verificar_capacidad()
+
+        turnos = asyncio.Semaphore(self.max_workers)
+        errores: List[BaseException] = []
+
+        async def correr(args: tuple) -> Any:
+            async with turnos:
+                if errores:
+                    return None
+                try:
+                    return await self._correr(fn, *args)
+                except BaseException as e:
+                    errores.append(e)
+                    raise
+
+        resultados = await asyncio.gather(*(correr(args) for args in argumentos), return_exceptions=True)
+        if errores:
+            raise errores[0]
+        return list(resultados)
+
+    def shutdown(self) -> None:
+        """Cierra el pool (al apagar la app)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _correr(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Envía fn al pool (ya admitida) y la cuenta en en_curso mientras corre"""
+        self.en_curso += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._obtener_pool(), functools.partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # Un worker murió (p. ej. OOM): se descarta el pool y se crea otro en la próxima tarea
+            logger.error("❌ Pool de procesos roto, se recreará", exc_info=True)
+            self._descartar_pool()
+            raise
+        finally:
+            self.en_curso -= 1
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # forkserver: los workers no heredan hilos del servidor (uvicorn/anyio)
+            contexto = multiprocessing.get_context('forkserver')
+            contexto.set_forkserver_preload(['app.processors.mougli_tareas', 'app.processors.afinimap_processor'])
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=contexto
+            )
+            logger.info(f"Pool de procesos creado: {self.max_workers} workers, cola máxima {self.max_cola}")
+
+        return self._pool
+
+    def _descartar_pool(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+cpu_executor = CPUExecutor(
+    max_workers=settings.CPU_WORKERS or None,
+    max_cola=settings.CPU_MAX_COLA if settings.CPU_MAX_COLA >= 0 else None,
+    retry_after=settings.CPU_RETRY_AFTER_S
+)
@@ -0,0 +1,261 @@
+# backend/app/core/jobs.py
+"""
+Jobs asíncronos en disco (mismo modelo que JOBS_DIR del app.py Streamlit)
+
+Cada job es un directorio JOBS_DIR/<job_id>/ con:
+- job.json:      dueño y fecha de creación
+- progress.json: {"status", "step", "total", "message", ...}
+- uploads/:      archivos subidos
+- resultado:     archivo generado (p. ej. SiReset_Mougli.xlsx)
+
+El trabajo corre en el pool de app.core.executor; el worker escribe
+progress.json con ProgresoJob y el proceso principal marca done/error al
+terminar. Los jobs sin actividad por más de JOBS_TTL_HORAS se borran.
+
+Un job queued/running que no corre en este proceso quedó cortado por un
+reinicio: al leer su progreso se marca como error.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.executor import cpu_executor
+
+logger = logging.getLogger('sireset.jobs')
+
+PROGRESS_FILE = "progress.json"
+META_FILE = "job.json"
+
+ESTADOS_ACTIVOS = ("queued", "running")
+
+MENSAJE_INTERRUMPIDO = "interrumpido por reinicio"
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _escribir_json(ruta: Path, datos: Dict[str, Any]) -> None:
+    """Escribe JSON de forma atómica (nunca se lee un archivo a medias)"""
+    tmp = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(datos, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, ruta)
+
+
+class ProgresoJob:
+    """
+    Función de progreso (paso, total, mensaje) que escribe progress.json
+
+    Es picklable: se pasa a las tareas del pool y escribe desde el worker.
+    """
+
+    def __init__(self, job_dir: str):
+        self.job_dir = job_dir
+
+    def __call__(self, paso: int, total: int, mensaje: str) -> None:
+        self.escribir(status="running", step=paso, total=total, message=mensaje)
+
+    def escribir(self, **estado: Any) -> None:
+        estado["actualizado"] = datetime.now().isoformat(timespec="seconds")
+        try:
+            _escribir_json(Path(self.job_dir) / PROGRESS_FILE, estado)
+        except FileNotFoundError:
+            # El job se borró (TTL o DELETE) mientras corría
+            pass
+
+
+class JobStore:
+    """Directorio de jobs: crear, leer progreso, lanzar, borrar y expirar"""
+
+    def __init__(self, base_dir: str, ttl_horas: float):
+        self.base_dir = Path(base_dir)
+        self.ttl_s = ttl_horas * 3600
+        self._tareas: Dict[str, asyncio.Task] = {}
+        self._limpieza: Optional[asyncio.Task] = None
+
+    # ---- Directorio y estado ----
+
+    def crear(self, dueno: int, archivo_resultado: str) -> str:
+        """Crea el directorio de un job nuevo y devuelve su id"""
+        job_id = uuid.uuid4().hex
+        job_dir = self.base_dir / job_id
+        (job_dir / "uploads").mkdir(parents=True)
+
+        _escribir_json(job_dir / META_FILE, {
+            "dueno": dueno,
+            "resultado": archivo_resultado,
+            "creado": datetime.now().isoformat(timespec="seconds")
+        })
+        ProgresoJob(str(job_dir)).escribir(status="queued", step=0, total=0, message="En cola…")
+
+        logger.info(f"Job {job_id} creado para usuario {dueno}")
+        return job_id
+
+    def ruta(self, job_id: str) -> Optional[Path]:
+        """Directorio del job, o None si el id no es válido o no existe"""
+        if not _JOB_ID.match(job_id):
+            return None
+        job_dir = self.base_dir / job_id
+        return job_dir if (job_dir / META_FILE).exists() else None
+
+    def leer_meta(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job_dir = self.ruta(job_id)
+        if job_dir is None:
+            return None
+        try:
+            return json.loads((job_dir / META_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def leer_progreso(self, job_id: str) -> Dict[str, Any]:
+        job_dir = self.ruta(job_id)
+        if job_dir is None:
+            return {"status": "unknown", "message": "job inexistente"}
+        try:
+            estado = json.loads((job_dir / PROGRESS_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"status": "unknown", "message": "sin progreso"}
+        except ValueError:
+            return {"status": "unknown", "message": "progress.json corrupto"}
+
+        if estado.get("status") in ESTADOS_ACTIVOS and not self.en_curso(job_id):
+            # Activo en disco pero sin tarea en este proceso: lo cortó un reinicio
+            logger.warning(f"⚠️ Job {job_id} {estado.get('status')} sin tarea: {MENSAJE_INTERRUMPIDO}")
+            estado = {
+                "status": "error",
+                "step": estado.get("step", 0),
+                "total": estado.get("total", 0),
+                "message": MENSAJE_INTERRUMPIDO
+            }
+            ProgresoJob(str(job_dir)).escribir(**estado)
+
+        return estado
+
+    def ruta_resultado(self, job_id: str) -> Optional[Path]:
+        meta = self.leer_meta(job_id)
+        if meta is None:
+            return None
+        return self.base_dir / job_id / meta["resultado"]
+
+    def eliminar(self, job_id: str) -> None:
+        job_dir = self.ruta(job_id)
+        if job_dir is not None:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            logger.info(f"Job {job_id} eliminado")
+
+    # ---- Ejecución ----
+
+    def lanzar(
+        self,
+        job_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        errores: Callable[[Exception], str]
+    ) -> None:
+        """
+        Corre fn(*args, progreso) en el pool sin esperar el resultado
+
+        Args:
+            job_id: Job creado con crear()
+            fn: Tarea picklable; recibe ProgresoJob como último argumento
+            errores: Traduce una excepción de fn al mensaje que verá el usuario
+        """
+        progreso = ProgresoJob(str(self.base_dir / job_id))
+        tarea = asyncio.create_task(self._correr(job_id, progreso, fn, args, errores))
+        self._tareas[job_id] = tarea
+        tarea.add_done_callback(lambda _: self._tareas.pop(job_id, None))
+
+    async def _correr(self, job_id, progreso, fn, args, errores) -> None:
+        inicio = time.monotonic()
+        try:
+            tamano = await cpu_executor.ejecutar(fn, *args, progreso)
+        except Exception as e:
+            logger.error(f"❌ Job {job_id} falló: {type(e).__name__}: {e}")
+            estado = self.leer_progreso(job_id)
+            progreso.escribir(
+                status="error",
+                step=estado.get("step", 0),
+                total=estado.get("total", 0),
+                message=errores(e)
+            )
+            return
+
+        segundos = time.monotonic() - inicio
+        logger.info(f"✅ Job {job_id} terminado en {segundos:.1f}s ({tamano} bytes)")
+        estado = self.leer_progreso(job_id)
+        total = estado.get("total", 0)
+        progreso.escribir(
+            status="done",
+            step=total,
+            total=total,
+            message="Listo",
+            tamano=tamano,
+            segundos=round(segundos, 2)
+        )
+
+    def en_curso(self, job_id: str) -> bool:
+        """True si el job corre (o espera worker) en este proceso"""
+        return job_id in self._tareas
+
+    # ---- Expiración ----
+
+    def limpiar_expirados(self) -> int:
+        """
+        Borra los jobs sin actividad hace más de JOBS_TTL_HORAS
+
+        La actividad es la última escritura de progress.json. Los jobs que
+        siguen corriendo en este proceso no se tocan.
+
+        Returns:
+            Cantidad de jobs borrados
+        """
+        if not self.base_dir.exists():
+            return 0
+
+        limite = time.time() - self.ttl_s
+        borrados = 0
+
+        for job_dir in self.base_dir.iterdir():
+            if not _JOB_ID.match(job_dir.name) or job_dir.name in self._tareas:
+                continue
+            marca = job_dir / PROGRESS_FILE
+            try:
+                ultima = (marca if marca.exists() else job_dir).stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if ultima < limite:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                borrados += 1
+
+        if borrados:
+            logger.info(f"🧹 {borrados} job(s) expirados eliminados")
+        return borrados
+
+    def iniciar_limpieza(self, intervalo_s: float) -> None:
+        """Lanza la limpieza periódica en el event loop (al iniciar la app)"""
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        if self._limpieza is None:
+            self._limpieza = asyncio.create_task(self._limpiar_periodicamente(intervalo_s))
+
+    def detener_limpieza(self) -> None:
+        if self._limpieza is not None:
+            self._limpieza.cancel()
+            self._limpieza = None
+
+    async def _limpiar_periodicamente(self, intervalo_s: float) -> None:
+        while True:
+            try:
+                self.limpiar_expirados()
+            except Exception as e:
+                logger.error(f"Error limpiando jobs: {e}", exc_info=True)
+            await asyncio.sleep(intervalo_s)
+
+
+job_store = JobStore(settings.JOBS_DIR, settings.JOBS_TTL_HORAS)
@@ -0,0 +1,127 @@
+# backend/app/core/map_cache.py
+"""
+Caché en memoria de mapas Mapito ya renderizados
+
+La clave es el SHA-256 de los parámetros normalizados del MapRequest
+(colores, estilo, selecciones en minúsculas y sin duplicados, detalle) más la
+huella de los archivos GADM: dos requests que producen el mismo mapa
+comparten la entrada y un cambio en los límites la invalida.
+
+Las entradas vencen a los MAP_CACHE_TTL_S segundos y, al superar
+MAP_CACHE_MAX_MB, se desalojan las usadas hace más tiempo (LRU).
+
+El ETag se deriva de la clave: es débil porque folium genera ids de
+elementos al azar en cada render, pero el mapa es el mismo. Como no depende
+del HTML, un If-None-Match se puede responder con 304 sin renderizar.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger('sireset.map_cache')
+
+# Subir al cambiar build_map: cambia las claves y los ETag ya entregados
+VERSION_CACHE = 1
+
+
+@dataclass
+class MapaCacheado:
+    """HTML renderizado con su meta (contadores, detalle)"""
+    contenido: bytes
+    meta: Dict[str, Any]
+    creado: float
+
+
+class MapCache:
+    """Caché LRU con TTL, acotada por tamaño, de HTML de mapas"""
+
+    def __init__(self, max_bytes: int, ttl_s: float):
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entradas: "OrderedDict[str, MapaCacheado]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def activa(self) -> bool:
+        return self.max_bytes > 0 and self.ttl_s > 0
+
+    @staticmethod
+    def clave(parametros: Dict[str, Any]) -> str:
+        """SHA-256 de (versión, parámetros normalizados del mapa)"""
+        return hashlib.sha256(json.dumps(
+            {'version': VERSION_CACHE, 'parametros': parametros},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        ).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def etag(clave: str) -> str:
+        return f'W/"{clave[:32]}"'
+
+    def obtener(self, clave: str) -> Optional[MapaCacheado]:
+        """Entrada vigente o None; un acierto la renueva para el LRU"""
+        if not self.activa:
+            return None
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            if time.monotonic() - entrada.creado > self.ttl_s:
+                self._quitar(clave)
+                return None
+            self._entradas.move_to_end(clave)
+
+        logger.info(f"♻️ Mapa en caché: {clave[:12]}")
+        return entrada
+
+    def guardar(self, clave: str, html: str, meta: Dict[str, Any]) -> MapaCacheado:
+        """Guarda el HTML (si entra en el límite) y desaloja lo menos usado"""
+        entrada = MapaCacheado(contenido=html.encode('utf-8'), meta=meta, creado=time.monotonic())
+        if not self.activa or len(entrada.contenido) > self.max_bytes:
+            return entrada
+
+        with self._lock:
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = entrada
+            self._bytes += len(entrada.contenido)
+            while self._bytes > self.max_bytes:
+                self._quitar(next(iter(self._entradas)))
+
+        return entrada
+
+    def vaciar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def _quitar(self, clave: str) -> None:
+        self._bytes -= len(self._entradas.pop(clave).contenido)
+
+
+def coincide_etag(if_none_match: Optional[str], etag: str) -> bool:
+    """Si el header If-None-Match incluye el ETag (comparación débil)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidato.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidato in if_none_match.split(",")
+    )
+
+
+map_cache = MapCache(
+    settings.MAP_CACHE_MAX_MB * 1024 * 1024,
+    settings.MAP_CACHE_TTL_S
+)
@@ -0,0 +1,143 @@
+# backend/app/core/output_sink.py
+"""
+Salida de archivos generados (Excel, Parquet, etc.)
+
+Los archivos los genera otro proceso (pool de app.core.executor): el
+endpoint reserva una ruta con ruta_temporal(), la tarea escribe ahí y el
+endpoint la envuelve con OutputSink.desde_archivo(). Se devuelve al cliente
+en chunks desde disco, así el pico de RAM por request no depende del tamaño
+del archivo generado.
+"""
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import settings
+
+logger = logging.getLogger('sireset.output_sink')
+
+MEDIA_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MEDIA_TYPE_PARQUET = "application/vnd.apache.parquet"
+MEDIA_TYPE_ARROW = "application/vnd.apache.arrow.file"
+MEDIA_TYPE_ZIP = "application/zip"
+
+
+def ruta_temporal(sufijo: str = '.xlsx') -> str:
+    """Reserva un archivo temporal vacío y devuelve su ruta"""
+    fd, ruta = tempfile.mkstemp(prefix='sireset_', suffix=sufijo)
+    os.close(fd)
+    return ruta
+
+
+def borrar_temporal(ruta: str) -> None:
+    """Borra un temporal de ruta_temporal() si todavía existe"""
+    try:
+        os.unlink(ruta)
+    except FileNotFoundError:
+        pass
+
+
+class OutputSink:
+    """
+    Archivo generado (file-like, solo lectura) listo para enviar
+
+    Se convierte en respuesta con streaming_response(), que lo cierra al
+    terminar de enviarlo.
+    """
+
+    def __init__(self, archivo: BinaryIO, chunk_bytes: Optional[int] = None):
+        self.chunk_bytes = chunk_bytes or settings.OUTPUT_CHUNK_KB * 1024
+        self._archivo = archivo
+
+    @classmethod
+    def desde_archivo(cls, ruta: str, chunk_bytes: Optional[int] = None) -> 'OutputSink':
+        """
+        Envuelve un archivo ya escrito en disco (p. ej. por un worker del pool)
+
+        El archivo se abre y se borra del directorio en el acto: queda
+        accesible solo por este sink y el sistema libera el espacio al cerrarlo.
+        """
+        sink = cls(open(ruta, 'rb'), chunk_bytes)
+        os.unlink(ruta)
+        return sink
+
+    # ---- Interfaz file-like (lectura, p. ej. para openpyxl/zipfile) ----
+
+    def read(self, n: int = -1) -> bytes:
+        return self._archivo.read(n)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._archivo.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._archivo.tell()
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    @property
+    def closed(self) -> bool:
+        return self._archivo.closed
+
+    def close(self) -> None:
+        if not self._archivo.closed:
+            self._archivo.close()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- Estado y respuesta ----
+
+    @property
+    def tamano(self) -> int:
+        """Tamaño total escrito en bytes (sin mover la posición actual)"""
+        posicion = self._archivo.tell()
+        fin = self._archivo.seek(0, 2)
+        self._archivo.seek(posicion)
+        return fin
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Itera el contenido desde el inicio en chunks y cierra el archivo al final"""
+        try:
+            self._archivo.seek(0)
+            while True:
+                chunk = self._archivo.read(self.chunk_bytes)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def streaming_response(
+        self,
+        filename: str,
+        media_type: str = MEDIA_TYPE_XLSX
+    ) -> StreamingResponse:
+        """
+        Respuesta con el contenido en chunks (con Content-Length)
+
+        El archivo se cierra al terminar el envío, o en la tarea de fondo si
+        el cliente corta antes de empezar.
+        """
+        tamano = self.tamano
+        logger.info(f"📤 Enviando {filename}: {tamano / 1024:.2f} KB")
+
+        return StreamingResponse(
+            self.iter_chunks(),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Content-Length": str(tamano)
+            },
+            background=BackgroundTask(self.close)
+        )
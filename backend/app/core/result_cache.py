@@ -0,0 +1,254 @@
+# backend/app/core/result_cache.py
+"""
+Caché en disco de DataFrames procesados (Monitor, OutView)
+
+La clave es el SHA-256 de los bytes subidos más el set de factores activo,
+así re-subir el mismo archivo (solo, o junto al otro para el consolidado)
+no vuelve a decodificar, parsear ni factorizar. Cada entrada es un Parquet
+con los metadatos del procesador en el schema; al superar RESULT_CACHE_MAX_MB
+se borran las entradas usadas hace más tiempo (LRU por mtime).
+
+Parquet exige un tipo por columna y el OutView trae columnas object con
+valores mezclados (p. ej. Nro Calle/Cuadra con 12 y '3A'). tabla_tipada
+guarda esas columnas como texto JSON, valor por valor, y anota sus nombres en
+el schema; dataframe_tipado las decodifica, así los números vuelven como
+números (y en el Excel no quedan como texto).
+
+Con el directorio por defecto (tempfile) el tope cuenta como memoria en
+Cloud Run, donde /tmp es un filesystem en RAM: por eso es chico (128 MB)
+salvo que RESULT_CACHE_DIR apunte a un disco y se suba RESULT_CACHE_MAX_MB.
+
+La instancia es picklable (solo guarda rutas y límites): se pasa a las
+tareas del pool y cada worker lee y escribe el directorio directamente.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.config import settings
+
+logger = logging.getLogger('sireset.result_cache')
+
+# Subir al cambiar la lógica de los procesadores: invalida las entradas viejas
+VERSION_CACHE = 1
+
+# Bytes leídos por iteración al hashear archivos
+CHUNK_HASH = 1024 * 1024
+
+# Clave del schema Parquet donde van los metadatos del procesador
+CLAVE_METADATOS = b'sireset.metadatos'
+
+# Clave del schema con las columnas de tipos mezclados guardadas como JSON
+CLAVE_MEZCLADAS = b'sireset.columnas_mezcladas'
+
+
+def huella(content: Union[bytes, BinaryIO]) -> str:
+    """
+    SHA-256 hex del contenido de un archivo
+
+    content puede ser un archivo binario: se lee por chunks y se deja
+    de nuevo en la posición inicial.
+    """
+    h = hashlib.sha256()
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        h.update(content)
+    else:
+        inicio = content.tell()
+        for chunk in iter(lambda: content.read(CHUNK_HASH), b''):
+            h.update(chunk)
+        content.seek(inicio)
+
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Caché LRU acotada por tamaño de DataFrames en Parquet"""
+
+    def __init__(self, directorio: str, max_bytes: int):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+
+    @property
+    def activa(self) -> bool:
+        return self.max_bytes > 0
+
+    def clave(self, origen: str, huella_archivo: str, factores: Dict[str, Any]) -> str:
+        """
+        SHA-256 de (versión, origen, factores, huella del archivo)
+
+        huella_archivo es el SHA-256 hex de los bytes subidos: el que calcula
+        app.core.uploads al recibirlos, o huella() si no se tiene.
+        """
+        h = hashlib.sha256()
+        h.update(json.dumps(
+            {'version': VERSION_CACHE, 'origen': origen, 'factores': factores},
+            sort_keys=True,
+            default=str
+        ).encode('utf-8'))
+        h.update(b'\0')
+        h.update(huella_archivo.encode('ascii'))
+        return h.hexdigest()
+
+    def obtener(self, clave: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        DataFrame y metadatos guardados, o None si no están
+
+        Un acierto renueva la entrada (mtime) para el LRU.
+        """
+        if not self.activa:
+            return None
+
+        ruta = self._ruta(clave)
+        try:
+            tabla = pq.read_table(ruta)
+            os.utime(ruta)
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            return None
+
+        metadatos = json.loads((tabla.schema.metadata or {}).get(CLAVE_METADATOS, b'{}'))
+        df = dataframe_tipado(tabla)
+        logger.info(f"♻️ Caché: acierto {clave[:12]} ({len(df)} filas)")
+        return df, metadatos
+
+    def guardar(self, clave: str, df: pd.DataFrame, metadatos: Dict[str, Any]) -> bool:
+        """
+        Guarda el DataFrame (escritura atómica) y aplica el límite de tamaño
+
+        Returns:
+            False si el DataFrame no se puede serializar (no se cachea)
+        """
+        if not self.activa:
+            return False
+
+        Path(self.directorio).mkdir(parents=True, exist_ok=True)
+        ruta = self._ruta(clave)
+        tmp = f"{ruta}.{os.getpid()}.tmp"
+
+        try:
+            tabla = tabla_tipada(df, {CLAVE_METADATOS: json.dumps(metadatos, default=str).encode('utf-8')})
+            pq.write_table(tabla, tmp)
+            os.replace(tmp, ruta)
+        except (pa.ArrowException, OSError, TypeError) as e:
+            logger.warning(f"⚠️ Caché: no se pudo guardar {clave[:12]}: {e}")
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            return False
+
+        logger.info(f"💾 Caché: guardado {clave[:12]} ({os.path.getsize(ruta) / 1024:.1f} KB)")
+        self._desalojar()
+        return True
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.parquet")
+
+    def _desalojar(self) -> None:
+        """Borra las entradas menos usadas hasta quedar bajo max_bytes"""
+        entradas = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith('.parquet'):
+                try:
+                    st = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                entradas.append((st.st_mtime, st.st_size, entrada.path))
+
+        total = sum(tamano for _, tamano, _ in entradas)
+        if total <= self.max_bytes:
+            return
+
+        for _, tamano, ruta in sorted(entradas):
+            try:
+                os.unlink(ruta)
+            except FileNotFoundError:
+                pass
+            total -= tamano
+            logger.info(f"🧹 Caché: desalojado {os.path.basename(ruta)[:12]}")
+            if total <= self.max_bytes:
+                break
+
+
+def tabla_tipada(df: pd.DataFrame, metadata: Optional[Dict[bytes, bytes]] = None) -> pa.Table:
+    """
+    Tabla Arrow de un DataFrame sin perder tipos (con índice, como from_pandas)
+
+    Las columnas object que Arrow no puede tipar (valores mezclados) se
+    guardan como texto JSON y se listan en el schema para dataframe_tipado.
+    metadata se agrega al schema.
+
+    Raises:
+        TypeError: Si una columna mezclada tiene valores que no son texto,
+            números, booleanos ni fechas
+    """
+    mezcladas = {}
+    for columna in df.columns:
+        serie = df[columna]
+        if serie.dtype != object:
+            continue
+        try:
+            pa.array(serie, from_pandas=True)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            mezcladas[columna] = [None if pd.isna(v) else _valor_a_json(v) for v in serie]
+
+    tabla = pa.Table.from_pandas(df.assign(**mezcladas) if mezcladas else df)
+    return tabla.replace_schema_metadata({
+        **(tabla.schema.metadata or {}),
+        **(metadata or {}),
+        CLAVE_MEZCLADAS: json.dumps(list(mezcladas)).encode('utf-8')
+    })
+
+
+def dataframe_tipado(tabla: pa.Table) -> pd.DataFrame:
+    """
+    DataFrame de una tabla escrita con tabla_tipada (o sin columnas mezcladas)
+
+    Los nulos de las columnas object vuelven como NaN, como los dejan los
+    procesadores.
+    """
+    df = _nulos_como_nan(tabla.to_pandas())
+    for columna in json.loads((tabla.schema.metadata or {}).get(CLAVE_MEZCLADAS, b'[]')):
+        df[columna] = pd.Series(
+            [_valor_desde_json(v) if isinstance(v, str) else np.nan for v in df[columna]],
+            index=df.index,
+            dtype=object
+        )
+    return df
+
+
+def _valor_a_json(valor: Any) -> str:
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, datetime):
+        return json.dumps({'fecha': valor.isoformat()})
+    if isinstance(valor, (str, bool, int, float)):
+        return json.dumps(valor)
+    raise TypeError(f"Valor no serializable en columna mezclada: {type(valor).__name__}")
+
+
+def _valor_desde_json(texto: str) -> Any:
+    valor = json.loads(texto)
+    if isinstance(valor, dict):
+        return pd.Timestamp(valor['fecha'])
+    return valor
+
+
+def _nulos_como_nan(df: pd.DataFrame) -> pd.DataFrame:
+    """Arrow devuelve None en columnas object; los procesadores producen NaN"""
+    for col in df.columns:
+        if df[col].dtype == object and df[col].isna().any():
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+result_cache = ResultCache(
+    settings.RESULT_CACHE_DIR,
+    settings.RESULT_CACHE_MAX_MB * 1024 * 1024
+)
@@ -0,0 +1,289 @@
+# backend/app/core/uploads.py
+"""
+Ingesta de uploads a disco
+
+Starlette recibe el body multipart completo (partes grandes en
+SpooledTemporaryFile) antes de que corran las dependencias. Sobre eso, la
+dependencia upload_en_disco copia cada UploadFile por chunks a un archivo
+temporal propio, valida el límite por archivo del endpoint y calcula el
+SHA-256 mientras copia. Los procesadores reciben la ruta (que pueden abrir,
+leer en streaming o mapear en memoria) en lugar de un blob de bytes.
+
+El límite global MAX_UPLOAD_SIZE_MB se aplica mientras se recibe el body, en
+LimiteUploadMiddleware: por Content-Length si viene, y contando los bytes
+recibidos (también en requests chunked) para cortar con 413 apenas se supera.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Optional, Sequence
+
+from fastapi import File, HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger('sireset.uploads')
+
+
+@dataclass
+class UploadEnDisco:
+    """
+    Upload copiado a un archivo temporal
+
+    Es picklable: se puede pasar tal cual a las tareas del pool.
+    """
+    ruta: str
+    filename: str
+    tamano: int
+    sha256: str
+    temporal: bool = True
+
+    @property
+    def tamano_mb(self) -> float:
+        return self.tamano / (1024 * 1024)
+
+    def mover_a(self, destino: str) -> None:
+        """Mueve el archivo (p. ej. al directorio de un job); ya no se borra al terminar"""
+        shutil.move(self.ruta, destino)
+        self.ruta = str(destino)
+        self.temporal = False
+
+    def borrar(self) -> None:
+        """Borra el temporal (no hace nada si se movió con mover_a)"""
+        if not self.temporal:
+            return
+        try:
+            os.unlink(self.ruta)
+        except FileNotFoundError:
+            pass
+
+
+async def guardar_upload(
+    upload: UploadFile,
+    max_mb: float,
+    origen: str = "Archivo"
+) -> UploadEnDisco:
+    """
+    Copia un UploadFile a un temporal por chunks, hasheando mientras copia
+
+    El body ya fue recibido por Starlette (acotado por LimiteUploadMiddleware);
+    max_mb limita el archivo copiado, no lo que se recibió.
+
+    Args:
+        upload: Archivo recibido
+        max_mb: Tamaño máximo del archivo; la copia se corta en cuanto se supera
+        origen: Nombre del archivo en los mensajes de error
+
+    Raises:
+        HTTPException 400: Si supera max_mb (el temporal se borra)
+        HTTPException 500: Si falla la lectura
+    """
+    max_bytes = int(max_mb * 1024 * 1024)
+    chunk_bytes = settings.UPLOAD_CHUNK_KB * 1024
+    sufijo = os.path.splitext(upload.filename or '')[1]
+
+    fd, ruta = tempfile.mkstemp(prefix='sireset_upload_', suffix=sufijo, dir=settings.UPLOAD_TMP_DIR)
+    h = hashlib.sha256()
+    tamano = 0
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = await upload.read(chunk_bytes)
+                if not chunk:
+                    break
+
+                tamano += len(chunk)
+                if tamano > max_bytes:
+                    logger.warning(f"{origen} muy grande: más de {max_mb:g}MB ({upload.filename})")
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"{origen} muy grande (más de {max_mb:g}MB). Máximo: {max_mb:g}MB"
+                    )
+
+                h.update(chunk)
+                f.write(chunk)
+
+    except HTTPException:
+        os.unlink(ruta)
+        raise
+
+    except Exception as e:
+        os.unlink(ruta)
+        logger.error(f"❌ Error leyendo {origen}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error leyendo archivo {origen}: {str(e)}"
+        )
+
+    logger.info(f"✅ {origen} recibido: {tamano / (1024 * 1024):.2f}MB en disco")
+    return UploadEnDisco(ruta=ruta, filename=upload.filename or '', tamano=tamano, sha256=h.hexdigest())
+
+
+def upload_en_disco(
+    campo: str,
+    extensiones: Sequence[str],
+    max_mb: float,
+    origen: str = "Archivo",
+    requerido: bool = True
+) -> Callable[..., AsyncIterator[Optional[UploadEnDisco]]]:
+    """
+    Dependencia FastAPI: recibe el campo `campo` del form como UploadEnDisco
+
+    El temporal se borra al terminar el request (salvo que se haya movido
+    con mover_a). Si requerido=False y no se envió el campo, entrega None.
+
+    Raises:
+        HTTPException 400: Extensión inválida o archivo demasiado grande
+    """
+    por_defecto = File(... if requerido else None, alias=campo)
+
+    async def dependencia(upload: Optional[UploadFile] = por_defecto) -> AsyncIterator[Optional[UploadEnDisco]]:
+        if upload is None:
+            yield None
+            return
+
+        _validar_extension(upload, extensiones, origen)
+
+        archivo = await guardar_upload(upload, max_mb, origen)
+        try:
+            yield archivo
+        finally:
+            archivo.borrar()
+
+    return dependencia
+
+
+def uploads_en_disco(
+    campo: str,
+    extensiones: Sequence[str],
+    max_mb: float,
+    origen: str = "Archivo",
+    max_archivos: int = 1
+) -> Callable[..., AsyncIterator[List[UploadEnDisco]]]:
+    """
+    Dependencia FastAPI: recibe el campo `campo` repetido como lista de UploadEnDisco
+
+    Cada archivo se valida y copia igual que en upload_en_disco (max_mb es
+    por archivo); si no se envió ninguno entrega una lista vacía. Los
+    temporales se borran al terminar el request.
+
+    Raises:
+        HTTPException 400: Más de max_archivos, extensión inválida o archivo demasiado grande
+    """
+    por_defecto = File([], alias=campo)
+
+    async def dependencia(uploads: List[UploadFile] = por_defecto) -> AsyncIterator[List[UploadEnDisco]]:
+        if len(uploads) > max_archivos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Demasiados archivos {origen} ({len(uploads)}). Máximo: {max_archivos}"
+            )
+
+        for upload in uploads:
+            _validar_extension(upload, extensiones, origen)
+
+        archivos: List[UploadEnDisco] = []
+        try:
+            for upload in uploads:
+                archivos.append(await guardar_upload(upload, max_mb, f"{origen} {upload.filename}"))
+            yield archivos
+        finally:
+            for archivo in archivos:
+                archivo.borrar()
+
+    return dependencia
+
+
+def _validar_extension(upload: UploadFile, extensiones: Sequence[str], origen: str) -> None:
+    if not (upload.filename or '').endswith(tuple(extensiones)):
+        logger.warning(f"Extensión inválida {origen}: {upload.filename}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"{origen} debe ser {' o '.join(extensiones)}"
+        )
+
+
+def content_length_excedido(content_length: Optional[str]) -> bool:
+    """True si el Content-Length declarado supera MAX_UPLOAD_SIZE_MB"""
+    try:
+        return int(content_length) > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    except (TypeError, ValueError):
+        return False
+
+
+RESPUESTA_413 = {
+    "status_code": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    "content": {"detail": f"Request muy grande. Máximo: {settings.MAX_UPLOAD_SIZE_MB}MB"}
+}
+
+
+class UploadExcedido(HTTPException):
+    """
+    El body recibido superó MAX_UPLOAD_SIZE_MB
+
+    Es HTTPException: FastAPI la deja pasar al parsear el form y responde 413.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=RESPUESTA_413["status_code"],
+            detail=RESPUESTA_413["content"]["detail"]
+        )
+
+
+class LimiteUploadMiddleware:
+    """
+    Middleware ASGI: corta el request con 413 al superar MAX_UPLOAD_SIZE_MB
+
+    Rechaza de entrada si el Content-Length declarado lo supera; si no (o si
+    no hay Content-Length, p. ej. chunked), cuenta los bytes que la app va
+    recibiendo y lanza UploadExcedido en cuanto se pasa, sin leer el resto.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length_excedido(content_length.decode("latin-1") if content_length else None):
+            await JSONResponse(**RESPUESTA_413)(scope, receive, send)
+            return
+
+        recibidos = 0
+        respuesta_iniciada = False
+
+        async def recibir() -> Message:
+            nonlocal recibidos
+            mensaje = await receive()
+            if mensaje["type"] == "http.request":
+                recibidos += len(mensaje.get("body", b""))
+                if recibidos > self.max_bytes:
+                    logger.warning(f"Request cortado: más de {settings.MAX_UPLOAD_SIZE_MB}MB recibidos")
+                    raise UploadExcedido()
+            return mensaje
+
+        async def enviar(mensaje: Message) -> None:
+            nonlocal respuesta_iniciada
+            if mensaje["type"] == "http.response.start":
+                respuesta_iniciada = True
+            await send(mensaje)
+
+        try:
+            await self.app(scope, recibir, enviar)
+        except UploadExcedido:
+            # Si nadie la convirtió en respuesta (p. ej. el body se leyó fuera de FastAPI)
+            if respuesta_iniciada:
+                raise
+            await JSONResponse(**RESPUESTA_413)(scope, receive, send)
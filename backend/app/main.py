@@ -9,10 +9,15 @@ from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 import time
 import os
+import tempfile
 from pathlib import Path
 
 from app.api.routes import auth, mougli, mapito, setup, afinimap
 from app.core.config import settings
+from app.core.executor import cpu_executor
+from app.core.jobs import job_store
+from app.core.uploads import LimiteUploadMiddleware
+from app.processors.gadm_store import gadm_store
 
 app = FastAPI(
     title="SiReset API",
@@ -22,6 +27,10 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+# Cortar con 413 los requests que superan MAX_UPLOAD_SIZE_MB mientras se reciben
+# (declarado antes que CORS para que la respuesta 413 lleve sus headers)
+app.add_middleware(LimiteUploadMiddleware)
+
 # CORS - permitir frontend React
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +50,31 @@ async def log_requests(request: Request, call_next):
     print(f"{request.method} {request.url.path} - {response.status_code} - {process_time:.3f}s")
     return response
 
+# Limpieza periódica de jobs Mougli expirados
+@app.on_event("startup")
+async def startup_jobs():
+    job_store.iniciar_limpieza(settings.JOBS_LIMPIEZA_MIN * 60)
+
+# El dataset Mougli necesita un directorio persistente
+@app.on_event("startup")
+def startup_dataset():
+    if not settings.DATASET_DIR:
+        print("WARNING: DATASET_DIR no configurado, /api/mougli/dataset responderá 503")
+    elif Path(settings.DATASET_DIR).resolve().is_relative_to(Path(tempfile.gettempdir()).resolve()):
+        print(f"WARNING: DATASET_DIR ({settings.DATASET_DIR}) está en el directorio temporal: "
+              "el historial se pierde al reciclar la instancia")
+
+# Límites GADM de Mapito en memoria antes del primer request
+@app.on_event("startup")
+def startup_gadm():
+    gadm_store().precargar()
+
+# Cerrar el pool de procesos de Mougli/AfiniMap al apagar
+@app.on_event("shutdown")
+def shutdown_executor():
+    job_store.detener_limpieza()
+    cpu_executor.shutdown()
+
 # Health check para Google Cloud Run
 @app.get("/health")
 async def health_check():
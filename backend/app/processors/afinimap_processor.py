@@ -8,7 +8,7 @@ de burbujas mostrando la relación entre Consumo % (eje X) y Afinidad (eje Y).
 
 import io
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 import matplotlib
@@ -32,12 +32,12 @@ class AfinimapProcessor:
         self.target_name: str = ""
         self.variables: List[Dict[str, Any]] = []
 
-    def procesar_excel(self, excel_content: bytes) -> Dict[str, Any]:
+    def procesar_excel(self, excel_content: Union[bytes, str]) -> Dict[str, Any]:
         """
         Procesa Excel TGI y extrae metadatos de variables
 
         Args:
-            excel_content: Bytes del archivo Excel
+            excel_content: Bytes del archivo Excel, o su ruta en disco
 
         Returns:
             {
@@ -56,7 +56,8 @@ class AfinimapProcessor:
         logger.info("Iniciando procesamiento de Excel TGI")
 
         try:
-            self.df = pd.read_excel(io.BytesIO(excel_content), header=None)
+            origen = io.BytesIO(excel_content) if isinstance(excel_content, bytes) else excel_content
+            self.df = pd.read_excel(origen, header=None)
             logger.info(f"Excel leído: {self.df.shape[0]} filas x {self.df.shape[1]} columnas")
         except Exception as e:
             logger.error(f"Error leyendo Excel: {e}")
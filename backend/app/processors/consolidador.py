@@ -5,14 +5,17 @@ Une datos de Monitor (ATL) y OutView (OOH) en una única hoja consolidada
 con 27 columnas híbridas.
 
 Características:
-- Mapeo de columnas simples y híbridas
-- Ordenamiento por FECHA y MARCA
+- Mapeo de columnas simples y híbridas (sin copiar los DataFrames)
+- Ordenamiento por FECHA y MARCA (orden por fuente + merge)
 - Validaciones de calidad de datos
+- Unión de varias entregas (p. ej. mensuales) de un mismo tipo
 """
 
 import logging
+import numpy as np
 import pandas as pd
-from typing import Optional
+from pandas.api.types import union_categoricals
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger('mougli.consolidador')
 
@@ -125,64 +128,65 @@ MAPEO_HIBRIDO_OUTVIEW = {
 # ==========================================
 
 def consolidar_monitor_outview(
-    df_monitor: pd.DataFrame,
-    df_outview: pd.DataFrame
+    df_monitor: Optional[pd.DataFrame],
+    df_outview: Optional[pd.DataFrame]
 ) -> pd.DataFrame:
     """
     Consolida datos de Monitor y OutView en 27 columnas híbridas
 
+    Cada fuente se ordena por separado (orden estable por FECHA y MARCA) y
+    las dos se intercalan con un merge lineal: en igualdad de claves van
+    primero las filas de Monitor, igual que ordenar la concatenación. Las
+    columnas se toman de los DataFrames sin copiarlos y cada columna final
+    se escribe una sola vez; las columnas que no existen en una fuente
+    quedan con nulos tipados (NaN, NaT) en vez de ''.
+
     Args:
-        df_monitor: DataFrame Monitor procesado (39 columnas)
-        df_outview: DataFrame OutView procesado (33 columnas)
+        df_monitor: DataFrame Monitor procesado (39 columnas), o None
+        df_outview: DataFrame OutView procesado (33 columnas), o None
 
     Returns:
         DataFrame consolidado con 27 columnas ordenado por FECHA y MARCA
 
     Raises:
-        ValueError: Si los DataFrames no tienen las columnas esperadas
+        ValueError: Si ambos DataFrames son None
     """
+    if df_monitor is None and df_outview is None:
+        raise ValueError("Debe proveer al menos Monitor o OutView")
 
-    logger.info(f"Consolidando Monitor ({len(df_monitor)} filas) + OutView ({len(df_outview)} filas)")
-
-    # ==========================================
-    # PASO 1: Preparar Monitor
-    # ==========================================
-
-    df_monitor_cons = _preparar_monitor_para_consolidado(df_monitor)
-    logger.info(f"Monitor preparado: {len(df_monitor_cons)} filas")
+    logger.info(
+        f"Consolidando Monitor ({0 if df_monitor is None else len(df_monitor)} filas) + "
+        f"OutView ({0 if df_outview is None else len(df_outview)} filas)"
+    )
 
     # ==========================================
-    # PASO 2: Preparar OutView
+    # PASO 1: Columnas de cada fuente (vistas, sin copiar)
     # ==========================================
 
-    df_outview_cons = _preparar_outview_para_consolidado(df_outview)
-    logger.info(f"OutView preparado: {len(df_outview_cons)} filas")
+    fuentes = []
+    largos = []
+    if df_monitor is not None:
+        fuentes.append(_columnas_fuente(
+            df_monitor, MAPEO_SIMPLE_MONITOR, MAPEO_HIBRIDO_MONITOR,
+            ('TIPO ELEMENTO', 'Q ELEMENTOS'), 'Monitor'
+        ))
+        largos.append(len(df_monitor))
+    if df_outview is not None:
+        fuentes.append(_columnas_fuente(
+            df_outview, MAPEO_SIMPLE_OUTVIEW, MAPEO_HIBRIDO_OUTVIEW,
+            ('DURACIÓN',), 'OutView'
+        ))
+        largos.append(len(df_outview))
 
     # ==========================================
-    # PASO 3: Concatenar
+    # PASO 2: Ordenar por FECHA y MARCA e intercalar
     # ==========================================
 
-    df_consolidado = pd.concat([
-        df_monitor_cons,
-        df_outview_cons
-    ], ignore_index=True)
-
+    df_consolidado = _intercalar(fuentes, largos)
     logger.info(f"Consolidado: {len(df_consolidado)} filas totales")
 
     # ==========================================
-    # PASO 4: Ordenar por FECHA y MARCA
-    # ==========================================
-
-    df_consolidado = df_consolidado.sort_values(
-        ['FECHA', 'MARCA'],
-        ascending=[True, True]
-    )
-
-    # Resetear índice
-    df_consolidado = df_consolidado.reset_index(drop=True)
-
-    # ==========================================
-    # PASO 5: Validar
+    # PASO 3: Validar
     # ==========================================
 
     warnings = validar_consolidado(df_consolidado)
@@ -195,81 +199,217 @@ def consolidar_monitor_outview(
     return df_consolidado
 
 
+def intercalar_consolidados(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Intercala DataFrames que ya tienen las columnas consolidadas
+
+    Mismo orden que consolidar_monitor_outview: por FECHA y MARCA, y en
+    igualdad de claves primero las filas de los DataFrames anteriores en la
+    lista. Sirve para reunir partes guardadas por separado (p. ej. las
+    particiones de app.processors.dataset_mougli).
+    """
+    fuentes = [{col: df[col] for col in COLUMNAS_CONSOLIDADO if col in df.columns} for df in frames]
+    return _intercalar(fuentes, [len(df) for df in frames])
+
+
 # ==========================================
-# FUNCIONES DE PREPARACIÓN
+# UNIÓN DE ENTREGAS
 # ==========================================
 
-def _preparar_monitor_para_consolidado(df_monitor: pd.DataFrame) -> pd.DataFrame:
+def unir_entregas(frames: List[pd.DataFrame], columna_fecha: str) -> pd.DataFrame:
     """
-    Prepara DataFrame Monitor para consolidación
+    Concatena varias entregas procesadas del mismo tipo (Monitor u OutView)
+
+    Si dos entregas cubren fechas en común, gana la posterior en la lista:
+    de cada entrega se descartan las filas cuya fecha cae dentro del rango
+    [mínima, máxima] de alguna entrega posterior. Las filas sin fecha se
+    conservan. Las columnas categóricas se unen sin pasar a object.
+
+    Args:
+        frames: DataFrames procesados, en orden de entrega
+        columna_fecha: Columna de fecha ('DIA' en Monitor, 'Fecha' en OutView)
+
+    Returns:
+        DataFrame con las entregas concatenadas en orden
+    """
+    if len(frames) == 1:
+        return frames[0]
+
+    partes = []
+    rangos_posteriores = []
+
+    for i, df in reversed(list(enumerate(frames))):
+        fechas = df[columna_fecha]
+
+        pisadas = np.zeros(len(df), dtype=bool)
+        for inicio, fin in rangos_posteriores:
+            pisadas |= fechas.between(inicio, fin).to_numpy()
+
+        if pisadas.any():
+            logger.info(f"Entrega {i + 1}: {pisadas.sum()} filas reemplazadas por entregas posteriores")
+            df = df[~pisadas]
+
+        if fechas.notna().any():
+            rangos_posteriores.append((fechas.min(), fechas.max()))
+        partes.append(df)
+
+    partes.reverse()
+    df_unido = pd.concat(partes, ignore_index=True)
+
+    for col in frames[0].columns:
+        if all(isinstance(p[col].dtype, pd.CategoricalDtype) for p in partes):
+            df_unido[col] = union_categoricals([p[col] for p in partes], ignore_order=True)
+
+    logger.info(f"{len(frames)} entregas unidas: {len(df_unido)} filas")
+    return df_unido
+
+
+# ==========================================
+# FUNCIONES DE PREPARACIÓN
+# ==========================================
 
-    - Renombra columnas simples
-    - Mapea columnas híbridas (lado Monitor)
-    - Agrega columnas OutView como vacías
+def _columnas_fuente(
+    df: pd.DataFrame,
+    mapeo_simple: Dict[str, str],
+    mapeo_hibrido: Dict[str, str],
+    vacias: Tuple[str, ...],
+    origen: str
+) -> Dict[str, pd.Series]:
     """
+    Columna consolidada → Series de la fuente (sin copiar datos)
 
-    df = df_monitor.copy()
+    - Columnas que ya tienen el nombre consolidado
+    - Columnas simples renombradas
+    - Columnas híbridas (lado de la fuente del /)
+    - Las columnas de la otra fuente (vacias) y las que faltan no se
+      incluyen: quedan nulas en el consolidado
+    """
+    columnas = {col: df[col] for col in COLUMNAS_CONSOLIDADO if col in df.columns}
 
-    # 1. Renombrar columnas simples
-    df = df.rename(columns=MAPEO_SIMPLE_MONITOR)
+    for col_origen, col_consolidado in mapeo_simple.items():
+        if col_origen in df.columns:
+            columnas[col_consolidado] = df[col_origen]
 
-    # 2. Mapear columnas híbridas (lado Monitor del /)
-    for col_monitor, col_consolidado in MAPEO_HIBRIDO_MONITOR.items():
-        if col_monitor in df.columns:
-            df[col_consolidado] = df[col_monitor]
+    for col_origen, col_consolidado in mapeo_hibrido.items():
+        if col_origen in df.columns:
+            columnas[col_consolidado] = df[col_origen]
         else:
-            logger.warning(f"Columna {col_monitor} no encontrada en Monitor")
-            df[col_consolidado] = ''
+            logger.warning(f"Columna {col_origen} no encontrada en {origen}")
+            columnas.pop(col_consolidado, None)
 
-    # 3. Agregar columnas específicas de OutView (vacías para Monitor)
-    df['TIPO ELEMENTO'] = ''
-    df['Q ELEMENTOS'] = ''
+    for col in vacias:
+        columnas.pop(col, None)
 
-    # 4. Asegurar que todas las 27 columnas existen
-    for col in COLUMNAS_CONSOLIDADO:
-        if col not in df.columns:
-            df[col] = ''
+    return columnas
 
-    # 5. Seleccionar solo las 27 columnas finales
-    df = df[COLUMNAS_CONSOLIDADO]
 
-    return df
+def _intercalar(fuentes: List[Dict[str, pd.Series]], largos: List[int]) -> pd.DataFrame:
+    """Arma las 27 columnas con las filas de todas las fuentes en su posición final"""
+    posiciones = _posiciones_merge(_claves_orden(fuentes, largos))
+    total = sum(largos)
 
+    return pd.DataFrame({
+        col: _columna_merge([fuente.get(col) for fuente in fuentes], posiciones, total)
+        for col in COLUMNAS_CONSOLIDADO
+    }, copy=False)
 
-def _preparar_outview_para_consolidado(df_outview: pd.DataFrame) -> pd.DataFrame:
+
+def _claves_orden(fuentes: List[Dict[str, pd.Series]], largos: List[int]) -> List[np.ndarray]:
     """
-    Prepara DataFrame OutView para consolidación
+    Clave entera de orden (FECHA, MARCA) por fuente, comparable entre fuentes
 
-    - Renombra columnas simples
-    - Mapea columnas híbridas (lado OutView)
-    - Agrega columnas Monitor como vacías
+    FECHA y MARCA se codifican por rango sobre los valores de todas las
+    fuentes; los nulos van al final, como en sort_values.
     """
+    codigos = []
+    for col in ('FECHA', 'MARCA'):
+        valores = pd.concat([
+            fuente[col] if col in fuente else pd.Series(np.nan, index=range(largo), dtype=object)
+            for fuente, largo in zip(fuentes, largos)
+        ], ignore_index=True)
 
-    df = df_outview.copy()
+        codigo, unicos = pd.factorize(valores, sort=True)
+        codigo[codigo < 0] = len(unicos)
+        codigos.append((codigo.astype(np.int64), len(unicos) + 1))
 
-    # 1. Renombrar columnas simples
-    df = df.rename(columns=MAPEO_SIMPLE_OUTVIEW)
+    (fecha, _), (marca, n_marcas) = codigos
+    clave = fecha * n_marcas + marca
 
-    # 2. Mapear columnas híbridas (lado OutView del /)
-    for col_outview, col_consolidado in MAPEO_HIBRIDO_OUTVIEW.items():
-        if col_outview in df.columns:
-            df[col_consolidado] = df[col_outview]
-        else:
-            logger.warning(f"Columna {col_outview} no encontrada en OutView")
-            df[col_consolidado] = ''
+    limites = np.cumsum([0] + largos)
+    return [clave[inicio:fin] for inicio, fin in zip(limites[:-1], limites[1:])]
+
+
+def _posiciones_merge(claves: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Posición final de cada fila (en su orden original) al intercalar las fuentes
+
+    Cada fuente se ordena de forma estable y la posición de una fila es su
+    rango en la fuente más las filas de las demás que van antes: en claves
+    iguales, las de fuentes anteriores en la lista.
+    """
+    ordenes = [np.argsort(clave, kind='stable') for clave in claves]
+    ordenadas = [clave[orden] for clave, orden in zip(claves, ordenes)]
+
+    posiciones = []
+    for s, (orden, clave) in enumerate(zip(ordenes, ordenadas)):
+        pos = np.arange(len(clave), dtype=np.int64)
+        for t, otra in enumerate(ordenadas):
+            if t != s:
+                pos += np.searchsorted(otra, clave, side='right' if t < s else 'left')
+
+        final = np.empty(len(clave), dtype=np.int64)
+        final[orden] = pos
+        posiciones.append(final)
+
+    return posiciones
+
+
+def _columna_merge(
+    series: List[Optional[pd.Series]],
+    posiciones: List[np.ndarray],
+    total: int
+) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """
+    Arma una columna consolidada escribiendo cada fuente en sus posiciones
+
+    Fuentes sin la columna (None) quedan con el nulo del dtype de la otra.
+    """
+    presentes = [(serie, pos) for serie, pos in zip(series, posiciones) if serie is not None]
 
-    # 3. Agregar columna específica de Monitor (vacía para OutView)
-    df['DURACIÓN'] = ''
+    if not presentes:
+        return np.full(total, np.nan)
 
-    # 4. Asegurar que todas las 27 columnas existen
-    for col in COLUMNAS_CONSOLIDADO:
-        if col not in df.columns:
-            df[col] = ''
+    if len(presentes) == 1:
+        serie, pos = presentes[0]
+        indices = np.full(total, -1, dtype=np.intp)
+        indices[pos] = np.arange(len(serie))
+        return pd.api.extensions.take(_valores(serie), indices, allow_fill=True)
 
-    # 5. Seleccionar solo las 27 columnas finales
-    df = df[COLUMNAS_CONSOLIDADO]
+    if all(isinstance(serie.dtype, pd.CategoricalDtype) for serie, _ in presentes):
+        categorias = union_categoricals([serie for serie, _ in presentes], ignore_order=True).categories
+        codigos = np.empty(total, dtype=np.int32)
+        for serie, pos in presentes:
+            codigos[pos] = serie.cat.set_categories(categorias).cat.codes.to_numpy()
+        return pd.Categorical.from_codes(codigos, dtype=pd.CategoricalDtype(categorias))
 
-    return df
+    # dtype común, el mismo que daría pd.concat
+    dtype = pd.concat([serie.iloc[:0] for serie, _ in presentes]).dtype
+
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        unida = pd.concat([serie for serie, _ in presentes], ignore_index=True)
+        return unida.take(np.argsort(np.concatenate([pos for _, pos in presentes]))).array
+
+    columna = np.empty(total, dtype=dtype)
+    for serie, pos in presentes:
+        columna[pos] = serie.to_numpy(dtype=dtype)
+    return columna
+
+
+def _valores(serie: pd.Series) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """Array de la Series: ExtensionArray para dtypes de pandas, ndarray si no"""
+    if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+        return serie.array
+    return serie.to_numpy()
 
 
 # ==========================================
@@ -336,47 +476,81 @@ def crear_metadatos_consolidado(df_consolidado: pd.DataFrame) -> pd.DataFrame:
         - Fila 2: headers (Descripción, Valor)
         - Filas 3-8: metadatos del consolidado
     """
+    return metadatos_desde_estadisticas(estadisticas_consolidado(df_consolidado))
 
-    total_filas = len(df_consolidado)
 
-    # Rango de fechas
+def estadisticas_consolidado(df_consolidado: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Resumen combinable de un consolidado (o de una parte)
+
+    Guarda los valores únicos (no solo cuántos son) para que los resúmenes
+    de varias partes se puedan unir con combinar_estadisticas sin volver a
+    leer los datos. Es serializable a JSON.
+    """
     fecha_min = df_consolidado['FECHA'].min()
     fecha_max = df_consolidado['FECHA'].max()
 
-    # Formatear fechas
-    if pd.notna(fecha_min) and pd.notna(fecha_max):
-        fecha_min_str = pd.to_datetime(fecha_min).strftime('%d/%m/%Y')
-        fecha_max_str = pd.to_datetime(fecha_max).strftime('%d/%m/%Y')
+    def unicos(columna: str) -> List[str]:
+        return sorted(str(valor) for valor in df_consolidado[columna].dropna().unique())
+
+    return {
+        'filas': len(df_consolidado),
+        'fecha_min': pd.Timestamp(fecha_min).isoformat() if pd.notna(fecha_min) else None,
+        'fecha_max': pd.Timestamp(fecha_max).isoformat() if pd.notna(fecha_max) else None,
+        'marcas': unicos('MARCA'),
+        'sectores': unicos('SECTOR'),
+        'categorias': unicos('CATEGORÍA'),
+        'regiones': unicos('REGIÓN')
+    }
+
+
+def combinar_estadisticas(partes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Une resúmenes de estadisticas_consolidado (de particiones disjuntas)"""
+    fechas_min = [p['fecha_min'] for p in partes if p['fecha_min'] is not None]
+    fechas_max = [p['fecha_max'] for p in partes if p['fecha_max'] is not None]
+
+    combinado = {
+        'filas': sum(p['filas'] for p in partes),
+        'fecha_min': min(fechas_min) if fechas_min else None,
+        'fecha_max': max(fechas_max) if fechas_max else None
+    }
+    for clave in ('marcas', 'sectores', 'categorias', 'regiones'):
+        combinado[clave] = sorted(set().union(*(p[clave] for p in partes)))
+
+    return combinado
+
+
+def metadatos_desde_estadisticas(estadisticas: Dict[str, Any]) -> pd.DataFrame:
+    """Filas 1-8 de la hoja Consolidado a partir de un resumen de estadísticas"""
+
+    # Rango de fechas
+    if estadisticas['fecha_min'] is not None and estadisticas['fecha_max'] is not None:
+        fecha_min_str = pd.Timestamp(estadisticas['fecha_min']).strftime('%d/%m/%Y')
+        fecha_max_str = pd.Timestamp(estadisticas['fecha_max']).strftime('%d/%m/%Y')
         rango_fechas = f"{fecha_min_str} - {fecha_max_str}"
     else:
         rango_fechas = "N/A"
 
-    # Marcas únicas
-    marcas_unicas = df_consolidado['MARCA'].nunique()
-
     # Sectores únicos (primeros 3)
-    sectores_unicos = sorted(df_consolidado['SECTOR'].dropna().unique())
-    sectores = ', '.join(sectores_unicos[:3])
-    if len(sectores_unicos) > 3:
+    sectores = ', '.join(estadisticas['sectores'][:3])
+    if len(estadisticas['sectores']) > 3:
         sectores += '...'
 
     # Categorías únicas (primeras 5)
-    categorias_unicas = sorted(df_consolidado['CATEGORÍA'].dropna().unique())
-    categorias = ', '.join(categorias_unicas[:5])
-    if len(categorias_unicas) > 5:
+    categorias = ', '.join(estadisticas['categorias'][:5])
+    if len(estadisticas['categorias']) > 5:
         categorias += '...'
 
     # Regiones únicas
-    regiones_unicas = sorted(df_consolidado['REGIÓN'].dropna().unique())
-    regiones = ', '.join(regiones_unicas)
+    regiones = ', '.join(estadisticas['regiones'])
 
     # Crear DataFrame de metadatos
     metadatos = pd.DataFrame([
         ['', ''],  # Fila 1 vacía
         ['Descripción', 'Valor'],  # Fila 2: headers
-        ['Filas', total_filas],
+        ['Filas', estadisticas['filas']],
         ['Rango de fechas', rango_fechas],
-        ['Marcas / Anunciantes', marcas_unicas],
+        ['Marcas / Anunciantes', len(estadisticas['marcas'])],
         ['Sectores', sectores],
         ['Categorías', categorias],
         ['Regiones', regiones]
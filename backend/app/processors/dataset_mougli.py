@@ -0,0 +1,264 @@
+"""
+Dataset consolidado incremental de Mougli
+
+Acumula las filas consolidadas (27 columnas) de las entregas Monitor y
+OutView en un directorio Parquet particionado por mes:
+
+    <directorio>/AÑO=2024/MES=03/monitor.parquet
+    <directorio>/AÑO=2024/MES=03/outview.parquet
+
+Agregar una entrega solo reescribe los meses que cubre. Como en
+unir_entregas, la entrega nueva reemplaza las filas de su misma fuente cuyo
+FECHA cae en su rango [mínima, máxima]; las filas de la otra fuente no se
+tocan. Cada archivo se escribe a un temporal y se reemplaza con os.replace.
+
+Cada archivo lleva en el schema Parquet su resumen (estadisticas_consolidado):
+los metadatos del dataset completo se arman leyendo solo esos footers.
+
+Las particiones se escriben con tabla_tipada (app.core.result_cache): las
+columnas con valores mezclados (BREAK / CALLE con números de OutView y texto)
+vuelven con sus tipos y el Excel del dataset sale igual que el de
+/procesar-consolidado.
+
+Las filas sin FECHA no tienen partición y no se guardan (se informan).
+"""
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from app.core.result_cache import dataframe_tipado, tabla_tipada
+
+from .consolidador import (
+    combinar_estadisticas,
+    consolidar_monitor_outview,
+    estadisticas_consolidado,
+    intercalar_consolidados,
+    metadatos_desde_estadisticas
+)
+
+logger = logging.getLogger('mougli.dataset')
+
+# Archivo de cada fuente dentro de una partición (en orden de intercalado)
+ARCHIVOS_FUENTE = {'Monitor': 'monitor.parquet', 'OutView': 'outview.parquet'}
+
+# Clave del schema Parquet con el resumen del archivo
+CLAVE_ESTADISTICAS = b'sireset.estadisticas'
+
+# Mes de una partición: (año, mes)
+Mes = Tuple[int, int]
+
+
+class DatasetMougli:
+    """Dataset consolidado particionado por AÑO/MES en un directorio"""
+
+    def __init__(self, directorio: str):
+        self.directorio = Path(directorio)
+
+    def agregar(
+        self,
+        df_monitor: Optional[pd.DataFrame] = None,
+        df_outview: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Any]:
+        """
+        Agrega entregas procesadas (Monitor y/o OutView) al dataset
+
+        Args:
+            df_monitor: Monitor procesado (una entrega o varias ya unidas)
+            df_outview: OutView procesado (una entrega o varias ya unidas)
+
+        Returns:
+            {"filas_agregadas", "filas_reemplazadas", "filas_sin_fecha",
+             "particiones": ["2024-03", ...]} con los meses reescritos
+        """
+        cambios = {'filas_agregadas': 0, 'filas_reemplazadas': 0, 'filas_sin_fecha': 0, 'particiones': set()}
+
+        with self._bloqueo():
+            for fuente, df in (('Monitor', df_monitor), ('OutView', df_outview)):
+                if df is None or len(df) == 0:
+                    continue
+
+                consolidado = consolidar_monitor_outview(
+                    df if fuente == 'Monitor' else None,
+                    df if fuente == 'OutView' else None
+                )
+                self._agregar_fuente(fuente, consolidado, cambios)
+
+        cambios['particiones'] = [f"{anio:04d}-{mes:02d}" for anio, mes in sorted(cambios['particiones'])]
+        logger.info(
+            f"Dataset {self.directorio}: +{cambios['filas_agregadas']} filas, "
+            f"{cambios['filas_reemplazadas']} reemplazadas en {len(cambios['particiones'])} particiones"
+        )
+        return cambios
+
+    def meses(self) -> List[Mes]:
+        """Meses con datos, en orden"""
+        meses = []
+        for dir_anio in self.directorio.glob('AÑO=*'):
+            for dir_mes in dir_anio.glob('MES=*'):
+                if any((dir_mes / archivo).exists() for archivo in ARCHIVOS_FUENTE.values()):
+                    meses.append((int(dir_anio.name[4:]), int(dir_mes.name[4:])))
+        return sorted(meses)
+
+    def estadisticas(self, mes: Optional[Mes] = None) -> Dict[str, Any]:
+        """
+        Resumen del dataset (o de un mes) leyendo solo los footers Parquet
+
+        Misma forma que estadisticas_consolidado.
+        """
+        meses = [mes] if mes is not None else self.meses()
+        partes = [
+            _leer_estadisticas(ruta)
+            for m in meses
+            for ruta in self._archivos(m)
+        ]
+        return combinar_estadisticas(partes)
+
+    def metadatos(self) -> pd.DataFrame:
+        """Filas 1-8 de la hoja Consolidado para el dataset completo"""
+        return metadatos_desde_estadisticas(self.estadisticas())
+
+    def resumen(self) -> Dict[str, Any]:
+        """Totales y filas/rango por mes (para la API)"""
+        total = self.estadisticas()
+        particiones = []
+        for anio, mes in self.meses():
+            stats = self.estadisticas((anio, mes))
+            particiones.append({
+                'particion': f"{anio:04d}-{mes:02d}",
+                'filas': stats['filas'],
+                'fecha_min': stats['fecha_min'],
+                'fecha_max': stats['fecha_max']
+            })
+
+        return {
+            'filas': total['filas'],
+            'fecha_min': total['fecha_min'],
+            'fecha_max': total['fecha_max'],
+            'marcas': len(total['marcas']),
+            'particiones': particiones
+        }
+
+    def leer(self) -> pd.DataFrame:
+        """Dataset completo con las 27 columnas, ordenado por FECHA y MARCA"""
+        frames = []
+        for mes in self.meses():
+            partes = [_leer_parquet(ruta) for ruta in self._archivos(mes)]
+            frames.append(intercalar_consolidados(partes) if len(partes) > 1 else partes[0])
+
+        if not frames:
+            raise ValueError("El dataset está vacío")
+
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def vaciar(self) -> None:
+        """Borra todas las particiones"""
+        with self._bloqueo():
+            for dir_anio in self.directorio.glob('AÑO=*'):
+                shutil.rmtree(dir_anio, ignore_errors=True)
+
+    # ==========================================
+    # Internos
+    # ==========================================
+
+    def _agregar_fuente(self, fuente: str, consolidado: pd.DataFrame, cambios: Dict[str, Any]) -> None:
+        """Reescribe los meses del rango de la entrega para una fuente"""
+        fechas = consolidado['FECHA']
+        sin_fecha = int(fechas.isna().sum())
+        if sin_fecha:
+            logger.warning(f"{fuente}: {sin_fecha} filas sin FECHA no se agregan al dataset")
+            cambios['filas_sin_fecha'] += sin_fecha
+            consolidado = consolidado[fechas.notna()]
+            fechas = consolidado['FECHA']
+
+        if len(consolidado) == 0:
+            return
+
+        inicio, fin = fechas.min(), fechas.max()
+        periodos = fechas.dt.to_period('M')
+        nuevos_por_mes = {
+            (periodo.year, periodo.month): grupo
+            for periodo, grupo in consolidado.groupby(periodos, sort=False)
+        }
+
+        for periodo in pd.period_range(inicio, fin, freq='M'):
+            mes = (periodo.year, periodo.month)
+            ruta = self._ruta(mes, fuente)
+            partes = []
+
+            if ruta.exists():
+                existente = _leer_parquet(ruta)
+                pisadas = existente['FECHA'].between(inicio, fin).to_numpy()
+                cambios['filas_reemplazadas'] += int(pisadas.sum())
+                if not pisadas.all():
+                    partes.append(existente[~pisadas])
+            elif mes not in nuevos_por_mes:
+                continue
+
+            if mes in nuevos_por_mes:
+                partes.append(nuevos_por_mes[mes])
+                cambios['filas_agregadas'] += len(nuevos_por_mes[mes])
+
+            cambios['particiones'].add(mes)
+            if not partes:
+                ruta.unlink()
+                continue
+
+            df_mes = intercalar_consolidados(partes) if len(partes) > 1 else partes[0].reset_index(drop=True)
+            _escribir_parquet(ruta, df_mes)
+
+    def _ruta(self, mes: Mes, fuente: str) -> Path:
+        anio, numero = mes
+        return self.directorio / f"AÑO={anio:04d}" / f"MES={numero:02d}" / ARCHIVOS_FUENTE[fuente]
+
+    def _archivos(self, mes: Mes) -> List[Path]:
+        """Archivos de un mes, en el orden de intercalado (Monitor primero)"""
+        return [ruta for ruta in (self._ruta(mes, fuente) for fuente in ARCHIVOS_FUENTE) if ruta.exists()]
+
+    @contextmanager
+    def _bloqueo(self) -> Iterator[None]:
+        """Serializa las escrituras al dataset (entre procesos)"""
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        with open(self.directorio / '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _escribir_parquet(ruta: Path, df: pd.DataFrame) -> None:
+    """Escribe la partición con su resumen en el schema (temporal + os.replace)"""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+
+    tabla = tabla_tipada(df, {CLAVE_ESTADISTICAS: json.dumps(estadisticas_consolidado(df)).encode('utf-8')})
+
+    try:
+        pq.write_table(tabla, tmp)
+        os.replace(tmp, ruta)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _leer_parquet(ruta: Path) -> pd.DataFrame:
+    return dataframe_tipado(pq.read_table(ruta))
+
+
+def _leer_estadisticas(ruta: Path) -> Dict[str, Any]:
+    """Resumen guardado en el footer (sin leer los datos)"""
+    metadata = pq.read_schema(ruta).metadata or {}
+    if CLAVE_ESTADISTICAS in metadata:
+        return json.loads(metadata[CLAVE_ESTADISTICAS])
+
+    logger.warning(f"⚠️ {ruta} sin estadísticas en el schema, se leen los datos")
+    return estadisticas_consolidado(_leer_parquet(ruta))
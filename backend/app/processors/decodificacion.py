@@ -0,0 +1,82 @@
+"""
+Detección de encoding y decodificación incremental de archivos de texto
+
+Los .txt de Kantar llegan en UTF-8 o en Latin-1/CP1252. El encoding se
+detecta sobre un prefijo acotado (BYTES_DETECCION) y el archivo se decodifica
+por chunks con codecs.getincrementaldecoder, entregando líneas al parser a
+medida que se leen: nunca se arma una copia decodificada del archivo completo.
+"""
+
+import codecs
+import logging
+from typing import BinaryIO, Iterator, List, Sequence
+
+logger = logging.getLogger('mougli.decodificacion')
+
+# Encodings probados, en orden de preferencia
+ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+
+# Bytes iniciales usados para detectar el encoding
+BYTES_DETECCION = 64 * 1024
+
+# Bytes leídos por chunk al decodificar
+CHUNK_BYTES = 1024 * 1024
+
+
+def candidatos_encoding(
+    prefijo: bytes,
+    completo: bool = False,
+    encodings: Sequence[str] = ENCODINGS
+) -> List[str]:
+    """
+    Encodings que decodifican el prefijo sin errores, en orden de preferencia
+
+    Args:
+        prefijo: Primeros bytes del archivo
+        completo: True si el prefijo es el archivo entero. Si no, una
+            secuencia multibyte cortada al final no cuenta como error.
+        encodings: Encodings a probar
+    """
+    validos = []
+    for encoding in encodings:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(prefijo, final=completo)
+        except UnicodeDecodeError:
+            continue
+        validos.append(encoding)
+
+    return validos
+
+
+def iter_lineas(
+    stream: BinaryIO,
+    encoding: str,
+    chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[str]:
+    """
+    Decodifica un stream binario por chunks y lo entrega línea a línea
+
+    Las líneas se cortan solo en '\\n' y lo conservan (igual que iterar un
+    archivo abierto con newline='\\n').
+
+    Raises:
+        UnicodeDecodeError: Si aparece un byte inválido para el encoding
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pendiente = ''
+
+    while True:
+        datos = stream.read(chunk_bytes)
+        texto = decoder.decode(datos, final=not datos)
+
+        if texto:
+            lineas = (pendiente + texto).split('\n')
+            pendiente = lineas.pop()
+            for linea in lineas:
+                yield linea + '\n'
+
+        if not datos:
+            break
+
+    if pendiente:
+        yield pendiente
@@ -10,21 +10,36 @@ Cada hoja incluye:
 - Filas 1-8: Metadatos
 - Fila 9: Headers
 - Fila 10+: Datos
+
+Si una tabla no entra en una hoja (más de FILAS_POR_HOJA filas), sigue en
+hojas de continuación (Consolidado_2, Consolidado_3, …) con los mismos
+metadatos y header; la fila "Filas" de los metadatos lista el rango de cada
+hoja.
 """
 
 import logging
 import io
 import pandas as pd
-from typing import Optional
-from openpyxl.styles import Font, PatternFill, Alignment, numbers
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from app.processors.consolidador import (
     consolidar_monitor_outview,
     crear_metadatos_consolidado
 )
+from app.processors.excel_writer import (
+    FORMATO_FECHA,
+    anotar_partes,
+    crear_workbook,
+    escribir_dataframe,
+    escribir_filas,
+    partes_hoja
+)
 
 logger = logging.getLogger('mougli.excel_generator')
 
+# Orden de hojas en el workbook completo
+HOJAS = ['Monitor', 'OutView', 'Consolidado']
+
 
 # ==========================================
 # FUNCIÓN PRINCIPAL
@@ -34,8 +49,9 @@ def generar_excel_mougli_completo(
     df_monitor: Optional[pd.DataFrame] = None,
     df_outview: Optional[pd.DataFrame] = None,
     metadatos_monitor: Optional[pd.DataFrame] = None,
-    metadatos_outview: Optional[pd.DataFrame] = None
-) -> io.BytesIO:
+    metadatos_outview: Optional[pd.DataFrame] = None,
+    destino: Optional[BinaryIO] = None
+) -> BinaryIO:
     """
     Genera Excel completo con 1-3 hojas según datos disponibles
 
@@ -44,9 +60,10 @@ def generar_excel_mougli_completo(
         df_outview: DataFrame OutView procesado (33 columnas)
         metadatos_monitor: Metadatos Monitor (opcional, se genera si no se provee)
         metadatos_outview: Metadatos OutView (opcional, se genera si no se provee)
+        destino: Archivo donde escribir el Excel (opcional, por defecto BytesIO)
 
     Returns:
-        BytesIO con archivo Excel SiReset_Mougli.xlsx
+        destino con archivo Excel SiReset_Mougli.xlsx
 
     Raises:
         ValueError: Si ambos DataFrames son None
@@ -57,109 +74,52 @@ def generar_excel_mougli_completo(
 
     logger.info("Generando Excel Mougli completo...")
 
-    output = io.BytesIO()
-
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-
-        # ==========================================
-        # HOJA 1: Monitor (si existe)
-        # ==========================================
-
-        if df_monitor is not None:
-            logger.info(f"Escribiendo hoja Monitor ({len(df_monitor)} filas)")
-
-            # Generar metadatos si no se proveyeron
-            if metadatos_monitor is None:
-                metadatos_monitor = _crear_metadatos_monitor(df_monitor)
-
-            # Escribir metadatos (filas 1-8)
-            metadatos_monitor.to_excel(
-                writer,
-                sheet_name='Monitor',
-                startrow=0,
-                index=False,
-                header=False
-            )
-
-            # Escribir datos (fila 9+)
-            df_monitor.to_excel(
-                writer,
-                sheet_name='Monitor',
-                startrow=8,
-                index=False
-            )
-
-            # Aplicar formato
-            worksheet = writer.sheets['Monitor']
-            aplicar_formato_monitor(worksheet, df_monitor)
-
-        # ==========================================
-        # HOJA 2: OutView (si existe)
-        # ==========================================
-
-        if df_outview is not None:
-            logger.info(f"Escribiendo hoja OutView ({len(df_outview)} filas)")
-
-            # Generar metadatos si no se proveyeron
-            if metadatos_outview is None:
-                metadatos_outview = _crear_metadatos_outview(df_outview)
-
-            # Escribir metadatos (filas 1-8)
-            metadatos_outview.to_excel(
-                writer,
-                sheet_name='OutView',
-                startrow=0,
-                index=False,
-                header=False
-            )
-
-            # Escribir datos (fila 9+)
-            df_outview.to_excel(
-                writer,
-                sheet_name='OutView',
-                startrow=8,
-                index=False
-            )
-
-            # Aplicar formato
-            worksheet = writer.sheets['OutView']
-            aplicar_formato_outview(worksheet, df_outview)
-
-        # ==========================================
-        # HOJA 3: Consolidado (solo si ambos existen)
-        # ==========================================
-
-        if df_monitor is not None and df_outview is not None:
-            logger.info("Escribiendo hoja Consolidado")
-
-            # Consolidar datos
-            df_consolidado = consolidar_monitor_outview(df_monitor, df_outview)
-            logger.info(f"Consolidado: {len(df_consolidado)} filas")
-
-            # Generar metadatos
-            metadatos_consolidado = crear_metadatos_consolidado(df_consolidado)
-
-            # Escribir metadatos (filas 1-8)
-            metadatos_consolidado.to_excel(
-                writer,
-                sheet_name='Consolidado',
-                startrow=0,
-                index=False,
-                header=False
-            )
-
-            # Escribir datos (fila 9+)
-            df_consolidado.to_excel(
-                writer,
-                sheet_name='Consolidado',
-                startrow=8,
-                index=False
-            )
-
-            # Aplicar formato
-            worksheet = writer.sheets['Consolidado']
-            aplicar_formato_consolidado(worksheet, df_consolidado)
+    output = destino if destino is not None else io.BytesIO()
+
+    # Generar metadatos si no se proveyeron
+    if df_monitor is not None and metadatos_monitor is None:
+        metadatos_monitor = _crear_metadatos_monitor(df_monitor)
+    if df_outview is not None and metadatos_outview is None:
+        metadatos_outview = _crear_metadatos_outview(df_outview)
+
+    ambos = df_monitor is not None and df_outview is not None
+
+    workbook = crear_workbook(output)
+    formatos = _registrar_formatos(workbook)
+
+    # ==========================================
+    # HOJA 1: Monitor (si existe)
+    # ==========================================
+
+    if df_monitor is not None:
+        logger.info(f"Escribiendo hoja Monitor ({len(df_monitor)} filas)")
+        _escribir_hoja(workbook, 'Monitor', df_monitor, metadatos_monitor, formatos)
+
+    # ==========================================
+    # HOJA 2: OutView (si existe)
+    # ==========================================
+
+    if df_outview is not None:
+        logger.info(f"Escribiendo hoja OutView ({len(df_outview)} filas)")
+        _escribir_hoja(workbook, 'OutView', df_outview, metadatos_outview, formatos)
+
+    # ==========================================
+    # HOJA 3: Consolidado (solo si ambos existen)
+    # ==========================================
+
+    if ambos:
+        logger.info("Escribiendo hoja Consolidado")
 
+        # Consolidar datos
+        df_consolidado = consolidar_monitor_outview(df_monitor, df_outview)
+        logger.info(f"Consolidado: {len(df_consolidado)} filas")
+
+        # Generar metadatos
+        metadatos_consolidado = crear_metadatos_consolidado(df_consolidado)
+
+        _escribir_hoja(workbook, 'Consolidado', df_consolidado, metadatos_consolidado, formatos)
+
+    workbook.close()
     output.seek(0)
 
     # Log resumen
@@ -168,7 +128,7 @@ def generar_excel_mougli_completo(
         hojas_creadas.append('Monitor')
     if df_outview is not None:
         hojas_creadas.append('OutView')
-    if df_monitor is not None and df_outview is not None:
+    if ambos:
         hojas_creadas.append('Consolidado')
 
     logger.info(f"Excel generado exitosamente con {len(hojas_creadas)} hoja(s): {', '.join(hojas_creadas)}")
@@ -176,6 +136,33 @@ def generar_excel_mougli_completo(
     return output
 
 
+def generar_excel_consolidado(
+    df_consolidado: pd.DataFrame,
+    metadatos: Optional[pd.DataFrame] = None,
+    destino: Optional[BinaryIO] = None
+) -> BinaryIO:
+    """
+    Genera Excel con solo la hoja Consolidado (p. ej. desde el dataset acumulado)
+
+    Args:
+        df_consolidado: DataFrame ya consolidado (27 columnas)
+        metadatos: Metadatos (opcional, se generan si no se proveen)
+        destino: Archivo donde escribir el Excel (opcional, por defecto BytesIO)
+    """
+    output = destino if destino is not None else io.BytesIO()
+
+    if metadatos is None:
+        metadatos = crear_metadatos_consolidado(df_consolidado)
+
+    workbook = crear_workbook(output)
+    _escribir_hoja(workbook, 'Consolidado', df_consolidado, metadatos, _registrar_formatos(workbook))
+    workbook.close()
+    output.seek(0)
+
+    logger.info(f"Excel Consolidado generado con {len(df_consolidado)} filas")
+    return output
+
+
 # ==========================================
 # FUNCIONES AUXILIARES DE METADATOS
 # ==========================================
@@ -301,61 +288,36 @@ def _crear_metadatos_outview(df: pd.DataFrame) -> pd.DataFrame:
 
 
 # ==========================================
-# FUNCIONES DE FORMATO - MONITOR
+# FORMATO DE HOJAS
 # ==========================================
 
-def aplicar_formato_monitor(worksheet, df: pd.DataFrame):
-    """
-    Aplica formato a hoja Monitor
-    """
-
-    # 1. Formato metadatos (fila 2)
-    header_fill = PatternFill(
-        start_color='D9E1F2',
-        end_color='D9E1F2',
-        fill_type='solid'
-    )
-    bold_font = Font(bold=True)
-
-    for col in range(1, 3):  # Columnas A-B
-        worksheet.cell(row=2, column=col).font = bold_font
-        worksheet.cell(row=2, column=col).fill = header_fill
-
-    # 2. Formato headers (fila 9)
-    header_fill_datos = PatternFill(
-        start_color='4472C4',
-        end_color='4472C4',
-        fill_type='solid'
-    )
-    header_font = Font(bold=True, color='FFFFFF')
-
-    for col in range(1, len(df.columns) + 1):
-        cell = worksheet.cell(row=9, column=col)
-        cell.fill = header_fill_datos
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
-
-    # 3. Formato fechas (columna DIA)
-    for row in range(10, len(df) + 10):
-        worksheet.cell(row=row, column=1).number_format = 'DD/MM/YYYY'
-
-    # 4. Formato INVERSIÓN (columna según posición)
-    # La columna INVERSION está en la posición que corresponde
-    cols_dict = {col: idx + 1 for idx, col in enumerate(df.columns)}
-    if 'INVERSION' in cols_dict:
-        col_inv = cols_dict['INVERSION']
-        for row in range(10, len(df) + 10):
-            worksheet.cell(row=row, column=col_inv).number_format = '#,##0.00'
-
-    # 5. Ajustar anchos de columna
-    ajustar_anchos_monitor(worksheet)
-
+# Color del header (fila 9) por hoja
+COLORES_HEADER = {
+    'Monitor': '#4472C4',
+    'OutView': '#EC4899',      # Magenta
+    'Consolidado': '#8B5CF6'   # Púrpura (diferente de Monitor y OutView)
+}
+
+# Formatos numéricos por columna (las fechas usan FORMATO_FECHA)
+FORMATOS_NUMERICOS = {
+    'Monitor': {
+        'INVERSION': '#,##0.00'
+    },
+    'OutView': {
+        'Tarifa Real ($)': '#,##0.00',
+        'Latitud': '0.000000',
+        'Longitud': '0.000000'
+    },
+    'Consolidado': {
+        'INVERSIÓN REAL': '#,##0.00',
+        'ANCHO / LATITUD': '0.000000',
+        'ALTO / LONGITUD': '0.000000'
+    }
+}
 
-def ajustar_anchos_monitor(worksheet):
-    """
-    Ajusta anchos de columnas para Monitor
-    """
-    ANCHOS = {
+# Anchos de columna por hoja
+ANCHOS_COLUMNA = {
+    'Monitor': {
         'A': 12,   # DIA
         'B': 6,    # AÑO
         'C': 12,   # MES
@@ -381,81 +343,8 @@ def ajustar_anchos_monitor(worksheet):
         'W': 12,   # ALTO
         'X': 15,   # GENERO
         'Y': 25    # EDITORA
-    }
-
-    for col_letter, width in ANCHOS.items():
-        try:
-            worksheet.column_dimensions[col_letter].width = width
-        except:
-            pass
-
-
-# ==========================================
-# FUNCIONES DE FORMATO - OUTVIEW
-# ==========================================
-
-def aplicar_formato_outview(worksheet, df: pd.DataFrame):
-    """
-    Aplica formato a hoja OutView
-    """
-
-    # 1. Formato metadatos (fila 2)
-    header_fill = PatternFill(
-        start_color='D9E1F2',
-        end_color='D9E1F2',
-        fill_type='solid'
-    )
-    bold_font = Font(bold=True)
-
-    for col in range(1, 3):  # Columnas A-B
-        worksheet.cell(row=2, column=col).font = bold_font
-        worksheet.cell(row=2, column=col).fill = header_fill
-
-    # 2. Formato headers (fila 9)
-    header_fill_datos = PatternFill(
-        start_color='EC4899',  # Magenta
-        end_color='EC4899',
-        fill_type='solid'
-    )
-    header_font = Font(bold=True, color='FFFFFF')
-
-    for col in range(1, len(df.columns) + 1):
-        cell = worksheet.cell(row=9, column=col)
-        cell.fill = header_fill_datos
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
-
-    # 3. Formato fechas
-    for row in range(10, len(df) + 10):
-        worksheet.cell(row=row, column=1).number_format = 'DD/MM/YYYY'
-
-    # 4. Formato Tarifa Real ($)
-    cols_dict = {col: idx + 1 for idx, col in enumerate(df.columns)}
-    if 'Tarifa Real ($)' in cols_dict:
-        col_tarifa = cols_dict['Tarifa Real ($)']
-        for row in range(10, len(df) + 10):
-            worksheet.cell(row=row, column=col_tarifa).number_format = '#,##0.00'
-
-    # 5. Formato coordenadas
-    if 'Latitud' in cols_dict:
-        col_lat = cols_dict['Latitud']
-        for row in range(10, len(df) + 10):
-            worksheet.cell(row=row, column=col_lat).number_format = '0.000000'
-
-    if 'Longitud' in cols_dict:
-        col_lon = cols_dict['Longitud']
-        for row in range(10, len(df) + 10):
-            worksheet.cell(row=row, column=col_lon).number_format = '0.000000'
-
-    # 6. Ajustar anchos
-    ajustar_anchos_outview(worksheet)
-
-
-def ajustar_anchos_outview(worksheet):
-    """
-    Ajusta anchos de columnas para OutView
-    """
-    ANCHOS = {
+    },
+    'OutView': {
         'A': 12,   # Fecha
         'B': 6,    # AÑO
         'C': 12,   # MES
@@ -482,74 +371,8 @@ def ajustar_anchos_outview(worksheet):
         'X': 15,   # +1 Superficie
         'Y': 12,   # Conteo mensual
         'Z': 25    # Proveedor
-    }
-
-    for col_letter, width in ANCHOS.items():
-        try:
-            worksheet.column_dimensions[col_letter].width = width
-        except:
-            pass
-
-
-# ==========================================
-# FUNCIONES DE FORMATO - CONSOLIDADO
-# ==========================================
-
-def aplicar_formato_consolidado(worksheet, df: pd.DataFrame):
-    """
-    Aplica formato a hoja Consolidado
-    """
-
-    # 1. Formato metadatos (fila 2)
-    header_fill = PatternFill(
-        start_color='D9E1F2',
-        end_color='D9E1F2',
-        fill_type='solid'
-    )
-    bold_font = Font(bold=True)
-
-    for col in range(1, 3):  # Columnas A-B
-        worksheet.cell(row=2, column=col).font = bold_font
-        worksheet.cell(row=2, column=col).fill = header_fill
-
-    # 2. Formato headers (fila 9)
-    header_fill_datos = PatternFill(
-        start_color='8B5CF6',  # Púrpura (diferente de Monitor y OutView)
-        end_color='8B5CF6',
-        fill_type='solid'
-    )
-    header_font = Font(bold=True, color='FFFFFF')
-
-    for col in range(1, len(df.columns) + 1):
-        cell = worksheet.cell(row=9, column=col)
-        cell.fill = header_fill_datos
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
-
-    # 3. Formato fechas (columna A - FECHA)
-    for row in range(10, len(df) + 10):
-        worksheet.cell(row=row, column=1).number_format = 'DD/MM/YYYY'
-
-    # 4. Formato INVERSIÓN REAL (columna P, #16)
-    for row in range(10, len(df) + 10):
-        worksheet.cell(row=row, column=16).number_format = '#,##0.00'
-
-    # 5. Formato coordenadas (columnas W-X, #23-24)
-    for row in range(10, len(df) + 10):
-        # ANCHO / LATITUD
-        worksheet.cell(row=row, column=23).number_format = '0.000000'
-        # ALTO / LONGITUD
-        worksheet.cell(row=row, column=24).number_format = '0.000000'
-
-    # 6. Ajustar anchos
-    ajustar_anchos_consolidado(worksheet)
-
-
-def ajustar_anchos_consolidado(worksheet):
-    """
-    Ajusta anchos de columnas para Consolidado (27 columnas)
-    """
-    ANCHOS = {
+    },
+    'Consolidado': {
         'A': 12,   # FECHA
         'B': 6,    # AÑO
         'C': 12,   # MES
@@ -578,9 +401,86 @@ def ajustar_anchos_consolidado(worksheet):
         'Z': 12,   # Q ELEMENTOS
         'AA': 25   # EDITORA / PROVEEDOR
     }
+}
+
+
+def _registrar_formatos(workbook) -> Dict[str, Any]:
+    """Crea una vez por workbook los formatos de todas las hojas Mougli"""
+    formatos: Dict[str, Any] = {
+        'resaltado': workbook.add_format({'bold': True, 'bg_color': '#D9E1F2'}),
+        'fecha': workbook.add_format({'num_format': FORMATO_FECHA})
+    }
+
+    for nombre in HOJAS:
+        formatos[f'header_{nombre}'] = workbook.add_format({
+            'bold': True,
+            'font_color': '#FFFFFF',
+            'bg_color': COLORES_HEADER[nombre],
+            'border': 1,
+            'align': 'center',
+            'text_wrap': True
+        })
+
+    numericos = sorted({f for por_hoja in FORMATOS_NUMERICOS.values() for f in por_hoja.values()})
+    for formato in numericos:
+        formatos[formato] = workbook.add_format({'num_format': formato})
+
+    return formatos
+
+
+def _escribir_hoja(
+    workbook,
+    nombre: str,
+    df: pd.DataFrame,
+    metadatos: pd.DataFrame,
+    formatos: Dict[str, Any]
+) -> None:
+    """
+    Escribe una tabla Mougli en su hoja y, si no entra, en hojas de continuación
+
+    Cada hoja lleva metadatos (filas 1-8), headers (fila 9) y datos.
+    """
+    partes = partes_hoja(nombre, len(df))
+    filas_metadatos = anotar_partes(metadatos.values.tolist(), partes)
+
+    for hoja, inicio, fin in partes:
+        _escribir_parte(workbook, nombre, hoja, df.iloc[inicio:fin], filas_metadatos, formatos)
+
+
+def _escribir_parte(
+    workbook,
+    nombre: str,
+    hoja: str,
+    df: pd.DataFrame,
+    filas_metadatos: List[List[Any]],
+    formatos: Dict[str, Any]
+) -> None:
+    """
+    Escribe una hoja Mougli: metadatos (filas 1-8), headers (fila 9) y datos
+
+    nombre es la tabla (Monitor, OutView, Consolidado), que define colores,
+    formatos y anchos; hoja es el nombre de la hoja (p. ej. Consolidado_2).
+    Los formatos de fecha y números se aplican por columna, no por celda.
+    """
+    worksheet = workbook.add_worksheet(hoja)
+
+    # 1. Metadatos, con la fila 2 (columnas A-B) resaltada
+    escribir_filas(
+        worksheet,
+        filas_metadatos,
+        formato=lambda fila, col: formatos['resaltado'] if fila == 1 and col < 2 else None
+    )
+
+    # 2-3. Headers (fila 9), formatos de columna y datos (fila 10+)
+    escribir_dataframe(
+        worksheet,
+        df,
+        formatos[f'header_{nombre}'],
+        formatos_columna={
+            columna: formatos[formato]
+            for columna, formato in FORMATOS_NUMERICOS[nombre].items()
+        },
+        anchos=ANCHOS_COLUMNA[nombre],
+        formato_fecha=formatos['fecha']
+    )
 
-    for col_letter, width in ANCHOS.items():
-        try:
-            worksheet.column_dimensions[col_letter].width = width
-        except:
-            pass
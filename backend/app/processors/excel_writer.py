@@ -0,0 +1,249 @@
+"""
+Escritura de hojas Excel en streaming (xlsxwriter, constant_memory)
+
+Todas las hojas Mougli comparten el mismo layout:
+- Filas 1-8: Metadatos
+- Fila 9: Headers
+- Fila 10+: Datos
+
+Los formatos de datos (fechas, montos, coordenadas) se asignan por columna
+con set_column, no celda por celda. Los datos se convierten por bloques de
+FILAS_POR_BLOQUE filas a partir de los arrays NumPy de cada columna y se
+escriben fila por fila: en modo constant_memory cada fila se vuelca a disco
+al pasar a la siguiente, así el workbook nunca se arma completo en RAM.
+
+Una hoja admite hasta 1.048.576 filas: con el header en la fila 9 caben
+FILAS_POR_HOJA filas de datos. Los DataFrames más grandes se reparten con
+partes_hoja en hojas de continuación (Consolidado, Consolidado_2, …), cada
+una con sus metadatos y header.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from xlsxwriter.utility import xl_cell_to_rowcol
+from xlsxwriter.workbook import Workbook
+from xlsxwriter.worksheet import Worksheet
+
+logger = logging.getLogger('mougli.excel_writer')
+
+
+# Fila del header de datos (0-based → fila 9 de Excel)
+FILA_HEADER = 8
+
+# Filas convertidas por bloque (memoria acotada por hoja)
+FILAS_POR_BLOQUE = 50_000
+
+# Filas de una hoja de Excel y filas de datos que caben debajo del header
+MAX_FILAS_EXCEL = 1_048_576
+FILAS_POR_HOJA = MAX_FILAS_EXCEL - FILA_HEADER - 1
+
+# Hoja de un DataFrame repartido: (nombre de hoja, fila inicial, fila final)
+ParteHoja = Tuple[str, int, int]
+
+# Formato de fecha de las hojas Mougli
+FORMATO_FECHA = 'DD/MM/YYYY'
+
+# Origen de los números de serie de Excel (día 0 = 1899-12-30)
+_EPOCH_EXCEL = np.datetime64('1899-12-30', 'ns')
+_NS_POR_DIA = 86_400 * 10**9
+
+
+def crear_workbook(destino: Any) -> Workbook:
+    """
+    Crea un workbook xlsxwriter en modo streaming
+
+    Args:
+        destino: Ruta o file-like (BytesIO, archivo temporal) de salida
+
+    Los strings se escriben tal cual: sin convertirlos a URLs ni fórmulas.
+    """
+    return xlsxwriter.Workbook(destino, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+        'strings_to_numbers': False
+    })
+
+
+def escribir_filas(
+    worksheet: Worksheet,
+    filas: List[List[Any]],
+    fila_inicial: int = 0,
+    formato: Optional[Callable[[int, int], Any]] = None
+) -> None:
+    """
+    Escribe filas de metadatos (pocas filas, formato opcional por celda)
+
+    Args:
+        worksheet: Hoja destino
+        filas: Valores por fila
+        fila_inicial: Fila (0-based) de la primera fila
+        formato: Función (fila, columna) → Format o None, con índices 0-based
+    """
+    for r_idx, fila in enumerate(filas, start=fila_inicial):
+        for c_idx, valor in enumerate(fila):
+            if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+                valor = ''
+            worksheet.write(r_idx, c_idx, valor, formato(r_idx, c_idx) if formato else None)
+
+
+def partes_hoja(nombre: str, filas: int, filas_por_hoja: Optional[int] = None) -> List[ParteHoja]:
+    """
+    Reparte las filas de un DataFrame en hojas de hasta filas_por_hoja filas
+
+    Returns:
+        [(nombre, 0, n), (f"{nombre}_2", n, 2n), ...]; una sola parte (que
+        puede estar vacía) si las filas caben en una hoja
+    """
+    filas_por_hoja = filas_por_hoja or FILAS_POR_HOJA
+    partes = []
+    for i, inicio in enumerate(range(0, max(filas, 1), filas_por_hoja), start=1):
+        hoja = nombre if i == 1 else f"{nombre}_{i}"
+        partes.append((hoja, inicio, min(inicio + filas_por_hoja, filas)))
+    return partes
+
+
+def anotar_partes(filas: List[List[Any]], partes: List[ParteHoja]) -> List[List[Any]]:
+    """
+    Agrega el rango de filas de cada hoja a la fila "Filas" de los metadatos
+
+    Con una sola parte devuelve las filas sin cambios. Si no, la fila
+    "Filas" gana una tercera celda: "Monitor: filas 1-1048567; Monitor_2: …".
+    """
+    if len(partes) <= 1:
+        return filas
+
+    descripcion = '; '.join(f"{hoja}: filas {inicio + 1}-{fin}" for hoja, inicio, fin in partes)
+    return [
+        list(fila[:2]) + [descripcion] + list(fila[3:]) if len(fila) and fila[0] == 'Filas' else fila
+        for fila in filas
+    ]
+
+
+def escribir_dataframe(
+    worksheet: Worksheet,
+    df: pd.DataFrame,
+    formato_header: Any,
+    formatos_columna: Optional[Dict[str, Any]] = None,
+    anchos: Optional[Dict[str, float]] = None,
+    formato_fecha: Any = None,
+    fila_header: int = FILA_HEADER
+) -> None:
+    """
+    Escribe header + datos de un DataFrame con formatos a nivel de columna
+
+    Args:
+        worksheet: Hoja destino (sus filas anteriores ya deben estar escritas)
+        df: Datos a escribir
+        formato_header: Format de la fila de headers
+        formatos_columna: Nombre de columna → Format para sus celdas de datos
+        anchos: Letra de columna → ancho
+        formato_fecha: Format para columnas datetime sin formato explícito
+        fila_header: Fila (0-based) del header; los datos empiezan debajo
+
+    Raises:
+        ValueError: Si las filas no caben en la hoja (repartir con partes_hoja)
+    """
+    if fila_header + 1 + len(df) > MAX_FILAS_EXCEL:
+        raise ValueError(
+            f"{len(df)} filas no caben en la hoja '{worksheet.get_name()}' "
+            f"(máximo {MAX_FILAS_EXCEL - fila_header - 1})"
+        )
+
+    formatos_columna = formatos_columna or {}
+
+    # 1. Formatos y anchos por columna (antes de escribir celdas)
+    configuracion: Dict[int, Tuple[Optional[float], Any]] = {}
+    for letra, ancho in (anchos or {}).items():
+        _, c_idx = xl_cell_to_rowcol(f'{letra}1')
+        configuracion[c_idx] = (ancho, None)
+
+    for c_idx, columna in enumerate(df.columns):
+        formato = formatos_columna.get(columna)
+        if formato is None and pd.api.types.is_datetime64_any_dtype(df[columna]):
+            formato = formato_fecha
+        if formato is not None:
+            ancho, _ = configuracion.get(c_idx, (None, None))
+            configuracion[c_idx] = (ancho, formato)
+
+    for c_idx, (ancho, formato) in sorted(configuracion.items()):
+        worksheet.set_column(c_idx, c_idx, ancho, formato)
+
+    # 2. Header
+    worksheet.write_row(fila_header, 0, [str(col) for col in df.columns], formato_header)
+
+    # 3. Datos por bloques
+    escritores = [_escritor_columna(worksheet, df[col]) for col in df.columns]
+
+    for inicio in range(0, len(df), FILAS_POR_BLOQUE):
+        fin = min(inicio + FILAS_POR_BLOQUE, len(df))
+        bloque = [
+            (c_idx, escribir, convertir(inicio, fin))
+            for c_idx, (escribir, convertir) in enumerate(escritores)
+        ]
+
+        for offset in range(fin - inicio):
+            fila = fila_header + 1 + inicio + offset
+            for c_idx, escribir, valores in bloque:
+                valor = valores[offset]
+                if valor is not None:
+                    escribir(fila, c_idx, valor)
+
+    logger.info(f"Hoja '{worksheet.get_name()}': {len(df)} filas × {len(df.columns)} columnas escritas")
+
+
+def _escritor_columna(
+    worksheet: Worksheet,
+    serie: pd.Series
+) -> Tuple[Callable, Callable[[int, int], List[Union[float, bool, Any, None]]]]:
+    """
+    Elige el método de escritura de una columna y su conversión por bloque
+
+    Las conversiones devuelven listas de valores Python con None en los
+    nulos (NaN, NaT, <NA>), que no se escriben. Las fechas se pasan a
+    número de serie de Excel en NumPy y toman el formato de la columna.
+    Cada conversión trabaja solo sobre el tramo [a, b) de la columna.
+    """
+    dtype = serie.dtype
+
+    if pd.api.types.is_bool_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return worksheet.write_boolean, lambda a, b: serie.iloc[a:b].tolist()
+
+    if pd.api.types.is_datetime64_any_dtype(dtype) and getattr(dtype, 'tz', None) is None:
+        return worksheet.write_number, lambda a, b: _a_lista(
+            _serial_excel(serie.iloc[a:b].to_numpy(dtype='datetime64[ns]'))
+        )
+
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return worksheet.write_number, lambda a, b: _a_lista(
+            serie.iloc[a:b].to_numpy(dtype='float64', na_value=np.nan)
+        )
+
+    # Texto y categorías: write_string directo; columnas mixtas: write() decide por valor
+    def convertir(a: int, b: int) -> List[Any]:
+        tramo = serie.iloc[a:b]
+        valores = tramo.astype(object).to_numpy()
+        valores[tramo.isna().to_numpy()] = None
+        return valores.tolist()
+
+    if pd.api.types.infer_dtype(serie, skipna=True) in ('string', 'empty'):
+        return worksheet.write_string, convertir
+
+    return worksheet.write, convertir
+
+
+def _serial_excel(fechas: np.ndarray) -> np.ndarray:
+    """Convierte datetime64[ns] a número de serie de Excel (NaT → NaN)"""
+    dias = (fechas - _EPOCH_EXCEL).astype('int64') / _NS_POR_DIA
+    return np.where(np.isnat(fechas), np.nan, dias)
+
+
+def _a_lista(valores: np.ndarray) -> List[Optional[float]]:
+    """Lista de floats Python con None en lugar de NaN"""
+    lista = valores.astype(object)
+    lista[np.isnan(valores)] = None
+    return lista.tolist()
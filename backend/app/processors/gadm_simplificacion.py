@@ -0,0 +1,131 @@
+"""
+Simplificación de geometrías GADM para los niveles de detalle de Mapito
+
+Cada anillo se cuantiza a una cantidad fija de decimales y luego se
+simplifica con Douglas-Peucker. Con tolerancias del orden del tamaño de un
+píxel en el zoom del mapa el contorno se ve igual, pero el GeoJSON embebido
+en el HTML pesa una fracción del original.
+
+Cada anillo se simplifica por separado: en los bordes compartidos entre
+features pueden quedar diferencias menores a la tolerancia, que no se notan
+en el zoom para el que se usa cada variante.
+
+Los anillos que colapsan (menos de 4 puntos tras simplificar) se descartan:
+huecos e islas más chicos que la tolerancia no se ven en ese zoom. Si una
+geometría se queda sin polígonos se conserva solo cuantizada.
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+def douglas_peucker(puntos: np.ndarray, tolerancia: float) -> np.ndarray:
+    """
+    Simplifica una polilínea (N x 2) conservando extremos
+
+    Los puntos a menos de `tolerancia` de la recta entre los extremos de cada
+    tramo se eliminan. Un tramo con extremos iguales (anillo cerrado) usa la
+    distancia al punto.
+    """
+    n = len(puntos)
+    if n < 3:
+        return puntos
+
+    conservar = np.zeros(n, dtype=bool)
+    conservar[0] = conservar[-1] = True
+    pendientes = [(0, n - 1)]
+    while pendientes:
+        inicio, fin = pendientes.pop()
+        if fin - inicio < 2:
+            continue
+
+        a = puntos[inicio]
+        direccion = puntos[fin] - a
+        relativos = puntos[inicio + 1:fin] - a
+        largo = np.hypot(*direccion)
+        if largo == 0:
+            distancias = np.hypot(relativos[:, 0], relativos[:, 1])
+        else:
+            distancias = np.abs(direccion[0] * relativos[:, 1] - direccion[1] * relativos[:, 0]) / largo
+
+        k = int(np.argmax(distancias))
+        if distancias[k] > tolerancia:
+            medio = inicio + 1 + k
+            conservar[medio] = True
+            pendientes.append((inicio, medio))
+            pendientes.append((medio, fin))
+
+    return puntos[conservar]
+
+
+def _cuantizar(coords: Any, decimales: int) -> np.ndarray:
+    """Redondea un anillo/línea y quita los puntos consecutivos repetidos"""
+    puntos = np.round(np.asarray(coords, dtype=float)[:, :2], decimales)
+    if len(puntos) > 1:
+        distinto = np.any(puntos[1:] != puntos[:-1], axis=1)
+        puntos = puntos[np.concatenate(([True], distinto))]
+    return puntos
+
+
+def simplificar_anillo(coords: Any, tolerancia: float, decimales: int) -> Optional[list]:
+    """Anillo cerrado simplificado y cuantizado; None si colapsa"""
+    puntos = douglas_peucker(_cuantizar(coords, decimales), tolerancia)
+    if len(puntos) < 4:
+        return None
+    return puntos.tolist()
+
+
+def _simplificar_poligono(anillos: list, tolerancia: float, decimales: int) -> Optional[list]:
+    """Polígono (exterior + huecos) simplificado; None si el exterior colapsa"""
+    if not anillos:
+        return None
+    exterior = simplificar_anillo(anillos[0], tolerancia, decimales)
+    if exterior is None:
+        return None
+    huecos = [simplificar_anillo(anillo, tolerancia, decimales) for anillo in anillos[1:]]
+    return [exterior] + [hueco for hueco in huecos if hueco is not None]
+
+
+def _solo_cuantizado(coords: Any, decimales: int) -> Any:
+    """Coordenadas GeoJSON de cualquier profundidad, solo redondeadas"""
+    if not coords:
+        return coords
+    if isinstance(coords[0], (int, float)):
+        return [round(float(c), decimales) for c in coords[:2]]
+    if isinstance(coords[0][0], (int, float)):
+        return _cuantizar(coords, decimales).tolist()
+    return [_solo_cuantizado(parte, decimales) for parte in coords]
+
+
+def simplificar_geometria(geometria: Optional[dict], tolerancia: float, decimales: int) -> Optional[dict]:
+    """
+    Versión simplificada de una geometría GeoJSON (no modifica la original)
+
+    Polygon y MultiPolygon se simplifican; el resto de tipos solo se cuantiza.
+    """
+    if not geometria:
+        return geometria
+
+    tipo = geometria.get("type")
+    coords = geometria.get("coordinates")
+
+    if tipo == "GeometryCollection":
+        return {
+            "type": tipo,
+            "geometries": [simplificar_geometria(g, tolerancia, decimales) for g in geometria.get("geometries", [])]
+        }
+
+    if tipo == "Polygon":
+        poligono = _simplificar_poligono(coords, tolerancia, decimales)
+        if poligono is not None:
+            return {"type": tipo, "coordinates": poligono}
+    elif tipo == "MultiPolygon":
+        poligonos: List[list] = [
+            p for p in (_simplificar_poligono(anillos, tolerancia, decimales) for anillos in coords or [])
+            if p is not None
+        ]
+        if poligonos:
+            return {"type": tipo, "coordinates": poligonos}
+
+    return {"type": tipo, "coordinates": _solo_cuantizado(coords, decimales)}
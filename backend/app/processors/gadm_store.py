@@ -0,0 +1,298 @@
+"""
+Límites GADM de Perú en memoria, compartidos por todo el proceso
+
+Cada nivel (1 = regiones, 2 = provincias, 3 = distritos) se parsea una sola
+vez, al precargar o en el primer uso, y queda residente. En cada acceso se
+compara el mtime del archivo: si cambió, el nivel se vuelve a cargar.
+
+Junto con cada nivel se arman dos índices:
+- nombres, para los endpoints de listado: regiones, NAME_1 → provincias y
+  (NAME_1, NAME_2) → distritos
+- posiciones, para las selecciones de build_map: (NAME_1, …, NAME_level) →
+  posiciones de sus features en el nivel. Una selección se resuelve con una
+  búsqueda por elemento seleccionado, sin recorrer todas las features.
+
+Además se calcula el bounding box de cada feature, en un arreglo NumPy
+(una fila por feature, en el orden del archivo): los límites de una
+selección son un min/max vectorizado sobre sus filas, sin volver a recorrer
+coordenadas.
+
+Cada nivel tiene además variantes de menor detalle (ver gadm_simplificacion)
+para vistas alejadas: "alto" es la geometría original, "medio" y "bajo"
+están cuantizadas y simplificadas con Douglas-Peucker. Se calculan una vez
+por nivel (al precargar o en el primer uso) y comparten ids y properties con
+la original, así que los índices y bounding boxes valen para todas.
+
+Las claves de los índices van en minúsculas y sin espacios en los extremos,
+igual que las selecciones de mapito_processor; los valores conservan el
+nombre original.
+
+Las FeatureCollection se comparten entre requests y no se deben modificar.
+Cada feature recibe un "id" único al cargar: así folium no necesita
+agregárselo (lo haría sobre el dict compartido) al aplicar estilos.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.processors.gadm_simplificacion import simplificar_geometria
+
+logger = logging.getLogger('mapito.gadm')
+
+ARCHIVOS_GADM = {
+    1: "gadm41_PER_1.json",
+    2: "gadm41_PER_2.json",
+    3: "gadm41_PER_3.json",
+}
+
+# Nivel de detalle → (tolerancia Douglas-Peucker en grados, decimales); None = original.
+# "bajo" ronda el píxel del mapa de todo Perú (zoom 5-6), "medio" el de una región.
+DETALLES: Dict[str, Optional[Tuple[float, int]]] = {
+    "bajo": (0.02, 2),
+    "medio": (0.004, 3),
+    "alto": None,
+}
+
+
+def clave_nombre(nombre: Any) -> str:
+    """Forma normalizada de un nombre GADM para comparar (minúsculas, sin bordes)"""
+    return str(nombre or "").strip().lower()
+
+
+@dataclass
+class NivelGadm:
+    """FeatureCollection de un nivel, sus índices de nombres y sus bounding boxes"""
+    fc: dict
+    mtime_ns: int
+    # Fila por feature: [lat_min, lon_min, lat_max, lon_max] (NaN sin geometría)
+    cajas: np.ndarray
+    # Clave del padre (() en regiones, (NAME_1,) en provincias, …) → nombres ordenados
+    nombres: Dict[Tuple[str, ...], List[str]] = field(default_factory=dict)
+    # Clave completa (NAME_1, …, NAME_level) → posiciones en fc["features"]
+    posiciones: Dict[Tuple[str, ...], List[int]] = field(default_factory=dict)
+    # Detalle → FeatureCollection simplificada ("alto" es fc)
+    variantes: Dict[str, dict] = field(default_factory=dict)
+
+
+class GadmStore:
+    """Niveles GADM de un directorio, cargados una vez y reutilizados"""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self._niveles: Dict[int, NivelGadm] = {}
+        self._lock = threading.Lock()
+
+    def coleccion(self, level: int, detalle: str = "alto") -> dict:
+        """
+        FeatureCollection del nivel en el detalle pedido (no modificar: es compartida)
+
+        Raises:
+            FileNotFoundError: Si no existe el archivo del nivel
+            ValueError: Si el detalle no está en DETALLES
+        """
+        return self._variante(self._nivel(level), detalle)
+
+    def seleccionar(self, level: int, claves: Iterable[Tuple[str, ...]], detalle: str = "alto") -> dict:
+        """
+        FeatureCollection con las features de las claves pedidas
+
+        Las claves son tuplas normalizadas (clave_nombre) de largo `level`:
+        (región,), (región, provincia) o (región, provincia, distrito). Las
+        features salen en el orden del archivo; las claves inexistentes se
+        ignoran.
+        """
+        nivel = self._nivel(level)
+        features = self._variante(nivel, detalle)["features"]
+        return {"type": "FeatureCollection", "features": [features[i] for i in _posiciones(nivel, claves)]}
+
+    def limites(self, level: int, claves: Optional[Iterable[Tuple[str, ...]]] = None) -> Optional[List[List[float]]]:
+        """
+        Bounding box [[lat_min, lon_min], [lat_max, lon_max]] de una selección
+
+        Con claves=None abarca todo el nivel. Retorna None si la selección no
+        tiene features con coordenadas.
+        """
+        nivel = self._nivel(level)
+        cajas = nivel.cajas if claves is None else nivel.cajas[_posiciones(nivel, claves)]
+        cajas = cajas[~np.isnan(cajas[:, 0])]
+        if not len(cajas):
+            return None
+        lat_min, lon_min = cajas[:, :2].min(axis=0)
+        lat_max, lon_max = cajas[:, 2:].max(axis=0)
+        return [[float(lat_min), float(lon_min)], [float(lat_max), float(lon_max)]]
+
+    def regiones(self) -> List[str]:
+        """Nombres de regiones (NAME_1), ordenados"""
+        return self._nivel(1).nombres.get((), [])
+
+    def provincias(self, region: str) -> List[str]:
+        """Provincias (NAME_2) de una región, ordenadas; [] si no existe"""
+        return self._nivel(2).nombres.get((clave_nombre(region),), [])
+
+    def distritos(self, region: str, provincia: str) -> List[str]:
+        """Distritos (NAME_3) de una provincia, ordenados; [] si no existe"""
+        return self._nivel(3).nombres.get((clave_nombre(region), clave_nombre(provincia)), [])
+
+    def huella(self) -> str:
+        """mtime de cada archivo de nivel (-1 si falta): cambia si cambian los límites"""
+        mtimes = []
+        for level, nombre in ARCHIVOS_GADM.items():
+            try:
+                mtimes.append(f"{level}:{os.stat(self.data_dir / nombre).st_mtime_ns}")
+            except FileNotFoundError:
+                mtimes.append(f"{level}:-1")
+        return ",".join(mtimes)
+
+    def precargar(self) -> List[int]:
+        """
+        Carga los niveles cuyos archivos existen, con todas sus variantes de
+        detalle; devuelve los niveles cargados
+        """
+        cargados = []
+        for level, nombre in ARCHIVOS_GADM.items():
+            if (self.data_dir / nombre).exists():
+                nivel = self._nivel(level)
+                for detalle in DETALLES:
+                    self._variante(nivel, detalle)
+                cargados.append(level)
+            else:
+                logger.warning(f"GADM nivel {level}: no existe {self.data_dir / nombre}")
+        return cargados
+
+    def _nivel(self, level: int) -> NivelGadm:
+        ruta = self.data_dir / ARCHIVOS_GADM[level]
+        try:
+            mtime_ns = os.stat(ruta).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No existe {ruta}")
+
+        nivel = self._niveles.get(level)
+        if nivel is not None and nivel.mtime_ns == mtime_ns:
+            return nivel
+
+        with self._lock:
+            nivel = self._niveles.get(level)
+            if nivel is None or nivel.mtime_ns != mtime_ns:
+                nivel = _cargar_nivel(ruta, level, mtime_ns)
+                self._niveles[level] = nivel
+            return nivel
+
+    def _variante(self, nivel: NivelGadm, detalle: str) -> dict:
+        variante = nivel.variantes.get(detalle)
+        if variante is not None:
+            return variante
+        if detalle not in DETALLES:
+            raise ValueError(f"Detalle no soportado: {detalle} (opciones: {', '.join(DETALLES)})")
+
+        with self._lock:
+            variante = nivel.variantes.get(detalle)
+            if variante is None:
+                variante = _simplificar_nivel(nivel.fc, *DETALLES[detalle])
+                nivel.variantes[detalle] = variante
+            return variante
+
+
+def _posiciones(nivel: NivelGadm, claves: Iterable[Tuple[str, ...]]) -> List[int]:
+    """Posiciones de las features de las claves, en orden de archivo"""
+    return sorted({
+        posicion
+        for clave in set(claves)
+        for posicion in nivel.posiciones.get(clave, ())
+    })
+
+
+def _extremos(coords: Any, salida: List[np.ndarray]) -> None:
+    """Agrega a salida los puntos (lon, lat) de cada anillo/línea de unas coordenadas GeoJSON"""
+    if not coords:
+        return
+    if isinstance(coords[0], (int, float)):  # un punto
+        salida.append(np.asarray([coords[:2]], dtype=float))
+    elif isinstance(coords[0][0], (int, float)):  # anillo o línea
+        salida.append(np.asarray(coords, dtype=float)[:, :2])
+    else:
+        for parte in coords:
+            _extremos(parte, salida)
+
+
+def _caja_geometria(geometria: Optional[dict]) -> List[float]:
+    """[lat_min, lon_min, lat_max, lon_max] de una geometría GeoJSON (NaN si está vacía)"""
+    puntos: List[np.ndarray] = []
+    pendientes = [geometria] if geometria else []
+    while pendientes:
+        geom = pendientes.pop()
+        pendientes.extend(geom.get("geometries") or [])
+        _extremos(geom.get("coordinates"), puntos)
+
+    if not puntos:
+        return [np.nan] * 4
+    lon_min, lat_min = np.min([p.min(axis=0) for p in puntos], axis=0)
+    lon_max, lat_max = np.max([p.max(axis=0) for p in puntos], axis=0)
+    return [lat_min, lon_min, lat_max, lon_max]
+
+
+def _cargar_nivel(ruta: Path, level: int, mtime_ns: int) -> NivelGadm:
+    """Parsea el archivo del nivel y arma sus índices y bounding boxes"""
+    fc = json.loads(ruta.read_text(encoding="utf-8"))
+    fc.setdefault("features", [])
+
+    nombres: Dict[Tuple[str, ...], set] = {}
+    posiciones: Dict[Tuple[str, ...], List[int]] = {}
+    cajas = np.empty((len(fc["features"]), 4), dtype=float)
+    for posicion, feature in enumerate(fc["features"]):
+        feature["id"] = f"{level}.{posicion}"
+        cajas[posicion] = _caja_geometria(feature.get("geometry"))
+        props = feature.get("properties") or {}
+        clave = tuple(clave_nombre(props.get(f"NAME_{i}")) for i in range(1, level + 1))
+        posiciones.setdefault(clave, []).append(posicion)
+
+        nombre = props.get(f"NAME_{level}")
+        if nombre is not None:
+            nombres.setdefault(clave[:-1], set()).add(nombre)
+
+    logger.info(f"GADM nivel {level} cargado: {len(fc['features'])} features ({ruta.name})")
+    return NivelGadm(
+        fc=fc,
+        mtime_ns=mtime_ns,
+        cajas=cajas,
+        nombres={k: sorted(v) for k, v in nombres.items()},
+        posiciones=posiciones,
+        variantes={"alto": fc}
+    )
+
+
+def _simplificar_nivel(fc: dict, tolerancia: float, decimales: int) -> dict:
+    """Copia de la FeatureCollection con geometrías simplificadas (mismos ids y properties)"""
+    inicio = time.perf_counter()
+    features = [
+        {**feature, "geometry": simplificar_geometria(feature.get("geometry"), tolerancia, decimales)}
+        for feature in fc["features"]
+    ]
+    logger.info(
+        f"GADM simplificado (tolerancia {tolerancia}, {decimales} decimales): "
+        f"{len(features)} features en {time.perf_counter() - inicio:.2f}s"
+    )
+    return {**fc, "features": features}
+
+
+@lru_cache(maxsize=None)
+def _store(data_dir: str) -> GadmStore:
+    return GadmStore(Path(data_dir))
+
+
+def gadm_store(data_dir: Optional[Path] = None) -> GadmStore:
+    """Store compartido del directorio (por defecto settings.GADM_DATA_DIR)"""
+    if data_dir is None:
+        data_dir = settings.GADM_DATA_DIR
+    return _store(str(Path(data_dir).resolve()))
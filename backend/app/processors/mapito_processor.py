@@ -2,71 +2,37 @@
 from __future__ import annotations
 
 from pathlib import Path
-import json
-from typing import Iterable, Tuple, Dict, List, Any, Optional
+from typing import Tuple, Dict, List, Any
 
 import folium
 from folium import GeoJson
 
+from .gadm_store import DETALLES, gadm_store
 
-# ───────────────────────────── Helpers ─────────────────────────────
-
-def _load_gadm(data_dir: Path, level: int) -> dict:
-    """
-    Carga GADM para Perú:
-      level=1 -> regiones   (gadm41_PER_1.json)
-      level=2 -> provincias (gadm41_PER_2.json)
-      level=3 -> distritos  (gadm41_PER_3.json)
-    """
-    fname = {
-        1: "gadm41_PER_1.json",
-        2: "gadm41_PER_2.json",
-        3: "gadm41_PER_3.json",
-    }[level]
-    p = data_dir / fname
-    if not p.exists():
-        raise FileNotFoundError(f"No existe {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
-
-
-def _props(f: dict) -> dict:
-    return f.get("properties", {})
-
-
-def _filter_fc(fc: dict, keep: Iterable[bool]) -> dict:
-    feats = [f for f, k in zip(fc["features"], keep) if k]
-    return {"type": "FeatureCollection", "features": feats}
-
+# Detalle automático: extensión mínima (grados, el mayor de alto/ancho) de la
+# vista para usar cada variante; más chica que todas → "alto"
+UMBRALES_DETALLE: List[Tuple[float, str]] = [(6.0, "bajo"), (1.5, "medio")]
 
-def _match_names(props: dict, n1: Optional[str], n2: Optional[str], n3: Optional[str]) -> bool:
-    ok = True
-    if n1 is not None:
-        ok = ok and str(props.get("NAME_1", "")).strip().lower() == n1
-    if n2 is not None:
-        ok = ok and str(props.get("NAME_2", "")).strip().lower() == n2
-    if n3 is not None:
-        ok = ok and str(props.get("NAME_3", "")).strip().lower() == n3
-    return ok
 
+# ───────────────────────────── Helpers ─────────────────────────────
 
 def _to_lower_safe(x: str) -> str:
     return (x or "").strip().lower()
 
 
-def _bounds_from_fc(fc: dict) -> Optional[List[List[float]]]:
+def elegir_detalle(bounds: List[List[float]] | None) -> str:
     """
-    Bounding box aproximado de un FeatureCollection (lat, lon).
-    Para simplicidad, usamos bounds de folium al añadir y luego lo leemos.
-    Retorna None si no hay features.
+    Variante de geometría para una vista: cuanto más amplia, menos detalle.
+    bounds None = vista inicial de todo Perú.
     """
-    if not fc["features"]:
-        return None
-    # Hacemos una capa temporal en un mapa en memoria para que folium calcule bounds.
-    tmp_map = folium.Map(location=[-9.2, -75.0], zoom_start=5, tiles=None)
-    gj = GeoJson(fc)
-    gj.add_to(tmp_map)
-    b = gj.get_bounds()  # [[lat_min, lon_min], [lat_max, lon_max]]
-    return b
+    if not bounds:
+        return UMBRALES_DETALLE[0][1]
+    (lat_min, lon_min), (lat_max, lon_max) = bounds
+    extension = max(lat_max - lat_min, lon_max - lon_min)
+    for minimo, detalle in UMBRALES_DETALLE:
+        if extension >= minimo:
+            return detalle
+    return "alto"
 
 
 # ───────────────────────────── Núcleo ─────────────────────────────
@@ -79,6 +45,7 @@ def build_map(
     selections: Dict[str, Any] | None = None,
     fit_selected: bool = False,
     background_color: str = "#ffffff",
+    detalle: str = "auto",
 ) -> Tuple[str, Dict[str, Any]]:
     """
     Renderiza un mapa folium con selección jerárquica.
@@ -92,9 +59,15 @@ def build_map(
         }
       - fit_selected: si True, centra/ajusta la vista a lo seleccionado
       - background_color: color de fondo del contenedor del mapa (cuando no hay tiles)
+      - detalle: "bajo" | "medio" | "alto" (geometría original) o "auto", que
+        elige según la extensión de la vista (ver elegir_detalle)
     Retorna:
-      (html, meta) donde meta incluye contadores: {"n_regions":..,"n_provinces":..,"n_districts":..}
+      (html, meta) donde meta incluye contadores y el detalle usado:
+      {"n_regions":.., "n_selected":.., "detalle":..}
     """
+    if detalle != "auto" and detalle not in DETALLES:
+        raise ValueError(f"Detalle no soportado: {detalle}")
+
     colores = colores or {}
     style = style or {}
     selections = selections or {}
@@ -115,76 +88,47 @@ def build_map(
         for (a, b, c) in (selections.get("districts") or [])
     ]
 
-    # Carga de GADM
-    gj1 = _load_gadm(data_dir, 1)  # regiones
-    gj2 = _load_gadm(data_dir, 2)  # provincias
-    gj3 = _load_gadm(data_dir, 3)  # distritos
-
-    # Qué pinto con "fill" (general) y qué con "selected"
-    general_fc: dict
-    selected_fc: dict | None = None
+    # GADM en memoria: cada rama pide solo los niveles que usa y resuelve la
+    # selección con el índice de posiciones del store (sin recorrer features)
+    # Qué pinto con "fill" (general) y qué con "selected": (nivel, claves);
+    # claves None = todo el nivel
+    store = gadm_store(data_dir)
+    general: Tuple[int, Any]
+    selected: Tuple[int, Any] | None = None
 
     if sel_dist:  # distritos seleccionados
-        # selected -> distritos exactos
-        keep_sel = [
-            _match_names(_props(f), n1, n2, n3) for (f) in gj3["features"]
-            for (n1, n2, n3) in [(_to_lower_safe(_props(f).get("NAME_1")),
-                                  _to_lower_safe(_props(f).get("NAME_2")),
-                                  _to_lower_safe(_props(f).get("NAME_3")))]
-        ]  # placeholder; lo reemplazaremos con set para O(1):
-        wanted_dist = set(sel_dist)
-        keep_sel = []
-        for f in gj3["features"]:
-            p = _props(f)
-            k = (_to_lower_safe(p.get("NAME_1")),
-                 _to_lower_safe(p.get("NAME_2")),
-                 _to_lower_safe(p.get("NAME_3")))
-            keep_sel.append(k in wanted_dist)
-        selected_fc = _filter_fc(gj3, keep_sel)
-
-        # general -> provincias contenedoras
-        prov_needed = set((a, b) for (a, b, _) in sel_dist)
-        keep_gen = []
-        for f in gj2["features"]:
-            p = _props(f)
-            k = (_to_lower_safe(p.get("NAME_1")), _to_lower_safe(p.get("NAME_2")))
-            keep_gen.append(k in prov_needed)
-        general_fc = _filter_fc(gj2, keep_gen)
+        # selected -> distritos exactos; general -> provincias contenedoras
+        selected = (3, set(sel_dist))
+        general = (2, {(a, b) for (a, b, _) in sel_dist})
 
     elif sel_prov:  # provincias seleccionadas
-        # selected -> provincias exactas
-        wanted_prov = set(sel_prov)
-        keep_sel = []
-        for f in gj2["features"]:
-            p = _props(f)
-            k = (_to_lower_safe(p.get("NAME_1")), _to_lower_safe(p.get("NAME_2")))
-            keep_sel.append(k in wanted_prov)
-        selected_fc = _filter_fc(gj2, keep_sel)
-
-        # general -> regiones contenedoras
-        regions_needed = set(a for (a, _) in sel_prov)
-        keep_gen = []
-        for f in gj1["features"]:
-            p = _props(f)
-            k = _to_lower_safe(p.get("NAME_1"))
-            keep_gen.append(k in regions_needed)
-        general_fc = _filter_fc(gj1, keep_gen)
+        # selected -> provincias exactas; general -> regiones contenedoras
+        selected = (2, set(sel_prov))
+        general = (1, {(a,) for (a, _) in sel_prov})
 
     elif sel_regions:  # solo regiones
-        # general -> regiones
-        wanted_reg = set(sel_regions)
-        keep_gen = []
-        for f in gj1["features"]:
-            p = _props(f)
-            k = _to_lower_safe(p.get("NAME_1"))
-            keep_gen.append(k in wanted_reg)
-        general_fc = _filter_fc(gj1, keep_gen)
-        selected_fc = None
+        general = (1, {(r,) for r in sel_regions})
 
     else:
         # Nada seleccionado: muestro todo Perú (regiones)
-        general_fc = gj1
-        selected_fc = None
+        general = (1, None)
+
+    # Vista: lo seleccionado (o lo general si la selección no existe), con los
+    # bounding boxes precalculados en el store
+    bounds = None
+    if fit_selected:
+        bounds = store.limites(*selected) if selected else None
+        if bounds is None:
+            bounds = store.limites(*general)
+
+    if detalle == "auto":
+        detalle = elegir_detalle(bounds)
+
+    if general[1] is None:
+        general_fc = store.coleccion(general[0], detalle)
+    else:
+        general_fc = store.seleccionar(*general, detalle)
+    selected_fc = store.seleccionar(*selected, detalle) if selected else None
 
     # Construcción del mapa
     m = folium.Map(location=[-9.2, -75.0], zoom_start=5, tiles=None)
@@ -237,14 +181,12 @@ def build_map(
     folium.LayerControl(collapsed=True).add_to(m)
 
     # Ajuste de vista
-    if fit_selected:
-        fc_to_fit = selected_fc if (selected_fc and selected_fc["features"]) else general_fc
-        bounds = _bounds_from_fc(fc_to_fit)
-        if bounds:
-            m.fit_bounds(bounds)
+    if bounds:
+        m.fit_bounds(bounds)
 
     meta = {
         "n_regions": len(general_fc["features"]) if general_fc else 0,
         "n_selected": len(selected_fc["features"]) if (selected_fc and selected_fc.get("features")) else 0,
+        "detalle": detalle,
     }
     return m.get_root().render(), meta
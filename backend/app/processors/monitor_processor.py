@@ -18,16 +18,22 @@ Factores de conversión:
 
 from __future__ import annotations
 
+import csv
 import io
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
+from pandas.api.types import union_categoricals
+
+from .decodificacion import BYTES_DETECCION, candidatos_encoding, iter_lineas
+from .excel_writer import (
+    FORMATO_FECHA, anotar_partes, crear_workbook, escribir_dataframe, escribir_filas, partes_hoja
+)
+from .tabla_writer import FormatoSalida, escribir_tabla
 
 # Configurar logging
 logger = logging.getLogger('mougli.monitor')
@@ -47,6 +53,7 @@ class MonitorProcessor:
 
     Métodos públicos:
         procesar(file_content: str) -> pd.DataFrame
+        procesar_stream(stream: BinaryIO, encoding: Optional[str]) -> pd.DataFrame
         generar_excel() -> io.BytesIO
     """
 
@@ -95,6 +102,68 @@ class MonitorProcessor:
         'RUC'
     ]
 
+    # Tipo de cada columna, aplicado al parsear cada bloque:
+    #   fecha     → datetime64 (formato DD/MM/YYYY)
+    #   numero    → float/int (se eliminan comas)
+    #   categoria → categórica (baja cardinalidad)
+    #   texto     → string Python
+    #   derivada  → se calcula después (AÑO, MES, SEMANA)
+    ESQUEMA_COLUMNAS = {
+        'DIA': 'fecha',
+        'AÑO': 'derivada',
+        'MES': 'derivada',
+        'SEMANA': 'derivada',
+        'MEDIO': 'categoria',
+        'MARCA': 'texto',
+        'PRODUCTO': 'texto',
+        'VERSION': 'texto',
+        'VERSION DESCRIPTIVA': 'texto',
+        'DURACION': 'texto',
+        'DUR.T.': 'texto',
+        'TIPO': 'categoria',
+        'HORA': 'texto',
+        'EMISORA/SITE': 'categoria',
+        'PROGRAMA/TIPO DE SITE': 'texto',
+        'BREAK': 'texto',
+        'POS. SPOT': 'texto',
+        'PAG/POSICION': 'texto',
+        'INVERSION': 'numero',
+        'TIPO TARIFA': 'categoria',
+        'SECTOR': 'categoria',
+        'CATEGORIA': 'categoria',
+        'ITEM': 'texto',
+        'CALIDAD': 'categoria',
+        'GENERO': 'categoria',
+        'AGENCIA': 'categoria',
+        'ANUNCIANTE': 'texto',
+        'SECCION/COMERC.': 'texto',
+        'BLOQUE/TOT.PAGS': 'texto',
+        'EDITORA': 'categoria',
+        'EDICION': 'texto',
+        'COLOR': 'categoria',
+        'SPOTS': 'numero',
+        'AREA': 'numero',
+        '%PAG.': 'numero',
+        'DES. POSICION': 'texto',
+        'ANCHO': 'numero',
+        'ALTO': 'numero',
+        'REGION/ÁMBITO': 'categoria',
+        'CORTE LOCAL': 'categoria',
+        'RUC': 'texto'
+    }
+
+    # Campos de texto a los que se les quitan espacios al parsear
+    COLUMNAS_STRIP = ['MEDIO', 'MARCA', 'PRODUCTO', 'ANUNCIANTE', 'SECTOR', 'CATEGORIA', 'REGION/ÁMBITO']
+
+    # Filas de datos parseadas por bloque en el modo streaming
+    FILAS_POR_BLOQUE = 100_000
+
+    # El header #|MEDIO| debe aparecer dentro de estas primeras líneas
+    LINEAS_BUSQUEDA_HEADER = 10
+
+    # Máximo de números de línea descartada que se guardan y loguean
+    MAX_LINEAS_DESCARTADAS_REPORTADAS = 100
+
     # Nombres de meses en español
     MESES = {
         1: 'enero', 2: 'febrero', 3: 'marzo', 4: 'abril',
@@ -147,13 +216,23 @@ class MonitorProcessor:
         'AO': 15   # RUC
     }
 
-    def __init__(self, factores_custom: Optional[Dict[str, float]] = None):
+    # Pasos de procesar() reportados a la función de progreso
+    TOTAL_PASOS = 14
+
+    def __init__(
+        self,
+        factores_custom: Optional[Dict[str, float]] = None,
+        progreso: Optional[Callable[[int, int, str], None]] = None
+    ):
         """
         Inicializa el procesador de Monitor
 
         Args:
             factores_custom: Factores de conversión personalizados (opcional)
+            progreso: Función (paso, total, mensaje) llamada al terminar cada
+                paso de procesar() (opcional, la usan los jobs asíncronos)
         """
+        self.progreso = progreso
         # Cargar factores desde config o usar custom
         if factores_custom:
             self.FACTORES = factores_custom
@@ -163,6 +242,9 @@ class MonitorProcessor:
         self.metadatos: Dict = {}
         self.df: Optional[pd.DataFrame] = None
         self.metadatos_originales: List[str] = []
+        self.lineas_descartadas: List[int] = []
+        self.filas_descartadas: int = 0
+        self.encoding: Optional[str] = None
 
     def _cargar_factores(self) -> Dict[str, float]:
         """Carga factores de conversión desde archivo JSON"""
@@ -202,26 +284,75 @@ class MonitorProcessor:
         Raises:
             ValueError: Si el archivo es inválido
         """
-        logger.info("Iniciando procesamiento de archivo Monitor")
+        return self.procesar_lineas(io.StringIO(file_content))
 
-        # 1. Validar archivo
-        self._validar_archivo(file_content)
+    def procesar_stream(self, stream: BinaryIO, encoding: Optional[str] = None) -> pd.DataFrame:
+        """
+        Procesa un archivo Monitor leyendo los bytes de forma incremental
+
+        Nunca se materializa el archivo completo: los bytes se decodifican por
+        chunks a medida que se leen y las líneas se parsean en bloques de
+        FILAS_POR_BLOQUE.
 
-        # 2. Dividir en líneas
-        lineas = file_content.split('\n')
-        lineas = [l.strip() for l in lineas if l.strip()]  # Eliminar vacías
+        Si no se indica encoding, se detecta con los primeros BYTES_DETECCION
+        bytes. Si más adelante aparece un byte inválido para el encoding
+        detectado, se vuelve a procesar desde el inicio con el siguiente
+        candidato (el stream debe ser seekable).
 
-        logger.info(f"Archivo tiene {len(lineas)} líneas")
+        Args:
+            stream: Archivo binario abierto (upload, archivo temporal, BytesIO)
+            encoding: Encoding del archivo (opcional, por defecto se detecta)
 
-        # 3. Extraer metadatos originales (primeras 4 líneas)
-        self.metadatos_originales = lineas[:4]
+        Returns:
+            DataFrame con datos procesados
 
-        # 4. Encontrar header
-        header_idx = self._encontrar_header(lineas)
-        logger.info(f"Header encontrado en línea {header_idx + 1}")
+        Raises:
+            ValueError: Si el archivo es inválido o ningún encoding lo decodifica
+        """
+        if encoding is not None:
+            self.encoding = encoding
+            return self.procesar_lineas(iter_lineas(stream, encoding))
+
+        inicio = stream.tell()
+        prefijo = stream.read(BYTES_DETECCION)
+        candidatos = candidatos_encoding(prefijo, completo=len(prefijo) < BYTES_DETECCION)
+
+        for candidato in candidatos:
+            stream.seek(inicio)
+            try:
+                df = self.procesar_lineas(iter_lineas(stream, candidato))
+            except UnicodeDecodeError as e:
+                logger.warning(f"Encoding {candidato} inválido en byte {e.start} del chunk, probando el siguiente")
+                continue
+
+            self.encoding = candidato
+            logger.info(f"Archivo decodificado con encoding: {candidato}")
+            return df
+
+        raise ValueError("No se pudo leer archivo. Encoding inválido. Intenta guardar como UTF-8.")
+
+    def procesar_lineas(self, lineas: Iterable[str]) -> pd.DataFrame:
+        """
+        Procesa un archivo Monitor a partir de un iterable de líneas
+
+        Args:
+            lineas: Iterable de líneas de texto (archivo de texto, StringIO, etc.)
+
+        Returns:
+            DataFrame con datos procesados
+
+        Raises:
+            ValueError: Si el archivo es inválido
+        """
+        logger.info("Iniciando procesamiento de archivo Monitor")
+
+        # 1-4. Leer metadatos y encontrar header (solo primeras líneas)
+        lector = _LectorLineas(lineas)
+        header_line = self._leer_encabezado(lector)
+        logger.info(f"Header encontrado en línea {lector.numero_linea}")
+        self._reportar(4, "Metadatos y header leídos")
 
         # 5. Parsear header
-        header_line = lineas[header_idx]
         columnas = [col.strip() for col in header_line.split('|')]
 
         # Renombrar primera columna '#' a 'ID'
@@ -229,133 +360,254 @@ class MonitorProcessor:
             columnas[0] = 'ID'
 
         logger.info(f"Encontradas {len(columnas)} columnas")
+        self._reportar(5, "Header parseado")
 
-        # 6. Parsear datos
-        datos_lineas = lineas[header_idx + 1:]
-        datos = []
-
-        for i, linea in enumerate(datos_lineas, start=1):
-            valores = linea.split('|')
+        # 6-7. Parsear datos por bloques y crear DataFrame
+        self.df = self._parsear_datos(lector, columnas)
 
-            # Validar número de columnas
-            if len(valores) != len(columnas):
-                logger.warning(
-                    f"Línea {header_idx + 1 + i} tiene {len(valores)} valores, "
-                    f"esperado {len(columnas)}. Skippeando."
-                )
-                continue
-
-            datos.append(valores)
+        # Validar estructura básica (6 líneas = 4 meta + 1 header + 1 dato)
+        if lector.lineas_no_vacias < 6:
+            raise ValueError("Archivo demasiado corto. Mínimo 6 líneas esperadas.")
 
-        logger.info(f"Parseadas {len(datos)} filas de datos")
+        if lector.lineas_no_vacias == lector.lineas_encabezado:
+            raise ValueError("No hay datos después del header")
 
-        # 7. Crear DataFrame
-        self.df = pd.DataFrame(datos, columns=columnas)
+        logger.info(f"Archivo tiene {lector.lineas_no_vacias} líneas")
+        logger.info(f"Parseadas {len(self.df)} filas de datos")
+        self._reportar(7, f"{len(self.df)} filas parseadas")
 
         # 8. Eliminar columna ID (ya no la necesitamos)
         if 'ID' in self.df.columns:
             self.df = self.df.drop(columns=['ID'])
+        self._reportar(8, "Columna ID eliminada")
 
         # 9. Limpiar datos
         self._limpiar_datos()
+        self._reportar(9, "Datos limpios")
 
         # 10. Convertir SUPLEMENTO a DIARIOS
-        self.df['MEDIO'] = self.df['MEDIO'].replace('SUPLEMENTO', 'DIARIOS')
+        self._convertir_suplemento()
         logger.info("Convertidos SUPLEMENTO → DIARIOS")
+        self._reportar(10, "SUPLEMENTO convertido a DIARIOS")
 
         # 11. Aplicar factores de conversión (CRÍTICO)
         self._aplicar_factores()
+        self._reportar(11, "Factores aplicados")
 
         # 12. Agregar columnas derivadas
         self._agregar_columnas_derivadas()
+        self._reportar(12, "Columnas derivadas agregadas")
 
         # 13. Reordenar columnas
         self._reordenar_columnas()
+        self._reportar(13, "Columnas reordenadas")
 
         # 14. Calcular metadatos
         self._calcular_metadatos()
+        self._reportar(14, "Metadatos calculados")
 
         logger.info(f"Procesamiento completado. DataFrame final: {len(self.df)} filas × {len(self.df.columns)} columnas")
 
         return self.df
 
-    def _validar_archivo(self, file_content: str) -> None:
-        """Valida estructura básica del archivo"""
-        lineas = [l.strip() for l in file_content.split('\n') if l.strip()]
+    def firma_factores(self) -> Dict:
+        """Factores que determinan el resultado (parte de la clave de caché)"""
+        return {'FACTORES': self.FACTORES}
 
-        # Mínimo 6 líneas (4 meta + 1 header + 1 dato)
-        if len(lineas) < 6:
-            raise ValueError("Archivo demasiado corto. Mínimo 6 líneas esperadas.")
+    def _reportar(self, paso: int, mensaje: str) -> None:
+        """Informa el paso terminado a la función de progreso (si hay)"""
+        if self.progreso is not None:
+            self.progreso(paso, self.TOTAL_PASOS, mensaje)
 
-        # Header debe contener #|MEDIO|
-        header_encontrado = any('#|MEDIO|' in line for line in lineas[:10])
-        if not header_encontrado:
-            raise ValueError("Header #|MEDIO| no encontrado en primeras 10 líneas")
+    def _leer_encabezado(self, lector: '_LectorLineas') -> str:
+        """
+        Lee las primeras líneas hasta encontrar el header #|MEDIO|
 
-        # Al menos una línea de datos después del header
-        header_idx = next(i for i, line in enumerate(lineas) if '#|MEDIO|' in line)
-        if header_idx == len(lineas) - 1:
-            raise ValueError("No hay datos después del header")
+        Guarda las primeras 4 líneas como metadatos originales.
 
-    def _encontrar_header(self, lineas: List[str]) -> int:
+        Returns:
+            Línea de header
+
+        Raises:
+            ValueError: Si el header no está en las primeras líneas
         """
-        Encuentra el índice de la línea de header
+        self.metadatos_originales = []
+
+        for linea in lector:
+            if len(self.metadatos_originales) < 4:
+                self.metadatos_originales.append(linea)
+
+            if '#|MEDIO|' in linea:
+                lector.lineas_encabezado = lector.lineas_no_vacias
+                return linea
+
+            if lector.lineas_no_vacias >= self.LINEAS_BUSQUEDA_HEADER:
+                break
+
+        if lector.agotado and lector.lineas_no_vacias < 6:
+            raise ValueError("Archivo demasiado corto. Mínimo 6 líneas esperadas.")
+
+        raise ValueError(
+            f"Header #|MEDIO| no encontrado en primeras {self.LINEAS_BUSQUEDA_HEADER} líneas"
+        )
+
+    def _parsear_datos(self, lector: '_LectorLineas', columnas: List[str]) -> pd.DataFrame:
+        """
+        Parsea las líneas de datos en bloques de tamaño fijo
+
+        Cada bloque de líneas válidas se entrega al parser C de pandas, por lo
+        que en memoria solo convive un bloque de texto a la vez. Las líneas con
+        un número de columnas distinto al header se descartan y se reportan
+        con su número de línea.
 
         Returns:
-            Índice de la línea que contiene #|MEDIO|
+            DataFrame con todas las filas válidas
         """
-        for i, linea in enumerate(lineas):
-            if '#|MEDIO|' in linea:
-                return i
+        separadores_esperados = len(columnas) - 1
+        bloques: List[pd.DataFrame] = []
+        buffer: List[str] = []
+        self.lineas_descartadas = []
+        self.filas_descartadas = 0
+
+        for linea in lector:
+            if linea.count('|') != separadores_esperados:
+                self._reportar_linea_descartada(lector.numero_linea, linea.count('|') + 1, len(columnas))
+                continue
+
+            buffer.append(linea)
 
-        raise ValueError("No se encontró header #|MEDIO| en el archivo")
+            if len(buffer) >= self.FILAS_POR_BLOQUE:
+                bloques.append(self._parsear_bloque(buffer, columnas))
+                buffer = []
+
+        if buffer or not bloques:
+            bloques.append(self._parsear_bloque(buffer, columnas))
+
+        if self.filas_descartadas > 0:
+            logger.warning(
+                f"{self.filas_descartadas} líneas descartadas por número de columnas incorrecto "
+                f"(primeras: {self.lineas_descartadas[:10]})"
+            )
+
+        return self._concatenar_bloques(bloques)
+
+    def _parsear_bloque(self, buffer: List[str], columnas: List[str]) -> pd.DataFrame:
+        """Convierte un bloque de líneas pipe-delimited en DataFrame"""
+        if not buffer:
+            return self._aplicar_esquema(pd.DataFrame(columns=columnas, dtype=object))
+
+        bloque = pd.read_csv(
+            io.StringIO('\n'.join(buffer)),
+            sep='|',
+            header=None,
+            names=range(len(columnas)),
+            dtype=str,
+            quoting=csv.QUOTE_NONE,
+            na_filter=False,
+            engine='c'
+        )
+        bloque.columns = columnas
+
+        return self._aplicar_esquema(bloque)
+
+    def _reportar_linea_descartada(self, numero_linea: int, encontrados: int, esperados: int) -> None:
+        """Registra una línea con número de columnas incorrecto"""
+        self.filas_descartadas += 1
+
+        if len(self.lineas_descartadas) < self.MAX_LINEAS_DESCARTADAS_REPORTADAS:
+            self.lineas_descartadas.append(numero_linea)
+            logger.warning(
+                f"Línea {numero_linea} tiene {encontrados} valores, "
+                f"esperado {esperados}. Skippeando."
+            )
+
+    def _aplicar_esquema(self, bloque: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convierte un bloque recién parseado a los tipos declarados en ESQUEMA_COLUMNAS
+
+        Se aplica bloque a bloque durante el parseo, así las columnas nunca
+        existen como strings Python para el archivo completo.
+        """
+        # 1. Limpiar campos de texto (strip whitespace)
+        for col in self.COLUMNAS_STRIP:
+            if col in bloque.columns:
+                bloque[col] = bloque[col].str.strip()
+
+        for col in bloque.columns:
+            tipo = self.ESQUEMA_COLUMNAS.get(col)
+
+            # 2. Fechas (DIA)
+            if tipo == 'fecha':
+                bloque[col] = pd.to_datetime(
+                    bloque[col],
+                    format='%d/%m/%Y',
+                    dayfirst=True,
+                    errors='coerce'
+                )
+
+            # 3. Numéricas: eliminar comas si las hay (formato europeo)
+            elif tipo == 'numero':
+                bloque[col] = pd.to_numeric(
+                    bloque[col].str.replace(',', '', regex=False),
+                    errors='coerce'
+                ).fillna(0)
+
+            # 4. Baja cardinalidad → categórica (diccionario)
+            elif tipo == 'categoria':
+                bloque[col] = bloque[col].astype('category')
+
+        return bloque
+
+    def _concatenar_bloques(self, bloques: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatena bloques tipados manteniendo las columnas categóricas
+
+        pd.concat convierte a object las categóricas con categorías distintas,
+        así que primero se unifican las categorías de cada columna.
+        """
+        if len(bloques) == 1:
+            return bloques[0]
+
+        for col in bloques[0].columns:
+            if isinstance(bloques[0][col].dtype, pd.CategoricalDtype):
+                categorias = union_categoricals([b[col] for b in bloques]).categories
+                for bloque in bloques:
+                    bloque[col] = bloque[col].cat.set_categories(categorias)
+
+        return pd.concat(bloques, ignore_index=True)
 
     def _limpiar_datos(self) -> None:
-        """Limpia y convierte tipos de datos"""
+        """Valida los tipos ya aplicados en el parseo (ver _aplicar_esquema)"""
         logger.info("Limpiando datos...")
 
-        # 1. Convertir fecha DIA
+        # 1. Fechas inválidas en DIA
         if 'DIA' in self.df.columns:
-            self.df['DIA'] = pd.to_datetime(
-                self.df['DIA'],
-                format='%d/%m/%Y',
-                dayfirst=True,
-                errors='coerce'
-            )
-
             fechas_invalidas = self.df['DIA'].isna().sum()
             if fechas_invalidas > 0:
                 logger.warning(f"{fechas_invalidas} fechas inválidas convertidas a NaT")
 
-        # 2. Convertir INVERSION a numérico
+        # 2. Rango de INVERSION
         if 'INVERSION' in self.df.columns:
-            # Eliminar comas si las hay (formato europeo)
-            self.df['INVERSION'] = self.df['INVERSION'].astype(str).str.replace(',', '')
+            logger.info(f"INVERSION: min={self.df['INVERSION'].min():.2f}, max={self.df['INVERSION'].max():.2f}")
 
-            # Convertir a float
-            self.df['INVERSION'] = pd.to_numeric(
-                self.df['INVERSION'],
-                errors='coerce'
-            ).fillna(0)
+        memoria_mb = self.df.memory_usage(deep=True).sum() / (1024 * 1024)
+        logger.info(f"Memoria del DataFrame tipado: {memoria_mb:.1f} MB")
 
-            logger.info(f"INVERSION: min={self.df['INVERSION'].min():.2f}, max={self.df['INVERSION'].max():.2f}")
+    def _convertir_suplemento(self) -> None:
+        """Convierte MEDIO SUPLEMENTO → DIARIOS (compatible con categóricas)"""
+        medio = self.df['MEDIO']
 
-        # 3. Convertir otras columnas numéricas si existen
-        columnas_numericas = ['AREA', '%PAG.', 'ANCHO', 'ALTO', 'SPOTS']
+        if not isinstance(medio.dtype, pd.CategoricalDtype):
+            self.df['MEDIO'] = medio.replace('SUPLEMENTO', 'DIARIOS')
+            return
 
-        for col in columnas_numericas:
-            if col in self.df.columns:
-                self.df[col] = pd.to_numeric(
-                    self.df[col].astype(str).str.replace(',', ''),
-                    errors='coerce'
-                ).fillna(0)
+        if 'SUPLEMENTO' not in medio.cat.categories:
+            return
 
-        # 4. Limpiar campos de texto (strip whitespace)
-        columnas_texto = ['MEDIO', 'MARCA', 'PRODUCTO', 'ANUNCIANTE', 'SECTOR', 'CATEGORIA', 'REGION/ÁMBITO']
+        if 'DIARIOS' not in medio.cat.categories:
+            medio = medio.cat.add_categories('DIARIOS')
 
-        for col in columnas_texto:
-            if col in self.df.columns:
-                self.df[col] = self.df[col].astype(str).str.strip()
+        self.df['MEDIO'] = medio.mask(medio == 'SUPLEMENTO', 'DIARIOS').cat.remove_unused_categories()
 
     def _aplicar_factores(self) -> None:
         """
@@ -375,14 +627,9 @@ class MonitorProcessor:
         # Guardar valores originales para log
         inversion_original_total = self.df['INVERSION'].sum()
 
-        # Aplicar factor según medio
-        self.df['INVERSION'] = self.df.apply(
-            lambda row: row['INVERSION'] * self.FACTORES.get(row['MEDIO'], 1.0),
-            axis=1
-        )
-
-        # Redondear a 2 decimales
-        self.df['INVERSION'] = self.df['INVERSION'].round(2)
+        # Aplicar factor según medio (una sola pasada vectorizada)
+        inversion = self.df['INVERSION'].to_numpy(dtype='float64')
+        self.df['INVERSION'] = (inversion * self._factores_por_fila()).round(2)
 
         inversion_factorizada_total = self.df['INVERSION'].sum()
 
@@ -392,12 +639,32 @@ class MonitorProcessor:
         logger.info(f"  - Reducción: {(1 - inversion_factorizada_total/inversion_original_total)*100:.1f}%")
 
         # Logear medios sin factor
-        medios_unicos = self.df['MEDIO'].unique()
-        medios_sin_factor = [m for m in medios_unicos if m not in self.FACTORES]
+        medios_sin_factor = [m for m in pd.unique(self.df['MEDIO']) if m not in self.FACTORES]
 
         if medios_sin_factor:
             logger.warning(f"Medios sin factor de conversión (usando 1.0): {medios_sin_factor}")
 
+    def _factores_por_fila(self) -> np.ndarray:
+        """
+        Construye el vector de factores alineado con las filas del DataFrame
+
+        Cada MEDIO distinto se busca una sola vez en FACTORES y el resultado se
+        expande a todas las filas mediante los códigos de factorización.
+        Medios sin factor (o vacíos) usan 1.0.
+
+        Returns:
+            Array float64 con un factor por fila
+        """
+        codigos, medios = pd.factorize(self.df['MEDIO'], use_na_sentinel=True)
+
+        # Posición extra al final para el centinela -1 (MEDIO nulo)
+        tabla = np.array(
+            [self.FACTORES.get(medio, 1.0) for medio in medios] + [1.0],
+            dtype='float64'
+        )
+
+        return tabla[codigos]
+
     def _agregar_columnas_derivadas(self) -> None:
         """Agrega columnas derivadas: AÑO, MES, SEMANA"""
         logger.info("Agregando columnas derivadas...")
@@ -449,12 +716,16 @@ class MonitorProcessor:
 
         logger.info(f"Metadatos calculados: {self.metadatos}")
 
-    def generar_excel(self) -> io.BytesIO:
+    def generar_excel(self, destino: Optional[BinaryIO] = None) -> BinaryIO:
         """
         Genera archivo Excel con metadatos y datos procesados
 
+        Args:
+            destino: Archivo (file-like binario) donde escribir el Excel. Por
+                defecto un BytesIO nuevo
+
         Returns:
-            BytesIO con archivo Excel
+            destino con el archivo Excel, posicionado al inicio
 
         Raises:
             ValueError: Si no hay datos procesados
@@ -464,56 +735,53 @@ class MonitorProcessor:
 
         logger.info("Generando archivo Excel...")
 
-        # Crear workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Monitor"
-
-        # 1. Escribir metadatos (filas 1-8)
-        metadatos_df = self._crear_dataframe_metadatos()
-
-        for r_idx, row in enumerate(dataframe_to_rows(metadatos_df, index=False, header=False), start=1):
-            for c_idx, value in enumerate(row, start=1):
-                cell = ws.cell(row=r_idx, column=c_idx, value=value)
-
-                # Formato para metadatos
-                if c_idx == 1:  # Columna "Descripción"
-                    cell.font = Font(bold=True)
-
-        # 2. Escribir headers (fila 9)
-        header_row = 9
-        for c_idx, col_name in enumerate(self.df.columns, start=1):
-            cell = ws.cell(row=header_row, column=c_idx, value=col_name)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-            cell.alignment = Alignment(horizontal='center')
-
-        # 3. Escribir datos (fila 10+)
-        for r_idx, row in enumerate(dataframe_to_rows(self.df, index=False, header=False), start=10):
-            for c_idx, value in enumerate(row, start=1):
-                cell = ws.cell(row=r_idx, column=c_idx, value=value)
-
-                # Formato para fechas
-                if c_idx == 1 and isinstance(value, pd.Timestamp):
-                    cell.number_format = 'DD/MM/YYYY'
-                    cell.alignment = Alignment(horizontal='right')
-
-                # Formato para números
-                elif isinstance(value, (int, float)) and not pd.isna(value):
-                    cell.alignment = Alignment(horizontal='right')
-
-        # 4. Ajustar anchos de columna
-        self._ajustar_columnas(ws)
-
-        # 5. Guardar en BytesIO
-        output = io.BytesIO()
-        wb.save(output)
+        # Crear workbook (streaming: formatos por columna, filas en bloques)
+        output = destino if destino is not None else io.BytesIO()
+        wb = crear_workbook(output)
+
+        negrita = wb.add_format({'bold': True})
+        formato_header = wb.add_format({'bold': True, 'bg_color': '#D3D3D3', 'align': 'center'})
+        formato_fecha = wb.add_format({'num_format': FORMATO_FECHA, 'align': 'right'})
+
+        # Más filas de las que caben en una hoja siguen en Monitor_2, Monitor_3…
+        partes = partes_hoja("Monitor", len(self.df))
+        metadatos = anotar_partes(self._crear_dataframe_metadatos().values.tolist(), partes)
+
+        for hoja, inicio, fin in partes:
+            ws = wb.add_worksheet(hoja)
+
+            # 1. Escribir metadatos (filas 1-8)
+            escribir_filas(ws, metadatos, formato=lambda fila, col: negrita if col == 0 else None)
+
+            # 2-4. Headers (fila 9), datos (fila 10+) y anchos de columna
+            escribir_dataframe(
+                ws,
+                self.df.iloc[inicio:fin],
+                formato_header,
+                anchos=self.ANCHOS_COLUMNA,
+                formato_fecha=formato_fecha
+            )
+
+        # 5. Cerrar workbook en el destino
+        wb.close()
         output.seek(0)
 
         logger.info("Excel generado exitosamente")
 
         return output
 
+    def exportar_tabla(self, destino: str, formato: FormatoSalida = 'parquet') -> None:
+        """
+        Escribe los datos procesados como Parquet (zstd) o Arrow IPC en destino
+
+        Raises:
+            ValueError: Si no hay datos procesados
+        """
+        if self.df is None or len(self.df) == 0:
+            raise ValueError("No hay datos procesados para exportar")
+
+        escribir_tabla(self.df, formato, destino)
+
     def _crear_dataframe_metadatos(self) -> pd.DataFrame:
         """Crea DataFrame de metadatos para las filas 1-8 del Excel"""
         metadatos_data = [
@@ -529,11 +797,6 @@ class MonitorProcessor:
 
         return pd.DataFrame(metadatos_data)
 
-    def _ajustar_columnas(self, worksheet) -> None:
-        """Ajusta anchos de columnas en worksheet"""
-        for col_letter, width in self.ANCHOS_COLUMNA.items():
-            worksheet.column_dimensions[col_letter].width = width
-
     def validar_datos_procesados(self) -> List[str]:
         """
         Valida calidad de datos procesados
@@ -576,19 +839,48 @@ class MonitorProcessor:
         return warnings
 
 
+class _LectorLineas:
+    """
+    Iterador de líneas no vacías (ya sin espacios) con conteo de posición
+
+    Mantiene el número de línea física de la última línea entregada para
+    poder reportar errores sin guardar las líneas en memoria.
+    """
+
+    def __init__(self, lineas: Iterable[str]):
+        self._lineas = iter(lineas)
+        self.numero_linea = 0
+        self.lineas_no_vacias = 0
+        self.lineas_encabezado = 0
+        self.agotado = False
+
+    def __iter__(self) -> Iterator[str]:
+        for linea in self._lineas:
+            self.numero_linea += 1
+            linea = linea.strip()
+            if not linea:
+                continue
+            self.lineas_no_vacias += 1
+            yield linea
+
+        self.agotado = True
+
+
 def procesar_monitor_txt(
     file_content: str,
-    factores_custom: Optional[Dict[str, float]] = None
-) -> io.BytesIO:
+    factores_custom: Optional[Dict[str, float]] = None,
+    destino: Optional[BinaryIO] = None
+) -> BinaryIO:
     """
     Función de conveniencia para procesar archivo Monitor y retornar Excel
 
     Args:
         file_content: Contenido del archivo .txt como string
         factores_custom: Factores de conversión personalizados (opcional)
+        destino: Archivo donde escribir el Excel (opcional, por defecto BytesIO)
 
     Returns:
-        BytesIO con archivo Excel
+        destino con el archivo Excel
 
     Raises:
         ValueError: Si archivo inválido
@@ -602,4 +894,4 @@ def procesar_monitor_txt(
         for warning in warnings:
             logger.warning(f"Validación: {warning}")
 
-    return processor.generar_excel()
+    return processor.generar_excel(destino)
@@ -0,0 +1,519 @@
+"""
+Tareas Mougli para el pool de procesos (app.core.executor)
+
+Funciones de módulo (picklables) que corren en un worker: reciben el
+upload ya copiado a disco (app.core.uploads), lo leen desde su ruta y
+escriben el Excel en un archivo temporal cuya ruta reciben del endpoint. El archivo se devuelve al cliente desde el proceso
+principal, así el resultado no viaja de vuelta por el pipe del pool.
+
+tarea_job es la variante de los jobs asíncronos (app.core.jobs): lee los
+uploads guardados en el directorio del job y reporta el avance paso a paso.
+
+tarea_lote consolida varias entregas de cada tipo: une las entregas de un
+mismo tipo antes de generar el Excel. El endpoint procesa cada archivo en su
+propia tarea (tarea_entrega, repartidas con cpu_executor.ejecutar_varios), que
+deja el DataFrame en un Parquet temporal, y pasa esas EntregaProcesada a
+tarea_lote, que solo las lee.
+
+tarea_dataset_agregar recibe un lote igual que tarea_lote pero, en lugar de
+generar el Excel, agrega las entregas al dataset incremental del usuario
+(dataset_mougli); tarea_dataset_excel genera la hoja Consolidado del dataset.
+tarea_dataset_resumen (lee los footers) y tarea_dataset_vaciar (toma el
+bloqueo del dataset, que puede esperar a un agregado en curso) también corren
+en el pool para no frenar el event loop.
+
+Con formato='parquet' o 'arrow' las tareas escriben las tablas procesadas
+(tabla_writer) en lugar del Excel.
+
+Si se pasa una caché (app.core.result_cache), los DataFrames procesados se
+buscan por SHA-256 del archivo + factores antes de decodificar y parsear. El
+SHA-256 de un UploadEnDisco ya viene calculado de la ingesta.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .monitor_processor import MonitorProcessor
+from .outview_processor import OutViewProcessor
+from .excel_generator import generar_excel_consolidado, generar_excel_mougli_completo
+from .tabla_writer import NOMBRES_FORMATO, FormatoSalida, exportar_tablas_mougli
+from .consolidador import unir_entregas
+from .dataset_mougli import DatasetMougli
+from app.core.result_cache import dataframe_tipado, huella, tabla_tipada
+
+if TYPE_CHECKING:
+    from app.core.result_cache import ResultCache
+    from app.core.uploads import UploadEnDisco
+
+logger = logging.getLogger('mougli.tareas')
+
+# Función de progreso: (paso, total, mensaje)
+Progreso = Callable[[int, int, str], None]
+
+
+@dataclass(frozen=True)
+class EntregaProcesada:
+    """Archivo de un lote ya procesado por tarea_entrega (DataFrame en Parquet)"""
+    ruta: str
+    filename: Optional[str] = None
+
+
+# Archivo de entrada: contenido en memoria, ruta en disco, upload en disco o
+# (en los lotes) entrega ya procesada
+Fuente = Union[bytes, str, 'UploadEnDisco', EntregaProcesada]
+
+# Columna de fecha usada para deduplicar entregas de cada tipo
+COLUMNA_FECHA = {'Monitor': 'DIA', 'OutView': 'Fecha'}
+
+
+class ErrorTarea(Exception):
+    """
+    Error de una tarea con el status HTTP y detalle a devolver
+
+    Se construye solo con args para que sobreviva el pickle de vuelta al
+    proceso principal.
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def tarea_monitor(
+    content: Fuente,
+    ruta_salida: str,
+    cache: Optional[ResultCache] = None,
+    formato: FormatoSalida = 'xlsx'
+) -> int:
+    """
+    Procesa Monitor .txt y escribe el Excel (o Parquet/Arrow) en ruta_salida
+
+    El encoding se detecta y el texto se decodifica en streaming.
+
+    Raises:
+        ValueError: Si el archivo es inválido o no se puede decodificar
+
+    Returns:
+        Tamaño del archivo generado en bytes
+    """
+    processor = MonitorProcessor()
+    _cargar('Monitor', processor, content, cache)
+
+    for warning in processor.validar_datos_procesados():
+        logger.warning(f"Validación: {warning}")
+
+    _escribir_procesado(processor, ruta_salida, formato)
+    return os.path.getsize(ruta_salida)
+
+
+def tarea_outview(
+    content: Fuente,
+    ruta_salida: str,
+    cache: Optional[ResultCache] = None,
+    formato: FormatoSalida = 'xlsx'
+) -> int:
+    """
+    Procesa OutView .xlsx y escribe el Excel (o Parquet/Arrow) en ruta_salida
+
+    Raises:
+        ValueError: Si el archivo es inválido
+
+    Returns:
+        Tamaño del archivo generado en bytes
+    """
+    processor = OutViewProcessor()
+    _cargar('OutView', processor, content, cache)
+
+    _escribir_procesado(processor, ruta_salida, formato)
+    return os.path.getsize(ruta_salida)
+
+
+def tarea_consolidado(
+    monitor_content: Optional[Fuente],
+    outview_content: Optional[Fuente],
+    ruta_salida: str,
+    progreso: Optional[Progreso] = None,
+    cache: Optional[ResultCache] = None,
+    formato: FormatoSalida = 'xlsx'
+) -> int:
+    """
+    Procesa Monitor y/o OutView y escribe el Excel consolidado en ruta_salida
+
+    Con formato parquet/arrow escribe una tabla, o un zip con las tres
+    (Monitor, OutView y Consolidado) si se proveen ambos archivos.
+
+    Args:
+        monitor_content: Monitor .txt (bytes, ruta o UploadEnDisco), opcional
+        outview_content: OutView .xlsx (bytes, ruta o UploadEnDisco), opcional
+        progreso: Función (paso, total, mensaje) con el avance global: los
+            pasos de Monitor, luego los de OutView y al final el Excel
+        cache: Caché de DataFrames procesados (opcional)
+        formato: xlsx (por defecto), parquet o arrow
+
+    Raises:
+        ErrorTarea: 400 si un archivo es inválido, 500 si falla el procesamiento
+
+    Returns:
+        Tamaño del archivo generado en bytes
+    """
+    df_monitor = None
+    df_outview = None
+
+    pasos_monitor = MonitorProcessor.TOTAL_PASOS if monitor_content is not None else 0
+    pasos_outview = OutViewProcessor.TOTAL_PASOS if outview_content is not None else 0
+    total = pasos_monitor + pasos_outview + 1
+
+    if monitor_content is not None:
+        processor = MonitorProcessor(progreso=_etapa(progreso, 'Monitor', 0, total))
+        df_monitor = _procesar('Monitor', lambda: _cargar('Monitor', processor, monitor_content, cache))
+
+    if outview_content is not None:
+        processor = OutViewProcessor(progreso=_etapa(progreso, 'OutView', pasos_monitor, total))
+        df_outview = _procesar('OutView', lambda: _cargar('OutView', processor, outview_content, cache))
+
+    return _generar_salida(df_monitor, df_outview, ruta_salida, progreso, total, formato)
+
+
+def tarea_lote(
+    monitores: List[Fuente],
+    outviews: List[Fuente],
+    ruta_salida: str,
+    progreso: Optional[Progreso] = None,
+    cache: Optional[ResultCache] = None,
+    formato: FormatoSalida = 'xlsx'
+) -> int:
+    """
+    Consolida varias entregas Monitor y/o OutView en un único Excel
+
+    Las EntregaProcesada (ya procesadas en paralelo por tarea_entrega) solo
+    se leen; el resto de archivos se procesa acá, en secuencia, o se toma de
+    la caché. Las entregas de un mismo tipo se unen con unir_entregas (en
+    fechas solapadas gana la posterior en la lista) y el Excel se genera
+    igual que en tarea_consolidado.
+
+    Args:
+        monitores: Monitor .txt o EntregaProcesada, en orden de entrega (puede ser vacía)
+        outviews: OutView .xlsx o EntregaProcesada, en orden de entrega (puede ser vacía)
+        progreso: Función (paso, total, mensaje): un paso por archivo y el Excel
+        cache: Caché de DataFrames procesados (opcional)
+        formato: xlsx (por defecto), parquet o arrow (como en tarea_consolidado)
+
+    Raises:
+        ErrorTarea: 400 si un archivo es inválido, 500 si falla el procesamiento
+
+    Returns:
+        Tamaño del archivo generado en bytes
+    """
+    archivos = [('Monitor', f) for f in monitores] + [('OutView', f) for f in outviews]
+    if not archivos:
+        raise ErrorTarea(400, "Debe proveer al menos un archivo (Monitor o OutView)")
+
+    total = len(archivos) + 1
+    frames = _procesar_lote(archivos, cache, progreso, total)
+
+    df_monitor = unir_entregas(frames[:len(monitores)], COLUMNA_FECHA['Monitor']) if monitores else None
+    df_outview = unir_entregas(frames[len(monitores):], COLUMNA_FECHA['OutView']) if outviews else None
+
+    return _generar_salida(df_monitor, df_outview, ruta_salida, progreso, total, formato)
+
+
+def tarea_entrega(
+    origen: str,
+    fuente: Fuente,
+    ruta_salida: str,
+    cache: Optional[ResultCache] = None
+) -> EntregaProcesada:
+    """
+    Procesa un archivo de un lote y guarda el DataFrame en ruta_salida
+
+    Una tarea por archivo: el endpoint las reparte entre los workers y pasa
+    el resultado a tarea_lote o tarea_dataset_agregar. El Parquet se
+    escribe con tabla_tipada (columnas mezcladas sin perder tipos).
+
+    Args:
+        origen: Monitor u OutView
+
+    Raises:
+        ErrorTarea: 400 si el archivo es inválido, 500 si falla el procesamiento
+
+    Returns:
+        EntregaProcesada con ruta_salida y el nombre del archivo original
+    """
+    df = _procesar_archivo(origen, fuente, cache)
+    pq.write_table(tabla_tipada(df), ruta_salida)
+    return EntregaProcesada(ruta_salida, _nombre_archivo(fuente))
+
+
+def tarea_dataset_agregar(
+    ruta_dataset: str,
+    monitores: List[Fuente],
+    outviews: List[Fuente],
+    cache: Optional[ResultCache] = None
+) -> Dict[str, Any]:
+    """
+    Agrega entregas Monitor y/o OutView al dataset incremental
+
+    Los archivos (o EntregaProcesada) se leen y unen igual que en
+    tarea_lote; solo se reescriben los meses que cubren las entregas.
+
+    Raises:
+        ErrorTarea: 400 si un archivo es inválido, 500 si falla el procesamiento
+
+    Returns:
+        Cambios aplicados (ver DatasetMougli.agregar) y resumen del dataset
+    """
+    archivos = [('Monitor', f) for f in monitores] + [('OutView', f) for f in outviews]
+    if not archivos:
+        raise ErrorTarea(400, "Debe proveer al menos un archivo (Monitor o OutView)")
+
+    frames = _procesar_lote(archivos, cache, None, len(archivos))
+
+    df_monitor = unir_entregas(frames[:len(monitores)], COLUMNA_FECHA['Monitor']) if monitores else None
+    df_outview = unir_entregas(frames[len(monitores):], COLUMNA_FECHA['OutView']) if outviews else None
+
+    dataset = DatasetMougli(ruta_dataset)
+    try:
+        cambios = dataset.agregar(df_monitor, df_outview)
+    except Exception as e:
+        logger.error(f"❌ Error actualizando dataset {ruta_dataset}: {e}", exc_info=True)
+        raise ErrorTarea(500, f"Error actualizando dataset: {str(e)}")
+
+    return {**cambios, 'dataset': dataset.resumen()}
+
+
+def tarea_dataset_excel(ruta_dataset: str, ruta_salida: str) -> int:
+    """
+    Escribe en ruta_salida el Excel con la hoja Consolidado del dataset
+
+    Los metadatos salen de los resúmenes guardados en cada partición.
+
+    Raises:
+        ErrorTarea: 404 si el dataset está vacío, 500 si falla la generación
+
+    Returns:
+        Tamaño del Excel generado en bytes
+    """
+    dataset = DatasetMougli(ruta_dataset)
+    if not dataset.meses():
+        raise ErrorTarea(404, "El dataset está vacío")
+
+    try:
+        with open(ruta_salida, 'wb') as destino:
+            generar_excel_consolidado(dataset.leer(), dataset.metadatos(), destino)
+    except Exception as e:
+        logger.error(f"❌ Error generando Excel del dataset: {e}", exc_info=True)
+        raise ErrorTarea(500, f"Error generando Excel: {str(e)}")
+
+    return os.path.getsize(ruta_salida)
+
+
+def tarea_dataset_resumen(ruta_dataset: str) -> Dict[str, Any]:
+    """Resumen del dataset (ver DatasetMougli.resumen)"""
+    return DatasetMougli(ruta_dataset).resumen()
+
+
+def tarea_dataset_vaciar(ruta_dataset: str) -> None:
+    """Borra las particiones del dataset (espera a que termine un agregado en curso)"""
+    DatasetMougli(ruta_dataset).vaciar()
+
+
+def tarea_job(
+    ruta_monitor: Optional[Fuente],
+    ruta_outview: Optional[Fuente],
+    ruta_salida: str,
+    cache: Optional[ResultCache],
+    progreso: Progreso
+) -> int:
+    """
+    Job asíncrono: igual que tarea_consolidado pero con los uploads en disco
+
+    Recibe las rutas (o UploadEnDisco) del directorio del job; el Monitor se
+    lee en streaming, sin cargarlo entero.
+
+    Raises:
+        ErrorTarea: 400 si un archivo es inválido, 500 si falla el procesamiento
+
+    Returns:
+        Tamaño del Excel generado en bytes
+    """
+    return tarea_consolidado(ruta_monitor, ruta_outview, ruta_salida, progreso, cache)
+
+
+def _cargar(
+    origen: str,
+    processor: Union[MonitorProcessor, OutViewProcessor],
+    fuente: Fuente,
+    cache: Optional[ResultCache]
+) -> pd.DataFrame:
+    """
+    Procesa un archivo o recupera su resultado de la caché
+
+    El Monitor se decodifica y parsea en streaming desde la fuente y el
+    OutView se lee directo de su ruta. En un acierto de caché el procesador
+    queda con df y metadatos cargados, igual que después de procesar(), y se
+    reporta su último paso.
+    """
+    contenido = getattr(fuente, 'ruta', fuente)
+
+    with _abrir(contenido) as stream:
+        clave = None
+        if cache is not None and cache.activa:
+            huella_archivo = getattr(fuente, 'sha256', None) or huella(stream)
+            clave = cache.clave(origen, huella_archivo, processor.firma_factores())
+            guardado = cache.obtener(clave)
+            if guardado is not None:
+                processor.df, processor.metadatos = guardado
+                processor._reportar(processor.TOTAL_PASOS, "Resultado reutilizado de caché")
+                return processor.df
+
+        if origen == 'Monitor':
+            df = processor.procesar_stream(stream)
+
+    if origen == 'OutView':
+        df = processor.procesar(contenido)
+
+    if clave is not None:
+        cache.guardar(clave, df, processor.metadatos)
+
+    return df
+
+
+def _abrir(contenido: Union[bytes, str]) -> BinaryIO:
+    """Stream binario sobre bytes en memoria (sin copiarlos) o sobre una ruta"""
+    if isinstance(contenido, bytes):
+        return io.BytesIO(contenido)
+    return open(contenido, 'rb')
+
+
+def _etapa(progreso: Optional[Progreso], origen: str, offset: int, total: int) -> Optional[Progreso]:
+    """Traduce los pasos de un procesador al avance global del job"""
+    if progreso is None:
+        return None
+
+    def reportar(paso: int, _total: int, mensaje: str) -> None:
+        progreso(offset + paso, total, f"{origen}: {mensaje}")
+
+    return reportar
+
+
+def _procesar(origen: str, procesar: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Corre un procesador traduciendo sus errores a ErrorTarea"""
+    try:
+        df = procesar()
+        logger.info(f"{origen} procesado: {len(df)} filas")
+        return df
+
+    except ErrorTarea:
+        raise
+
+    except ValueError as e:
+        logger.error(f"Error de validación {origen}: {e}")
+        raise ErrorTarea(400, f"{origen} inválido: {str(e)}")
+
+    except Exception as e:
+        logger.error(f"Error procesando {origen}: {e}", exc_info=True)
+        raise ErrorTarea(500, f"Error interno procesando {origen}: {str(e)}")
+
+
+def _generar_salida(
+    df_monitor: Optional[pd.DataFrame],
+    df_outview: Optional[pd.DataFrame],
+    ruta_salida: str,
+    progreso: Optional[Progreso],
+    total: int,
+    formato: FormatoSalida = 'xlsx'
+) -> int:
+    """
+    Escribe el Excel Mougli (1-3 hojas) o las tablas Parquet/Arrow en
+    ruta_salida y reporta los dos últimos pasos
+    """
+    nombre = NOMBRES_FORMATO[formato]
+    try:
+        if progreso is not None:
+            progreso(total - 1, total, f"Generando {nombre}…")
+
+        if formato == 'xlsx':
+            with open(ruta_salida, 'wb') as destino:
+                generar_excel_mougli_completo(
+                    df_monitor=df_monitor,
+                    df_outview=df_outview,
+                    destino=destino
+                )
+        else:
+            exportar_tablas_mougli(df_monitor, df_outview, formato, ruta_salida)
+
+    except Exception as e:
+        logger.error(f"❌ Error generando {nombre} consolidado: {e}", exc_info=True)
+        raise ErrorTarea(500, f"Error generando {nombre}: {str(e)}")
+
+    if progreso is not None:
+        progreso(total, total, f"{nombre} generado")
+
+    return os.path.getsize(ruta_salida)
+
+
+def _escribir_procesado(
+    processor: Union[MonitorProcessor, OutViewProcessor],
+    ruta_salida: str,
+    formato: FormatoSalida
+) -> None:
+    """Escribe el resultado de un procesador: su Excel o su tabla Parquet/Arrow"""
+    if formato == 'xlsx':
+        with open(ruta_salida, 'wb') as destino:
+            processor.generar_excel(destino)
+    else:
+        processor.exportar_tabla(ruta_salida, formato)
+
+
+def _procesar_lote(
+    archivos: List[Tuple[str, Fuente]],
+    cache: Optional[ResultCache],
+    progreso: Optional[Progreso],
+    total: int
+) -> List[pd.DataFrame]:
+    """
+    Procesa (origen, fuente) de un lote y devuelve los DataFrames en el mismo orden
+
+    Las EntregaProcesada se leen de su Parquet; el resto se procesa en
+    secuencia dentro de esta tarea (sin abrir otro pool).
+    """
+    frames: List[pd.DataFrame] = []
+    for i, (origen, fuente) in enumerate(archivos, start=1):
+        frames.append(_procesar_archivo(origen, fuente, cache))
+        if progreso is not None:
+            progreso(i, total, f"{_etiqueta(origen, fuente)} procesado")
+
+    return frames
+
+
+def _procesar_archivo(origen: str, fuente: Fuente, cache: Optional[ResultCache]) -> pd.DataFrame:
+    """Procesa un archivo del lote (o lo toma de la caché o de su EntregaProcesada)"""
+    if isinstance(fuente, EntregaProcesada):
+        return dataframe_tipado(pq.read_table(fuente.ruta))
+
+    processor = MonitorProcessor() if origen == 'Monitor' else OutViewProcessor()
+    return _procesar(_etiqueta(origen, fuente), lambda: _cargar(origen, processor, fuente, cache))
+
+
+def _etiqueta(origen: str, fuente: Fuente) -> str:
+    """Origen y nombre del archivo para mensajes ("Monitor enero.txt")"""
+    nombre = _nombre_archivo(fuente)
+    return f"{origen} {nombre}" if nombre else origen
+
+
+def _nombre_archivo(fuente: Fuente) -> Optional[str]:
+    """Nombre original del archivo (upload, entrega o ruta), si se conoce"""
+    nombre = getattr(fuente, 'filename', None)
+    if nombre is None and isinstance(fuente, str):
+        nombre = os.path.basename(fuente)
+    return nombre
+
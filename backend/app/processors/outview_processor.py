@@ -23,17 +23,35 @@ from __future__ import annotations
 
 import io
 import logging
+import os
+import time
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
+from pandas.io.parsers import TextParser
+from openpyxl import load_workbook
+
+from .excel_writer import (
+    FORMATO_FECHA, anotar_partes, crear_workbook, escribir_dataframe, escribir_filas, partes_hoja
+)
+from .tabla_writer import FormatoSalida, escribir_tabla
+
+# Lector rápido opcional (calamine, en Rust). Si no está instalado se usa
+# openpyxl en modo read-only/values-only.
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # pragma: no cover - depende del entorno
+    CalamineWorkbook = None
 
 # Configurar logging
 logger = logging.getLogger('mougli.outview')
 
+# Archivo OutView: contenido en memoria o ruta en disco
+ArchivoExcel = Union[bytes, str, 'os.PathLike[str]']
+
 
 class OutViewProcessor:
     """
@@ -47,7 +65,7 @@ class OutViewProcessor:
         df (DataFrame): Datos procesados
 
     Métodos públicos:
-        procesar(file_content: bytes) -> pd.DataFrame
+        procesar(file_content: bytes | ruta) -> pd.DataFrame
         generar_excel() -> io.BytesIO
     """
 
@@ -70,6 +88,93 @@ class OutViewProcessor:
         'VALLA ALTA': 1733.33
     }
 
+    # Componentes de Codigo_Unico (K_UNICO): elemento en ubicación durante un mes
+    COMPONENTES_CODIGO_UNICO = [
+        'Mes',
+        'AÑO',
+        'Latitud',
+        'Longitud',
+        'Avenida',
+        'Nro Calle/Cuadra',
+        'Marca',
+        'Tipo Elemento',
+        'Orientación de Vía',
+        'Tarifa S/.',
+        'Proveedor',
+        'Distrito',
+        'Cod.Proveedor'
+    ]
+
+    # Componentes de Codigo_Pieza (K_PIEZA): elemento + versión + semana
+    COMPONENTES_CODIGO_PIEZA = [
+        'NombreBase',
+        'Proveedor',
+        'Tipo Elemento',
+        'Distrito',
+        'Orientación de Vía',
+        'Nro Calle/Cuadra',
+        'Item',
+        'Versión',
+        'Latitud',
+        'Longitud',
+        'Categoría',
+        'Tarifa S/.',
+        'Anunciante',
+        'Mes',
+        'AÑO',
+        'SEMANA'
+    ]
+
+    # Clave de ubicación (sin periodo) usada por denominadores y Tarifa_2
+    COLUMNAS_UBICACION = [
+        'Proveedor',
+        'Tipo Elemento',
+        'Distrito',
+        'Avenida',
+        'Nro Calle/Cuadra',
+        'Orientación de Vía',
+        'Marca'
+    ]
+
+    # Columnas del archivo crudo que usa el pipeline (las demás no se cargan)
+    COLUMNAS_ENTRADA = [
+        'Fecha',
+        'NombreBase',
+        'Medio',
+        'Proveedor',
+        'Cod.Proveedor',
+        'Tipo Elemento',
+        'Distrito',
+        'Avenida',
+        'Nro Calle/Cuadra',
+        'Orientación de Vía',
+        'Sector',
+        'Categoría',
+        'Item',
+        'Marca',
+        'Producto',
+        'Versión',
+        'Agencia',
+        'Anunciante',
+        'Región',
+        'Tipo Tarifa',
+        'Duración (Seg)',
+        'Latitud',
+        'Longitud',
+        'EstadoAviso',
+        'RUC',
+        'Tarifa S/.'
+    ]
+
+    # Columnas mínimas para reconocer la fila de header
+    COLUMNAS_REQUERIDAS = ['Fecha', 'NombreBase', 'Tarifa S/.', 'Tipo Elemento']
+
+    # Filas iniciales donde se busca el header (normalmente la 2, fila 1 vacía)
+    FILAS_BUSQUEDA_HEADER = 10
+
+    # Celdas de error de Excel (se leen como NaN, igual que pandas)
+    ERRORES_EXCEL = {'#N/A', '#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!'}
+
     # Constantes de conversión
     TIPO_CAMBIO_USD = 3.0
     FACTOR_LED = 0.4
@@ -156,17 +261,37 @@ class OutViewProcessor:
         'AG': 15   # Tarifa Real ($)
     }
 
-    def __init__(self):
-        """Inicializa el procesador de OutView"""
+    # Último "PASO n" de procesar(), reportado a la función de progreso
+    TOTAL_PASOS = 21
+
+    def __init__(
+        self,
+        *,
+        debug_codigos: bool = False,
+        progreso: Optional[Callable[[int, int, str], None]] = None
+    ):
+        """
+        Inicializa el procesador de OutView
+
+        Args:
+            debug_codigos: Si True, agrega al output Codigo_Unico_Texto y
+                Codigo_Pieza_Texto con los códigos legibles ('|'-joined)
+            progreso: Función (paso, total, mensaje) llamada al terminar cada
+                PASO de procesar() (opcional, la usan los jobs asíncronos)
+        """
+        self.progreso = progreso
+        self.debug_codigos = debug_codigos
         self.df: Optional[pd.DataFrame] = None
         self.metadatos: Dict = {}
+        self.estadisticas_lectura: Dict = {}
 
-    def procesar(self, file_content: bytes) -> pd.DataFrame:
+    def procesar(self, file_content: ArchivoExcel) -> pd.DataFrame:
         """
         Procesa el contenido del archivo OutView (17 pasos)
 
         Args:
-            file_content: Contenido del archivo Excel
+            file_content: Contenido del archivo Excel, o su ruta en disco
+                (se lee desde el archivo sin cargarlo entero en memoria)
 
         Returns:
             DataFrame con datos procesados
@@ -179,41 +304,50 @@ class OutViewProcessor:
             logger.info("🚀 INICIANDO PROCESAMIENTO DE ARCHIVO OUTVIEW")
             logger.info("=" * 60)
 
-            # PASO 1: Leer Excel (CRÍTICO: skiprows=1 porque fila 1 está vacía)
+            # PASO 1: Leer Excel (header detectado en las primeras filas)
             logger.info("PASO 1: Leer Excel")
             self.df = self._leer_excel(file_content)
             logger.info(f"✅ OutView leído: {len(self.df)} filas, {len(self.df.columns)} columnas")
+            self._reportar(1, f"Excel leído: {len(self.df)} filas")
 
             # PASO 2-3: Fechas derivadas
             logger.info("PASO 2-3: Procesar fechas")
             self.df = self._procesar_fechas(self.df)
             self.df = self._extraer_mes_nombrebase(self.df)
+            self._reportar(3, "Fechas procesadas")
 
             # PASO 4: Identificadores únicos
             logger.info("PASO 4: Crear identificadores únicos")
             self.df = self._crear_codigo_unico(self.df)
             self.df = self._crear_codigo_pieza(self.df)
+            self._reportar(4, "Identificadores únicos creados")
 
             # PASO 5-6: Denominadores
             logger.info("PASO 5-6: Calcular denominadores")
+            self.df = self._codificar_ubicacion(self.df)
             self.df = self._calcular_denominador_1(self.df)
             self.df = self._calcular_denominador_2(self.df)
+            self._reportar(6, "Denominadores calculados")
 
             # PASO 7-15: Tarifas (9 pasos)
             logger.info("PASO 7-15: Calcular tarifas")
             self.df = self._calcular_tarifas(self.df)
+            self._reportar(15, "Tarifas calculadas")
 
             # PASO 16-19: Columnas finales
             logger.info("PASO 16-19: Calcular columnas finales")
             self.df = self._calcular_columnas_finales(self.df)
+            self._reportar(19, "Columnas finales calculadas")
 
             # PASO 20: Reordenar columnas
             logger.info("PASO 20: Reordenar columnas")
             self.df = self._reordenar_columnas(self.df)
+            self._reportar(20, "Columnas reordenadas")
 
             # PASO 21: Calcular metadatos
             logger.info("PASO 21: Calcular metadatos")
             self._calcular_metadatos()
+            self._reportar(21, "Metadatos calculados")
 
             logger.info("=" * 60)
             logger.info(f"✅ PROCESAMIENTO COMPLETADO: {len(self.df)} filas × {len(self.df.columns)} columnas")
@@ -228,109 +362,186 @@ class OutViewProcessor:
             logger.error(f"❌ Error inesperado en procesamiento: {type(e).__name__}: {str(e)}", exc_info=True)
             raise ValueError(f"Error procesando archivo OutView: {str(e)}")
 
-    def _leer_excel(self, file_content: bytes) -> pd.DataFrame:
+    def firma_factores(self) -> Dict:
+        """Factores y opciones que determinan el resultado (parte de la clave de caché)"""
+        return {
+            'TIPO_CAMBIO_USD': self.TIPO_CAMBIO_USD,
+            'FACTOR_LED': self.FACTOR_LED,
+            'FACTOR_OTROS': self.FACTOR_OTROS,
+            'TOPES_TARIFA': self.TOPES_TARIFA,
+            'debug_codigos': self.debug_codigos
+        }
+
+    def _reportar(self, paso: int, mensaje: str) -> None:
+        """Informa el PASO terminado a la función de progreso (si hay)"""
+        if self.progreso is not None:
+            self.progreso(paso, self.TOTAL_PASOS, mensaje)
+
+    def _leer_excel(self, file_content: ArchivoExcel) -> pd.DataFrame:
         """
-        Lee archivo Excel saltando fila 1 vacía
+        Lee la primera hoja del Excel en una sola pasada
 
-        CRÍTICO: La fila 1 SIEMPRE está vacía en archivos OutView
+        El header se detecta en las primeras FILAS_BUSQUEDA_HEADER filas
+        (normalmente la fila 2, porque la fila 1 está vacía) y solo se cargan
+        las COLUMNAS_ENTRADA. Las celdas se convierten igual que
+        pd.read_excel(engine='openpyxl').
         """
         try:
-            logger.info("=" * 80)
-            logger.info("📄 _leer_excel(): INICIANDO LECTURA DE EXCEL")
-            logger.info("=" * 80)
-            logger.info(f"📊 Tamaño del contenido: {len(file_content)} bytes ({len(file_content) / 1024:.2f} KB)")
-            logger.info(f"📝 Tipo del contenido: {type(file_content)}")
+            es_ruta = not isinstance(file_content, (bytes, bytearray))
+            tamano = os.path.getsize(file_content) if es_ruta else len(file_content)
+            logger.info(f"📊 Tamaño del contenido: {tamano} bytes ({tamano / 1024:.2f} KB)")
 
             # Validar que el contenido no esté vacío
-            if not file_content or len(file_content) == 0:
+            if tamano == 0:
                 logger.error("❌ El contenido del archivo está vacío")
                 raise ValueError("El archivo está vacío")
 
             # Verificar los primeros bytes para confirmar que es un archivo Excel
-            magic_bytes = file_content[:4]
-            logger.info(f"🔍 Magic bytes (primeros 4 bytes): {magic_bytes.hex()}")
-            if magic_bytes[:2] == b'PK':
-                logger.info("✅ Archivo parece ser un ZIP/XLSX válido (comienza con 'PK')")
+            if es_ruta:
+                with open(file_content, 'rb') as f:
+                    magic_bytes = f.read(4)
             else:
+                magic_bytes = file_content[:4]
+            if magic_bytes[:2] != b'PK':
                 logger.warning(f"⚠️ Archivo no comienza con 'PK' (ZIP signature). Magic bytes: {magic_bytes.hex()}")
 
-            # Intentar leer con skiprows=1 primero (formato estándar)
-            logger.info("🔄 Intento 1: Leyendo Excel con skiprows=1...")
-            try:
-                df = pd.read_excel(
-                    io.BytesIO(file_content),
-                    engine='openpyxl',  # Especificar engine explícitamente
-                    skiprows=1  # ⚠️ CRÍTICO: Salta fila 1 vacía
-                )
-                logger.info(f"✅ Excel leído con skiprows=1: {len(df)} filas, {len(df.columns)} columnas")
-            except Exception as e1:
-                logger.warning("=" * 80)
-                logger.warning(f"⚠️ No se pudo leer con skiprows=1")
-                logger.warning(f"   Tipo de error: {type(e1).__name__}")
-                logger.warning(f"   Mensaje: {str(e1)}")
-                logger.warning("=" * 80)
-                logger.info("🔄 Intento 2: Leyendo Excel sin skiprows...")
-
-                # Intentar sin skiprows (algunos archivos pueden no tener fila vacía)
-                try:
-                    df = pd.read_excel(
-                        io.BytesIO(file_content),
-                        engine='openpyxl',
-                        skiprows=0
-                    )
-                    logger.info(f"✅ Excel leído sin skiprows: {len(df)} filas, {len(df.columns)} columnas")
-                except Exception as e2:
-                    logger.error("=" * 80)
-                    logger.error(f"❌ No se pudo leer el Excel con ningún método")
-                    logger.error(f"   Error con skiprows=1: {type(e1).__name__}: {str(e1)}")
-                    logger.error(f"   Error con skiprows=0: {type(e2).__name__}: {str(e2)}")
-                    logger.error("=" * 80)
-                    raise e2
-
-            logger.info(f"📋 Total de columnas encontradas: {len(df.columns)}")
-            logger.info(f"📋 Primeras 15 columnas: {list(df.columns)[:15]}")
-            if len(df.columns) > 15:
-                logger.info(f"📋 Siguientes columnas: {list(df.columns)[15:30]}")
+            motor = 'calamine' if CalamineWorkbook is not None else 'openpyxl'
+            logger.info(f"🔄 Leyendo Excel con {motor}...")
+
+            inicio = time.perf_counter()
+            filas = self._iterar_filas_excel(file_content, motor)
+            fila_header, nombres, indices = self._detectar_header(filas)
+            df = self._construir_dataframe(filas, nombres, indices)
+            segundos = time.perf_counter() - inicio
+
+            self.estadisticas_lectura = {
+                'motor_lectura': motor,
+                'fila_header': fila_header,
+                'segundos_lectura': round(segundos, 3),
+                'filas_por_segundo_lectura': round(len(df) / segundos) if segundos > 0 else 0
+            }
+            logger.info(
+                f"✅ Excel leído: {len(df)} filas, {len(df.columns)} columnas "
+                f"(header en fila {fila_header}, {self.estadisticas_lectura['filas_por_segundo_lectura']:,} filas/s)"
+            )
 
             # Validar que no esté vacío
             if len(df) == 0:
                 logger.error("❌ El archivo está vacío (0 filas de datos)")
                 raise ValueError("El archivo Excel no contiene datos")
-            logger.info(f"✅ Archivo contiene {len(df)} filas de datos")
-
-            # Validar columnas mínimas requeridas
-            logger.info("🔍 Validando columnas requeridas...")
-            columnas_requeridas = ['Fecha', 'NombreBase', 'Tarifa S/.', 'Tipo Elemento']
-            columnas_faltantes = [col for col in columnas_requeridas if col not in df.columns]
-
-            if columnas_faltantes:
-                logger.error("=" * 80)
-                logger.error(f"❌ COLUMNAS FALTANTES: {columnas_faltantes}")
-                logger.error(f"📋 Columnas requeridas: {columnas_requeridas}")
-                logger.error(f"📋 Columnas disponibles en el archivo ({len(df.columns)}):")
-                for i, col in enumerate(df.columns, 1):
-                    logger.error(f"   {i}. '{col}'")
-                logger.error("=" * 80)
-                raise ValueError(f"Archivo OutView inválido. Columnas faltantes: {', '.join(columnas_faltantes)}")
-
-            logger.info(f"✅ Todas las columnas requeridas están presentes")
-            logger.info("=" * 80)
-            logger.info("✅ _leer_excel(): LECTURA COMPLETADA EXITOSAMENTE")
-            logger.info("=" * 80)
+
             return df
 
         except ValueError as ve:
             logger.error(f"❌ ValueError en _leer_excel(): {str(ve)}")
             raise
         except Exception as e:
-            logger.error("=" * 80)
-            logger.error(f"❌ Excepción inesperada en _leer_excel()")
-            logger.error(f"   Tipo: {type(e).__name__}")
-            logger.error(f"   Mensaje: {str(e)}")
-            logger.error(f"   Args: {e.args}")
-            logger.error("=" * 80, exc_info=True)
+            logger.error(f"❌ Excepción inesperada en _leer_excel(): {type(e).__name__}: {str(e)}", exc_info=True)
             raise ValueError(f"Error leyendo archivo Excel: {str(e)}")
 
+    def _iterar_filas_excel(self, file_content: ArchivoExcel, motor: str) -> Iterator[tuple]:
+        """
+        Itera los valores de la primera hoja, fila por fila (sin objetos celda)
+
+        Con una ruta, calamine y openpyxl leen el ZIP directo del archivo.
+        """
+        es_ruta = not isinstance(file_content, (bytes, bytearray))
+
+        if motor == 'calamine':
+            if es_ruta:
+                libro_calamine = CalamineWorkbook.from_path(os.fspath(file_content))
+            else:
+                libro_calamine = CalamineWorkbook.from_filelike(io.BytesIO(file_content))
+            yield from libro_calamine.get_sheet_by_index(0).iter_rows()
+            return
+
+        origen = file_content if es_ruta else io.BytesIO(file_content)
+        libro = load_workbook(origen, read_only=True, data_only=True, keep_links=False)
+        try:
+            hoja = libro.worksheets[0]
+            hoja.reset_dimensions()
+            yield from hoja.iter_rows(values_only=True)
+        finally:
+            libro.close()
+
+    def _detectar_header(self, filas: Iterator[tuple]) -> Tuple[int, List[str], List[int]]:
+        """
+        Consume filas hasta encontrar el header (dentro de FILAS_BUSQUEDA_HEADER)
+
+        Returns:
+            Número de fila del header (1-based), nombres e índices de las
+            COLUMNAS_ENTRADA presentes (en el orden del archivo)
+
+        Raises:
+            ValueError: Si ninguna fila contiene las columnas requeridas
+        """
+        mejor_candidata: List[str] = []
+        mejor_coincidencias = -1
+
+        for numero_fila, fila in enumerate(filas, start=1):
+            nombres = [str(valor).strip() if valor is not None else '' for valor in fila]
+            coincidencias = sum(col in nombres for col in self.COLUMNAS_REQUERIDAS)
+
+            if coincidencias == len(self.COLUMNAS_REQUERIDAS):
+                indices = sorted(nombres.index(col) for col in self.COLUMNAS_ENTRADA if col in nombres)
+                return numero_fila, [nombres[i] for i in indices], indices
+
+            if coincidencias > mejor_coincidencias:
+                mejor_candidata, mejor_coincidencias = nombres, coincidencias
+
+            if numero_fila >= self.FILAS_BUSQUEDA_HEADER:
+                break
+
+        columnas_faltantes = [col for col in self.COLUMNAS_REQUERIDAS if col not in mejor_candidata]
+        logger.error(f"❌ COLUMNAS FALTANTES: {columnas_faltantes}")
+        logger.error(f"📋 Columnas requeridas: {self.COLUMNAS_REQUERIDAS}")
+        logger.error(f"📋 Mejor fila candidata a header: {[col for col in mejor_candidata if col]}")
+        raise ValueError(f"Archivo OutView inválido. Columnas faltantes: {', '.join(columnas_faltantes)}")
+
+    def _construir_dataframe(
+        self,
+        filas: Iterator[tuple],
+        nombres: List[str],
+        indices: List[int]
+    ) -> pd.DataFrame:
+        """
+        Arma el DataFrame con las filas restantes, solo en las columnas indicadas
+
+        Las celdas se convierten como en pandas (vacío → '', número entero →
+        int, error → NaN) y la inferencia de tipos se delega a TextParser, así
+        el resultado es el mismo que pd.read_excel(usecols=...).
+        """
+        datos: List[list] = [nombres]
+        ultima_con_datos = 0
+        convertir = self._convertir_celda
+
+        for fila in filas:
+            ancho = len(fila)
+            valores = [convertir(fila[i]) if i < ancho else '' for i in indices]
+            datos.append(valores)
+
+            # Una fila cuenta como no vacía aunque solo tenga datos fuera de las columnas cargadas
+            if any(valor != '' for valor in valores) or any(v is not None and v != '' for v in fila):
+                ultima_con_datos = len(datos) - 1
+
+        # Descartar filas vacías al final (igual que pandas)
+        del datos[ultima_con_datos + 1:]
+
+        return TextParser(datos, header=0, skip_blank_lines=False).read()
+
+    def _convertir_celda(self, valor):
+        """Convierte un valor de celda igual que el lector openpyxl de pandas"""
+        if valor is None:
+            return ''
+        if isinstance(valor, float):
+            return int(valor) if valor.is_integer() else valor
+        if isinstance(valor, str) and valor in self.ERRORES_EXCEL:
+            return np.nan
+        if type(valor) is date:  # calamine entrega fechas sin hora como date
+            return pd.Timestamp(valor)
+
+        return valor
+
     def _procesar_fechas(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Extrae fechas derivadas: AÑO, MES, SEMANA
@@ -386,23 +597,12 @@ class OutViewProcessor:
 
         Identifica un elemento físico único en una ubicación durante un mes
         """
-        df['Codigo_Unico'] = (
-            df['Mes'].astype(str) + '|' +
-            df['AÑO'].astype(str) + '|' +
-            df['Latitud'].astype(str) + '|' +
-            df['Longitud'].astype(str) + '|' +
-            df['Avenida'].astype(str) + '|' +
-            df['Nro Calle/Cuadra'].astype(str) + '|' +
-            df['Marca'].astype(str) + '|' +
-            df['Tipo Elemento'].astype(str) + '|' +
-            df['Orientación de Vía'].astype(str) + '|' +
-            df['Tarifa S/.'].astype(str) + '|' +
-            df['Proveedor'].astype(str) + '|' +
-            df['Distrito'].astype(str) + '|' +
-            df['Cod.Proveedor'].astype(str)
-        )
+        df['Codigo_Unico'] = self._codigo_compuesto(df, self.COMPONENTES_CODIGO_UNICO)
+
+        if self.debug_codigos:
+            df['Codigo_Unico_Texto'] = self._codigo_legible(df, self.COMPONENTES_CODIGO_UNICO)
 
-        logger.info(f"Codigo_Unico creado: {df['Codigo_Unico'].nunique()} códigos únicos")
+        logger.info(f"Codigo_Unico creado: {self._contar_codigos(df['Codigo_Unico'])} códigos únicos")
 
         return df
 
@@ -412,47 +612,95 @@ class OutViewProcessor:
 
         Identifica una pieza publicitaria específica (elemento + versión + semana)
         """
-        df['Codigo_Pieza'] = (
-            df['NombreBase'].astype(str) + '|' +
-            df['Proveedor'].astype(str) + '|' +
-            df['Tipo Elemento'].astype(str) + '|' +
-            df['Distrito'].astype(str) + '|' +
-            df['Orientación de Vía'].astype(str) + '|' +
-            df['Nro Calle/Cuadra'].astype(str) + '|' +
-            df['Item'].astype(str) + '|' +
-            df['Versión'].astype(str) + '|' +
-            df['Latitud'].astype(str) + '|' +
-            df['Longitud'].astype(str) + '|' +
-            df['Categoría'].astype(str) + '|' +
-            df['Tarifa S/.'].astype(str) + '|' +
-            df['Anunciante'].astype(str) + '|' +
-            df['Mes'].astype(str) + '|' +
-            df['AÑO'].astype(str) + '|' +
-            df['SEMANA'].astype(str)
-        )
+        df['Codigo_Pieza'] = self._codigo_compuesto(df, self.COMPONENTES_CODIGO_PIEZA)
 
-        logger.info(f"Codigo_Pieza creado: {df['Codigo_Pieza'].nunique()} piezas únicas")
+        if self.debug_codigos:
+            df['Codigo_Pieza_Texto'] = self._codigo_legible(df, self.COMPONENTES_CODIGO_PIEZA)
+
+        logger.info(f"Codigo_Pieza creado: {self._contar_codigos(df['Codigo_Pieza'])} piezas únicas")
 
         return df
 
+    @staticmethod
+    def _codigo_compuesto(df: pd.DataFrame, componentes: List[str]) -> np.ndarray:
+        """
+        Id entero denso (0..n-1) por combinación de valores de los componentes
+
+        Equivale a unir los componentes con '|' y factorizar el string, pero
+        sin crear columnas de texto intermedias. Los nulos cuentan como un
+        valor más (igual que 'nan' en la versión de texto).
+        """
+        return df.groupby(componentes, sort=False, dropna=False).ngroup().to_numpy()
+
+    @staticmethod
+    def _codigo_legible(df: pd.DataFrame, componentes: List[str]) -> pd.Series:
+        """Versión de texto del código ('|'-joined), solo para depuración"""
+        codigo = df[componentes[0]].astype(str)
+        for col in componentes[1:]:
+            codigo = codigo + '|' + df[col].astype(str)
+
+        return codigo
+
+    @staticmethod
+    def _contar_codigos(codigos: pd.Series) -> int:
+        """Cantidad de códigos distintos (los ids son densos desde 0)"""
+        return int(codigos.max()) + 1 if len(codigos) else 0
+
+    def _codificar_ubicacion(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Factoriza la clave de ubicación (COLUMNAS_UBICACION) en códigos enteros
+
+        Es el único paso que hashea las 7 columnas de texto; Denominador_1,
+        Denominador_2 y Tarifa_2 agregan sobre estos códigos. Filas con
+        alguna clave nula quedan con NaN (groupby las excluye).
+        """
+        df['Grupo_Ubicacion'] = df.groupby(self.COLUMNAS_UBICACION, sort=False).ngroup()
+
+        logger.info(f"Ubicaciones únicas: {df['Grupo_Ubicacion'].nunique()}")
+
+        return df
+
+    def _codificar_grupo_periodo(self, df: pd.DataFrame, columna_periodo: str) -> np.ndarray:
+        """
+        Combina el código de ubicación con un periodo (Fecha o Mes)
+
+        Returns:
+            Array int64 de códigos de grupo densos (0..n-1), -1 si la fila
+            no pertenece a ningún grupo (clave nula)
+        """
+        if 'Grupo_Ubicacion' not in df.columns:
+            self._codificar_ubicacion(df)
+
+        ubicacion = df['Grupo_Ubicacion'].to_numpy(dtype='float64')
+        periodo, periodos = pd.factorize(df[columna_periodo], use_na_sentinel=True)
+
+        valido = ~np.isnan(ubicacion) & (periodo >= 0)
+        combinado = ubicacion[valido].astype('int64') * len(periodos) + periodo[valido]
+
+        codigos = np.full(len(df), -1, dtype='int64')
+        codigos[valido], _ = pd.factorize(combinado)
+
+        return codigos
+
+    @staticmethod
+    def _contar_por_grupo(codigos: np.ndarray) -> np.ndarray:
+        """Tamaño del grupo de cada fila (NaN para filas sin grupo)"""
+        valido = codigos >= 0
+        conteos = np.bincount(codigos[valido])
+
+        resultado = np.full(len(codigos), np.nan)
+        resultado[valido] = conteos[codigos[valido]]
+
+        return resultado
+
     def _calcular_denominador_1(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calcula Denominador_1: Contador por FECHA (día)
 
         Agrupa por fecha + ubicación para contar apariciones diarias
         """
-        denominador1 = df.groupby([
-            'Fecha',  # ⚠️ Por DÍA
-            'Proveedor',
-            'Tipo Elemento',
-            'Distrito',
-            'Avenida',
-            'Nro Calle/Cuadra',
-            'Orientación de Vía',
-            'Marca'
-        ]).transform('size')
-
-        df['Denominador_1'] = denominador1
+        df['Grupo_Dia'] = self._codificar_grupo_periodo(df, 'Fecha')  # ⚠️ Por DÍA
+        df['Denominador_1'] = self._contar_por_grupo(df['Grupo_Dia'].to_numpy())
 
         logger.info(f"Denominador_1: min={df['Denominador_1'].min()}, max={df['Denominador_1'].max()}, avg={df['Denominador_1'].mean():.2f}")
 
@@ -464,18 +712,8 @@ class OutViewProcessor:
 
         Agrupa por mes + ubicación para contar apariciones mensuales
         """
-        denominador2 = df.groupby([
-            'Mes',  # ⚠️ Por MES (no Fecha)
-            'Proveedor',
-            'Tipo Elemento',
-            'Distrito',
-            'Avenida',
-            'Nro Calle/Cuadra',
-            'Orientación de Vía',
-            'Marca'
-        ]).transform('size')
-
-        df['Denominador_2'] = denominador2
+        df['Grupo_Mes'] = self._codificar_grupo_periodo(df, 'Mes')  # ⚠️ Por MES (no Fecha)
+        df['Denominador_2'] = self._contar_por_grupo(df['Grupo_Mes'].to_numpy())
 
         logger.info(f"Denominador_2: min={df['Denominador_2'].min()}, max={df['Denominador_2'].max()}, avg={df['Denominador_2'].mean():.2f}")
 
@@ -494,59 +732,46 @@ class OutViewProcessor:
         logger.info(f"Paso 5 - Tarifa_USD: ${df['Tarifa_USD'].sum():,.2f} total")
 
         # PASO 6: Tarifa_1 (prorratea por día)
-        df['Tarifa_1'] = df.apply(
-            lambda row: row['Tarifa_USD'] / row['Denominador_1']
-                        if row['Denominador_1'] > 0
-                        else 0,
-            axis=1
-        )
+        df['Tarifa_1'] = self._dividir_seguro(df['Tarifa_USD'], df['Denominador_1'])
         logger.info(f"Paso 6 - Tarifa_1: ${df['Tarifa_1'].sum():,.2f} total")
 
-        # PASO 7: Tarifa_2 (suma por mes)
-        tarifa2 = df.groupby([
-            'Mes',
-            'Proveedor',
-            'Tipo Elemento',
-            'Distrito',
-            'Avenida',
-            'Nro Calle/Cuadra',
-            'Orientación de Vía',
-            'Marca'
-        ])['Tarifa_1'].transform('sum')
-        df['Tarifa_2'] = tarifa2
-        logger.info(f"Paso 7 - Tarifa_2: ${df['Tarifa_2'].sum():,.2f} total")
+        # PASO 7: Tarifa_2 (suma por mes + ubicación)
+        # Se agrupa por los códigos enteros de Grupo_Mes: no se vuelven a
+        # hashear las columnas de texto y la suma compensada de pandas da el
+        # mismo resultado bit a bit que agrupar por las 8 columnas.
+        if 'Grupo_Mes' not in df.columns:
+            df['Grupo_Mes'] = self._codificar_grupo_periodo(df, 'Mes')
 
-        # PASO 8: Tarifa_3 (aplicar tope)
-        def aplicar_tope(row):
-            tipo_elem = row['Tipo Elemento']
-            tarifa2 = row['Tarifa_2']
-            tope = self.TOPES_TARIFA.get(tipo_elem, float('inf'))
+        grupo_mes = df['Grupo_Mes'].where(df['Grupo_Mes'] >= 0)
+        df['Tarifa_2'] = df['Tarifa_1'].groupby(grupo_mes, sort=False).transform('sum')
+        logger.info(f"Paso 7 - Tarifa_2: ${df['Tarifa_2'].sum():,.2f} total")
 
-            if tope == float('inf'):
-                logger.warning(f"Tipo desconocido sin tope: '{tipo_elem}'")
+        # PASO 8: Tarifa_3 (aplicar tope por tipo de elemento)
+        topes = df['Tipo Elemento'].map(self.TOPES_TARIFA)
+        sin_tope = topes.isna()
 
-            return min(tarifa2, tope)
+        if sin_tope.any():
+            desconocidos = df.loc[sin_tope, 'Tipo Elemento'].value_counts(dropna=False)
+            logger.warning(
+                f"Tipos desconocidos sin tope ({int(sin_tope.sum())} filas): "
+                f"{desconocidos.to_dict()}"
+            )
 
-        df['Tarifa_3'] = df.apply(aplicar_tope, axis=1)
+        df['Tarifa_3'] = np.minimum(
+            df['Tarifa_2'].to_numpy(dtype='float64'),
+            topes.fillna(np.inf).to_numpy(dtype='float64')
+        )
         logger.info(f"Paso 8 - Tarifa_3 (con topes): ${df['Tarifa_3'].sum():,.2f} total")
 
         # PASO 9: Tarifa_4 (prorratea por mes)
-        df['Tarifa_4'] = df.apply(
-            lambda row: row['Tarifa_3'] / row['Denominador_2']
-                        if row['Denominador_2'] > 0
-                        else 0,
-            axis=1
-        )
+        df['Tarifa_4'] = self._dividir_seguro(df['Tarifa_3'], df['Denominador_2'])
         logger.info(f"Paso 9 - Tarifa_4: ${df['Tarifa_4'].sum():,.2f} total")
 
         # PASO 10: Tarifa Real ($) - FINAL
-        def aplicar_factor(row):
-            if row['Tipo Elemento'] == 'PANTALLA LED':
-                return row['Tarifa_4'] * self.FACTOR_LED
-            else:
-                return row['Tarifa_4'] * self.FACTOR_OTROS
+        es_led = (df['Tipo Elemento'] == 'PANTALLA LED').to_numpy()
+        factor = np.where(es_led, self.FACTOR_LED, self.FACTOR_OTROS)
 
-        df['Tarifa Real ($)'] = df.apply(aplicar_factor, axis=1)
+        df['Tarifa Real ($)'] = df['Tarifa_4'].to_numpy(dtype='float64') * factor
 
         # Redondear a 2 decimales
         df['Tarifa Real ($)'] = df['Tarifa Real ($)'].round(2)
@@ -556,6 +781,22 @@ class OutViewProcessor:
 
         return df
 
+    @staticmethod
+    def _dividir_seguro(numerador: pd.Series, denominador: pd.Series) -> np.ndarray:
+        """
+        Divide columna a columna devolviendo 0 donde el denominador no es > 0
+
+        Un denominador NaN (grupo con clave nula) también da 0.
+        """
+        num = numerador.to_numpy(dtype='float64')
+        den = denominador.to_numpy(dtype='float64')
+        valido = den > 0
+
+        resultado = np.zeros(len(num), dtype='float64')
+        np.divide(num, den, out=resultado, where=valido)
+
+        return resultado
+
     def _calcular_columnas_finales(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calcula columnas finales (PASO 16-19)
@@ -567,9 +808,9 @@ class OutViewProcessor:
         df['Q versiones por elemento Mes'] = df['Codigo_Unico'].map(versiones)
         logger.info(f"Q versiones: avg={df['Q versiones por elemento Mes'].mean():.2f}")
 
-        # PASO 17: +1 Superficie
-        superficie = df.groupby('Codigo_Pieza').transform('size')
-        df['+1 Superficie'] = superficie
+        # PASO 17: +1 Superficie (ids densos → conteo directo)
+        codigos_pieza = df['Codigo_Pieza'].to_numpy()
+        df['+1 Superficie'] = np.bincount(codigos_pieza)[codigos_pieza]
         logger.info(f"+1 Superficie: avg={df['+1 Superficie'].mean():.2f}")
 
         # PASO 18: Tarifa × Superficie
@@ -600,6 +841,7 @@ class OutViewProcessor:
         # Eliminar columnas temporales
         columnas_temp = [
             'Mes_Codigo', 'Codigo_Unico', 'Codigo_Pieza',
+            'Grupo_Ubicacion', 'Grupo_Dia', 'Grupo_Mes',
             'Denominador_1', 'Denominador_2', 'Tarifa_USD',
             'Tarifa_1', 'Tarifa_2', 'Tarifa_3', 'Tarifa_4', 'Mes'
         ]
@@ -608,8 +850,12 @@ class OutViewProcessor:
             if col in df.columns:
                 df = df.drop(columns=[col])
 
-        # Reordenar
-        df = df[self.COLUMNAS_OUTPUT]
+        # Reordenar (en modo depuración se conservan los códigos legibles al final)
+        columnas = list(self.COLUMNAS_OUTPUT)
+        if self.debug_codigos:
+            columnas += [c for c in ('Codigo_Unico_Texto', 'Codigo_Pieza_Texto') if c in df.columns]
+
+        df = df[columnas]
 
         logger.info(f"Columnas reordenadas: {len(df.columns)} columnas en orden correcto")
 
@@ -632,14 +878,21 @@ class OutViewProcessor:
         if self.df['Tipo Elemento'].nunique() > 5:
             self.metadatos['tipos'] += '...'
 
+        # Rendimiento de lectura (motor, fila de header, filas/s)
+        self.metadatos.update(self.estadisticas_lectura)
+
         logger.info(f"Metadatos calculados: {self.metadatos}")
 
-    def generar_excel(self) -> io.BytesIO:
+    def generar_excel(self, destino: Optional[BinaryIO] = None) -> BinaryIO:
         """
         Genera archivo Excel con metadatos y datos procesados
 
+        Args:
+            destino: Archivo (file-like binario) donde escribir el Excel. Por
+                defecto un BytesIO nuevo
+
         Returns:
-            BytesIO con archivo Excel
+            destino con el archivo Excel, posicionado al inicio
 
         Raises:
             ValueError: Si no hay datos procesados
@@ -650,58 +903,51 @@ class OutViewProcessor:
         logger.info(f"📊 Generando archivo Excel con {len(self.df)} filas...")
 
         try:
-            # Crear workbook (NO usar write_only aquí porque necesitamos formatear)
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "OutView"
+            # Crear workbook (streaming: formatos por columna, filas en bloques)
+            output = destino if destino is not None else io.BytesIO()
+            wb = crear_workbook(output)
             logger.info("✅ Workbook creado")
 
-            # 1. Fila 1: VACÍA (para mantener compatibilidad)
-            ws.cell(row=1, column=1, value='')
-
-            # 2. Escribir metadatos (filas 2-8)
-            metadatos_df = self._crear_dataframe_metadatos()
-
-            for r_idx, row in enumerate(dataframe_to_rows(metadatos_df, index=False, header=False), start=2):
-                for c_idx, value in enumerate(row, start=1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
-
-                    # Formato para metadatos
-                    if c_idx == 1 and r_idx > 2:  # Columna "Descripción" (excepto header)
-                        cell.font = Font(bold=True)
-
-            # 3. Escribir headers (fila 9)
-            header_row = 9
-            for c_idx, col_name in enumerate(self.df.columns, start=1):
-                cell = ws.cell(row=header_row, column=c_idx, value=col_name)
-                cell.font = Font(bold=True, color='FFFFFF')
-                cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                cell.alignment = Alignment(horizontal='center')
-
-            # 4. Escribir datos (fila 10+)
-            for r_idx, row in enumerate(dataframe_to_rows(self.df, index=False, header=False), start=10):
-                for c_idx, value in enumerate(row, start=1):
-                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
-
-                    # Formato para fechas
-                    if c_idx == 1 and isinstance(value, pd.Timestamp):
-                        cell.number_format = 'DD/MM/YYYY'
-                        cell.alignment = Alignment(horizontal='right')
-
-                    # Formato para números con decimales
-                    elif isinstance(value, (int, float)) and not pd.isna(value):
-                        cell.alignment = Alignment(horizontal='right')
-
-            # 5. Ajustar anchos de columna
-            self._ajustar_columnas(ws)
-
-            # 6. Guardar en BytesIO
-            logger.info("💾 Guardando Excel en memoria...")
-            output = io.BytesIO()
-            wb.save(output)
+            negrita = wb.add_format({'bold': True})
+            formato_header = wb.add_format({
+                'bold': True,
+                'font_color': '#FFFFFF',
+                'bg_color': '#4472C4',
+                'align': 'center'
+            })
+            formato_fecha = wb.add_format({'num_format': FORMATO_FECHA, 'align': 'right'})
+
+            # Más filas de las que caben en una hoja siguen en OutView_2, OutView_3…
+            partes = partes_hoja("OutView", len(self.df))
+            metadatos = anotar_partes(self._crear_dataframe_metadatos().values.tolist(), partes)
+
+            for hoja, inicio, fin in partes:
+                ws = wb.add_worksheet(hoja)
+
+                # 1. Fila 1: VACÍA (para mantener compatibilidad)
+                # 2. Escribir metadatos (filas 2-8), "Descripción" en negrita excepto el header
+                escribir_filas(
+                    ws,
+                    metadatos,
+                    fila_inicial=1,
+                    formato=lambda fila, col: negrita if col == 0 and fila > 1 else None
+                )
+
+                # 3-5. Headers (fila 9), datos (fila 10+) y anchos de columna
+                escribir_dataframe(
+                    ws,
+                    self.df.iloc[inicio:fin],
+                    formato_header,
+                    anchos=self.ANCHOS_COLUMNA,
+                    formato_fecha=formato_fecha
+                )
+
+            # 6. Cerrar workbook en el destino
+            logger.info("💾 Guardando Excel...")
+            wb.close()
+            excel_size_kb = output.tell() / 1024
             output.seek(0)
 
-            excel_size_kb = len(output.getvalue()) / 1024
             logger.info(f"✅ Excel generado exitosamente: {excel_size_kb:.2f} KB")
 
             return output
@@ -710,6 +956,18 @@ class OutViewProcessor:
             logger.error(f"❌ Error generando Excel: {type(e).__name__}: {str(e)}", exc_info=True)
             raise ValueError(f"Error generando archivo Excel: {str(e)}")
 
+    def exportar_tabla(self, destino: str, formato: FormatoSalida = 'parquet') -> None:
+        """
+        Escribe los datos procesados como Parquet (zstd) o Arrow IPC en destino
+
+        Raises:
+            ValueError: Si no hay datos procesados
+        """
+        if self.df is None or len(self.df) == 0:
+            raise ValueError("No hay datos procesados para exportar")
+
+        escribir_tabla(self.df, formato, destino)
+
     def _crear_dataframe_metadatos(self) -> pd.DataFrame:
         """Crea DataFrame de metadatos para las filas 2-8 del Excel"""
         metadatos_data = [
@@ -724,23 +982,20 @@ class OutViewProcessor:
 
         return pd.DataFrame(metadatos_data)
 
-    def _ajustar_columnas(self, worksheet) -> None:
-        """Ajusta anchos de columnas en worksheet"""
-        for col_letter, width in self.ANCHOS_COLUMNA.items():
-            worksheet.column_dimensions[col_letter].width = width
-
 
 def procesar_outview_excel(
-    file_content: bytes
-) -> io.BytesIO:
+    file_content: ArchivoExcel,
+    destino: Optional[BinaryIO] = None
+) -> BinaryIO:
     """
     Función de conveniencia para procesar archivo OutView y retornar Excel
 
     Args:
-        file_content: Contenido del archivo Excel
+        file_content: Contenido del archivo Excel, o su ruta
+        destino: Archivo donde escribir el Excel (opcional, por defecto BytesIO)
 
     Returns:
-        BytesIO con archivo Excel procesado
+        destino con el archivo Excel procesado
 
     Raises:
         ValueError: Si archivo inválido
@@ -748,4 +1003,4 @@ def procesar_outview_excel(
     processor = OutViewProcessor()
     processor.procesar(file_content)
 
-    return processor.generar_excel()
+    return processor.generar_excel(destino)
@@ -0,0 +1,139 @@
+"""
+Exportación de tablas Mougli a Parquet y Arrow IPC
+
+Alternativa al Excel para herramientas de BI: sin metadatos en filas 1-8 ni
+límite de 1.048.576 filas por hoja, y mucho más rápida de escribir y leer.
+
+- parquet: un archivo Parquet comprimido con zstd
+- arrow: un archivo Arrow IPC sin comprimir (el lector lo puede mapear en
+  memoria sin copiar)
+
+La conversión usa pa.Table.from_pandas sobre el DataFrame procesado tal cual:
+las columnas numéricas y de fecha se comparten sin copiar y las categóricas
+pasan a columnas diccionario. Con varias tablas (Monitor, OutView y
+Consolidado) se escribe un .zip con un archivo por tabla.
+"""
+
+import logging
+import os
+import tempfile
+import zipfile
+from typing import Dict, Literal, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.processors.consolidador import consolidar_monitor_outview
+
+logger = logging.getLogger('mougli.tabla_writer')
+
+# Formatos de salida de los endpoints Mougli (xlsx usa excel_generator)
+FormatoSalida = Literal['xlsx', 'parquet', 'arrow']
+
+EXTENSIONES = {'xlsx': '.xlsx', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+NOMBRES_FORMATO = {'xlsx': 'Excel', 'parquet': 'Parquet', 'arrow': 'Arrow IPC'}
+
+# Compresión de las columnas Parquet
+COMPRESION_PARQUET = 'zstd'
+
+
+def tabla_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convierte un DataFrame procesado a tabla Arrow (sin índice)
+
+    Arrow exige un tipo por columna: las columnas object con valores
+    mezclados (p. ej. en el Consolidado, texto de Monitor y números de
+    OutView en la misma columna) se exportan como texto. El resto de
+    columnas se convierte sin tocar.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+
+    mezcladas = {}
+    for columna in df.columns:
+        serie = df[columna]
+        if serie.dtype != object:
+            continue
+        try:
+            pa.array(serie, from_pandas=True)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            mezcladas[columna] = serie.where(serie.isna(), serie.astype(str))
+
+    logger.info(f"Columnas con tipos mezclados exportadas como texto: {', '.join(map(str, mezcladas))}")
+    return pa.Table.from_pandas(df.assign(**mezcladas), preserve_index=False)
+
+
+def escribir_tabla(df: pd.DataFrame, formato: FormatoSalida, destino: str) -> None:
+    """
+    Escribe un DataFrame como Parquet o Arrow IPC en la ruta destino
+
+    Raises:
+        ValueError: Si el formato no es parquet ni arrow
+    """
+    tabla = tabla_arrow(df)
+
+    if formato == 'parquet':
+        pq.write_table(tabla, destino, compression=COMPRESION_PARQUET)
+    elif formato == 'arrow':
+        with pa.OSFile(destino, 'wb') as sink, pa.ipc.new_file(sink, tabla.schema) as writer:
+            writer.write_table(tabla)
+    else:
+        raise ValueError(f"Formato de tabla no soportado: {formato}")
+
+    logger.info(f"Tabla {NOMBRES_FORMATO[formato]} escrita: {len(df)} filas, {os.path.getsize(destino) / 1024:.1f} KB")
+
+
+def escribir_tablas(tablas: Dict[str, pd.DataFrame], formato: FormatoSalida, destino: str) -> None:
+    """
+    Escribe una o varias tablas en la ruta destino
+
+    Con una sola tabla el destino es el archivo Parquet/Arrow; con varias es
+    un .zip (sin recomprimir) con "<nombre>.parquet" o "<nombre>.arrow" por tabla.
+    """
+    if len(tablas) == 1:
+        escribir_tabla(next(iter(tablas.values())), formato, destino)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='mougli_tablas_', dir=os.path.dirname(destino) or None) as carpeta, \
+            zipfile.ZipFile(destino, 'w', zipfile.ZIP_STORED, allowZip64=True) as zip_final:
+        for nombre, df in tablas.items():
+            archivo = f"{nombre}{EXTENSIONES[formato]}"
+            ruta = os.path.join(carpeta, archivo)
+            escribir_tabla(df, formato, ruta)
+            zip_final.write(ruta, archivo)
+            os.unlink(ruta)
+
+    logger.info(f"Zip con {len(tablas)} tablas {NOMBRES_FORMATO[formato]}: {', '.join(tablas)}")
+
+
+def exportar_tablas_mougli(
+    df_monitor: Optional[pd.DataFrame],
+    df_outview: Optional[pd.DataFrame],
+    formato: FormatoSalida,
+    destino: str
+) -> None:
+    """
+    Equivalente de generar_excel_mougli_completo en Parquet/Arrow
+
+    Solo Monitor u OutView → un archivo; ambos → zip con Monitor, OutView y
+    Consolidado.
+
+    Raises:
+        ValueError: Si ambos DataFrames son None
+    """
+    if df_monitor is None and df_outview is None:
+        raise ValueError("Debe proveer al menos Monitor o OutView")
+
+    tablas: Dict[str, pd.DataFrame] = {}
+    if df_monitor is not None:
+        tablas['Monitor'] = df_monitor
+    if df_outview is not None:
+        tablas['OutView'] = df_outview
+    if len(tablas) == 2:
+        tablas['Consolidado'] = consolidar_monitor_outview(df_monitor, df_outview)
+
+    escribir_tablas(tablas, formato, destino)
@@ -0,0 +1,77 @@
+"""
+Benchmark: factorización de INVERSION en MonitorProcessor
+
+Compara la versión fila a fila (df.apply axis=1) contra el motor columnar de
+MonitorProcessor._aplicar_factores sobre un archivo Monitor sintético.
+
+Uso:
+    python benchmarks/bench_monitor_factores.py
+    python benchmarks/bench_monitor_factores.py --filas 500000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.monitor_processor import MonitorProcessor  # noqa: E402
+
+MEDIOS = ['TV', 'CABLE', 'RADIO', 'REVISTA', 'DIARIOS', 'INTERNET']
+
+
+def crear_monitor_sintetico(filas: int, semilla: int = 7) -> pd.DataFrame:
+    """Genera columnas MEDIO/INVERSION con la forma de un Monitor ya limpio"""
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        'MEDIO': rng.choice(MEDIOS, size=filas),
+        'INVERSION': rng.gamma(2.0, 1500.0, size=filas).round(2)
+    })
+
+
+def aplicar_factores_fila_a_fila(df: pd.DataFrame, factores: dict) -> pd.Series:
+    """Implementación anterior (df.apply axis=1), como referencia"""
+    resultado = df.apply(
+        lambda row: row['INVERSION'] * factores.get(row['MEDIO'], 1.0),
+        axis=1
+    )
+    return resultado.round(2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filas', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    print(f"Generando Monitor sintético de {args.filas:,} filas...")
+    df = crear_monitor_sintetico(args.filas)
+
+    processor = MonitorProcessor()
+
+    inicio = time.perf_counter()
+    referencia = aplicar_factores_fila_a_fila(df, processor.FACTORES)
+    t_filas = time.perf_counter() - inicio
+
+    processor.df = df.copy()
+    inicio = time.perf_counter()
+    processor._aplicar_factores()
+    t_columnar = time.perf_counter() - inicio
+
+    iguales = np.array_equal(referencia.to_numpy(), processor.df['INVERSION'].to_numpy())
+
+    print(f"Fila a fila (apply):  {t_filas:8.3f} s")
+    print(f"Columnar (NumPy):     {t_columnar:8.3f} s")
+    print(f"Aceleración:          {t_filas / t_columnar:8.1f}x")
+    print(f"Resultados idénticos: {iguales}")
+    print(f"Total factorizado:    ${processor.df['INVERSION'].sum():,.2f}")
+
+    return 0 if iguales else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,8 @@ Valida que el consolidador pueda:
 2. Unificar datos de Monitor y OutView
 3. Generar 27 columnas en orden correcto
 4. Crear metadatos consolidados
+5. Unir entregas con fechas solapadas
+6. Intercalar Monitor y OutView en el mismo orden que ordenar la concatenación
 """
 
 import sys
@@ -110,6 +112,86 @@ def test_excel_generator_import():
         return False
 
 
+def test_unir_entregas():
+    """Test que en fechas solapadas gana la entrega posterior y las categorías se conservan"""
+    import pandas as pd
+    from processors.consolidador import unir_entregas
+
+    def entrega(inicio, fin, marca):
+        fechas = pd.date_range(inicio, fin, freq='D')
+        return pd.DataFrame({
+            'DIA': fechas,
+            'MARCA': marca,
+            'MEDIO': pd.Categorical(['TV'] * len(fechas) if marca != 'C' else ['RADIO'] * len(fechas))
+        })
+
+    enero = entrega('2024-01-01', '2024-01-31', 'A')
+    enero_febrero = entrega('2024-01-20', '2024-02-29', 'B')
+    marzo = entrega('2024-03-01', '2024-03-31', 'C')
+    sin_fecha = pd.DataFrame({'DIA': [pd.NaT], 'MARCA': ['A'], 'MEDIO': pd.Categorical(['TV'])})
+
+    df = unir_entregas([pd.concat([enero, sin_fecha], ignore_index=True), enero_febrero, marzo], 'DIA')
+
+    assert len(df) == 19 + 1 + len(enero_febrero) + len(marzo)
+    assert df.loc[df['DIA'] >= '2024-01-20', 'MARCA'].isin(['B', 'C']).all()
+    assert df['DIA'].isna().sum() == 1
+    assert df['DIA'].dropna().is_unique
+    assert isinstance(df['MEDIO'].dtype, pd.CategoricalDtype)
+    assert set(df['MEDIO'].cat.categories) == {'TV', 'RADIO'}
+    assert unir_entregas([enero], 'DIA') is enero
+
+    print(f"✓ {len(df)} filas: solapamiento resuelto a favor de la entrega posterior")
+    return True
+
+
+def test_consolidar_merge_igual_a_sort():
+    """Test que el merge por fuente da el orden de sort_values sobre la concatenación"""
+    import numpy as np
+    import pandas as pd
+    from processors.consolidador import consolidar_monitor_outview
+
+    rng = np.random.default_rng(7)
+    fechas = pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', None])
+    marcas = np.array(['A', 'B', 'C', None], dtype=object)
+
+    monitor = pd.DataFrame({
+        'DIA': fechas[rng.integers(0, 4, 300)],
+        'MARCA': marcas[rng.integers(0, 4, 300)],
+        'MEDIO': pd.Categorical(rng.choice(['TV', 'RADIO'], 300)),
+        'INVERSION': np.arange(300, dtype=float),
+        'DURACION': rng.integers(10, 60, 300),
+    })
+    outview = pd.DataFrame({
+        'Fecha': fechas[rng.integers(0, 4, 200)],
+        'Marca': marcas[rng.integers(0, 4, 200)],
+        'Medio': pd.Categorical(['VIA PUBLICA'] * 200),
+        'Tarifa Real ($)': np.arange(1000, 1200, dtype=float),
+        'Conteo mensual': rng.integers(1, 5, 200),
+    })
+
+    df = consolidar_monitor_outview(monitor, outview)
+
+    claves = pd.concat([
+        pd.DataFrame({'FECHA': monitor['DIA'], 'MARCA': monitor['MARCA'], 'INV': monitor['INVERSION']}),
+        pd.DataFrame({'FECHA': outview['Fecha'], 'MARCA': outview['Marca'], 'INV': outview['Tarifa Real ($)']})
+    ], ignore_index=True)
+    esperado = claves.sort_values(['FECHA', 'MARCA'], kind='stable')['INV'].to_numpy()
+
+    assert np.array_equal(df['INVERSIÓN REAL'].to_numpy(), esperado)
+    assert df['FECHA'].isna().sum() == claves['FECHA'].isna().sum()
+    assert df['FECHA'].iloc[-1] is pd.NaT
+
+    es_monitor = df['INVERSIÓN REAL'] < 1000
+    assert df.loc[es_monitor, 'Q ELEMENTOS'].isna().all()
+    assert df.loc[~es_monitor, 'DURACIÓN'].isna().all()
+    assert df['Q ELEMENTOS'].dtype == 'float64'
+    assert isinstance(df['MEDIO'].dtype, pd.CategoricalDtype)
+    assert set(df['MEDIO'].cat.categories) == {'TV', 'RADIO', 'VIA PUBLICA'}
+
+    print(f"✓ {len(df)} filas en el orden de sort_values, nulos tipados")
+    return True
+
+
 def run_all_tests():
     """Ejecuta todos los tests y muestra resumen"""
     print("=" * 60)
@@ -123,6 +205,8 @@ def run_all_tests():
         ("Verificar función validar_consolidado", test_validar_consolidado_existe),
         ("Verificar función crear_metadatos", test_crear_metadatos_existe),
         ("Import excel_generator", test_excel_generator_import),
+        ("Unir entregas", test_unir_entregas),
+        ("Merge igual a sort", test_consolidar_merge_igual_a_sort),
     ]
 
     results = []
@@ -0,0 +1,277 @@
+"""
+Tests básicos para el dataset consolidado incremental de Mougli
+
+Valida que:
+1. Agregar entregas cree una partición por mes con las filas consolidadas
+2. Una entrega nueva reemplace solo las filas de su rango y de su fuente
+3. Solo se reescriban los meses afectados (el resto de archivos no cambia)
+4. Los metadatos armados desde los footers igualen a crear_metadatos_consolidado
+5. tarea_dataset_excel genere la hoja Consolidado del dataset
+6. Los endpoints /dataset respondan 503 si DATASET_DIR no está configurado
+7. Las columnas con tipos mezclados conserven sus números en el Excel
+8. Las tareas de resumen y vaciado del pool lean y borren el dataset
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.consolidador import (  # noqa: E402
+    consolidar_monitor_outview, crear_metadatos_consolidado
+)
+from app.processors.dataset_mougli import DatasetMougli  # noqa: E402
+from app.processors.mougli_tareas import (  # noqa: E402
+    ErrorTarea, tarea_dataset_excel, tarea_dataset_resumen, tarea_dataset_vaciar
+)
+
+
+def _monitor(fechas, marca: str) -> pd.DataFrame:
+    """DataFrame Monitor procesado mínimo"""
+    dias = pd.to_datetime(pd.Series(fechas))
+    return pd.DataFrame({
+        'DIA': dias,
+        'MEDIO': 'TV',
+        'MARCA': marca,
+        'INVERSION': 1000.0,
+        'SECTOR': 'BEBIDAS',
+        'CATEGORIA': 'GASEOSAS',
+        'REGION/ÁMBITO': 'LIMA',
+    })
+
+
+def _outview(fechas, marca: str) -> pd.DataFrame:
+    """DataFrame OutView procesado mínimo"""
+    return pd.DataFrame({
+        'Fecha': pd.to_datetime(pd.Series(fechas)),
+        'Medio': 'OOH',
+        'Marca': marca,
+        'Tarifa Real ($)': 500.0,
+        'Sector': 'BANCA',
+        'Categoría': 'AHORRO',
+        'Región': 'LIMA',
+    })
+
+
+def _rango(inicio: str, fin: str):
+    return pd.date_range(inicio, fin, freq='D')
+
+
+def test_agregar_por_mes():
+    """Test que cada mes queda en su partición AÑO=/MES="""
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = DatasetMougli(tmp)
+        cambios = dataset.agregar(_monitor(_rango('2024-01-15', '2024-03-10'), 'MARCA A'))
+
+        assert cambios['particiones'] == ['2024-01', '2024-02', '2024-03']
+        assert cambios['filas_agregadas'] == len(_rango('2024-01-15', '2024-03-10'))
+        assert os.path.exists(os.path.join(tmp, 'AÑO=2024', 'MES=02', 'monitor.parquet'))
+        assert dataset.meses() == [(2024, 1), (2024, 2), (2024, 3)]
+        assert not [f for f in os.listdir(os.path.join(tmp, 'AÑO=2024', 'MES=02')) if f.endswith('.tmp')]
+
+        df = dataset.leer()
+        assert len(df) == cambios['filas_agregadas']
+        assert df['FECHA'].is_monotonic_increasing
+    print("✓ Una partición por mes, sin temporales")
+
+
+def test_reemplazo_en_rango():
+    """Test que la entrega nueva reemplaza solo su rango de su misma fuente"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = DatasetMougli(tmp)
+        dataset.agregar(
+            _monitor(_rango('2024-01-01', '2024-01-31'), 'MARCA A'),
+            _outview(_rango('2024-01-01', '2024-01-31'), 'MARCA O')
+        )
+        cambios = dataset.agregar(_monitor(_rango('2024-01-20', '2024-02-05'), 'MARCA B'))
+
+        assert cambios['filas_reemplazadas'] == 12
+        assert cambios['particiones'] == ['2024-01', '2024-02']
+
+        df = dataset.leer()
+        monitor = df[df['MEDIO'] == 'TV']
+        assert (monitor.loc[monitor['FECHA'] < '2024-01-20', 'MARCA'] == 'MARCA A').all()
+        assert (monitor.loc[monitor['FECHA'] >= '2024-01-20', 'MARCA'] == 'MARCA B').all()
+        assert len(monitor) == 19 + 17
+        assert (df['MEDIO'] == 'OOH').sum() == 31
+    print("✓ Reemplazo por rango de fechas dentro de la misma fuente")
+
+
+def test_solo_meses_afectados():
+    """Test que las particiones fuera del rango no se reescriben"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = DatasetMougli(tmp)
+        dataset.agregar(_monitor(_rango('2024-01-01', '2024-04-30'), 'MARCA A'))
+
+        enero = os.path.join(tmp, 'AÑO=2024', 'MES=01', 'monitor.parquet')
+        abril = os.path.join(tmp, 'AÑO=2024', 'MES=04', 'monitor.parquet')
+        antes = os.stat(enero).st_ino, os.stat(abril).st_ino
+
+        cambios = dataset.agregar(_monitor(_rango('2024-02-10', '2024-03-05'), 'MARCA B'))
+
+        assert cambios['particiones'] == ['2024-02', '2024-03']
+        assert (os.stat(enero).st_ino, os.stat(abril).st_ino) == antes
+    print("✓ Solo se reescriben los meses de la entrega")
+
+
+def test_metadatos_desde_footers():
+    """Test que los metadatos combinados igualan a los del DataFrame completo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = DatasetMougli(tmp)
+        dataset.agregar(
+            _monitor(_rango('2024-01-01', '2024-02-15'), 'MARCA A'),
+            _outview(_rango('2024-02-01', '2024-03-31'), 'MARCA O')
+        )
+
+        esperado = crear_metadatos_consolidado(dataset.leer())
+        assert dataset.metadatos().equals(esperado)
+
+        esperado_directo = consolidar_monitor_outview(
+            _monitor(_rango('2024-01-01', '2024-02-15'), 'MARCA A'),
+            _outview(_rango('2024-02-01', '2024-03-31'), 'MARCA O')
+        )
+        assert len(dataset.leer()) == len(esperado_directo)
+        assert dataset.resumen()['filas'] == len(esperado_directo)
+    print("✓ Metadatos desde los resúmenes de cada partición")
+
+
+def test_excel_dataset():
+    """Test que el Excel del dataset tiene solo la hoja Consolidado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_dataset = os.path.join(tmp, 'dataset')
+        salida = os.path.join(tmp, 'dataset.xlsx')
+
+        try:
+            tarea_dataset_excel(ruta_dataset, salida)
+        except ErrorTarea as e:
+            assert e.status_code == 404
+        else:
+            raise AssertionError("Se esperaba ErrorTarea 404 con el dataset vacío")
+
+        DatasetMougli(ruta_dataset).agregar(_monitor(_rango('2024-01-01', '2024-01-10'), 'MARCA A'))
+        assert tarea_dataset_excel(ruta_dataset, salida) > 0
+
+        libro = load_workbook(salida, read_only=True)
+        assert libro.sheetnames == ['Consolidado']
+        assert libro['Consolidado'].max_row == 9 + 10
+        libro.close()
+    print("✓ Excel del dataset con la hoja Consolidado")
+
+
+def test_tipos_mezclados():
+    """Test que BREAK / CALLE (12 y '3A') sale igual que en el consolidado directo"""
+    sys.path.insert(0, os.path.dirname(__file__))
+    from test_outview_processor import _crear_outview_crudo, _crear_xlsx_outview
+    from app.processors.excel_generator import generar_excel_consolidado
+    from app.processors.outview_processor import OutViewProcessor
+
+    crudo = _crear_outview_crudo(30)
+    crudo['Nro Calle/Cuadra'] = crudo['Nro Calle/Cuadra'].astype(object)
+    crudo.loc[::3, 'Nro Calle/Cuadra'] = '3A'
+    df = OutViewProcessor().procesar(_crear_xlsx_outview(crudo))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_dataset = os.path.join(tmp, 'dataset')
+        DatasetMougli(ruta_dataset).agregar(df_outview=df)
+
+        salida = os.path.join(tmp, 'dataset.xlsx')
+        tarea_dataset_excel(ruta_dataset, salida)
+        directo = os.path.join(tmp, 'directo.xlsx')
+        with open(directo, 'wb') as destino:
+            generar_excel_consolidado(consolidar_monitor_outview(None, df), destino=destino)
+
+        columnas = []
+        for ruta in (salida, directo):
+            libro = load_workbook(ruta, read_only=True)
+            columnas.append([fila[13] for fila in libro['Consolidado'].iter_rows(min_row=10, values_only=True)])
+            libro.close()
+
+        assert columnas[0] == columnas[1]
+        assert {type(v) for v in columnas[0]} == {int, str}
+    print("✓ Columnas mezcladas con números en el Excel del dataset")
+
+
+def test_tareas_resumen_y_vaciar():
+    """Test que el resumen y el vaciado (que corren en el pool) usan el dataset"""
+    with tempfile.TemporaryDirectory() as tmp:
+        DatasetMougli(tmp).agregar(_monitor(_rango('2024-01-30', '2024-02-02'), 'MARCA A'))
+
+        resumen = tarea_dataset_resumen(tmp)
+        assert resumen['filas'] == 4
+        assert [p['particion'] for p in resumen['particiones']] == ['2024-01', '2024-02']
+
+        tarea_dataset_vaciar(tmp)
+        assert tarea_dataset_resumen(tmp)['particiones'] == []
+    print("✓ Resumen y vaciado del dataset como tareas del pool")
+
+
+def test_endpoint_sin_dataset_dir():
+    """Test que sin DATASET_DIR el dataset no se guarda en el temporal"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.deps import get_current_user
+    from app.api.routes import mougli
+    from app.core.config import settings
+
+    class _Usuario:
+        id = 1
+
+        def has_module(self, modulo: str) -> bool:
+            return True
+
+    app = FastAPI()
+    app.include_router(mougli.router, prefix="/api/mougli")
+    app.dependency_overrides[get_current_user] = lambda: _Usuario()
+    client = TestClient(app)
+
+    anterior = settings.DATASET_DIR
+    settings.DATASET_DIR = None
+    try:
+        assert client.get("/api/mougli/dataset").status_code == 503
+        assert client.delete("/api/mougli/dataset").status_code == 503
+        assert client.get("/api/mougli/dataset/excel").status_code == 503
+    finally:
+        settings.DATASET_DIR = anterior
+    print("✓ Endpoints del dataset con 503 sin DATASET_DIR")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Dataset Mougli")
+    print("=" * 60)
+
+    tests = [
+        ("Agregar por mes", test_agregar_por_mes),
+        ("Reemplazo en rango", test_reemplazo_en_rango),
+        ("Solo meses afectados", test_solo_meses_afectados),
+        ("Metadatos desde footers", test_metadatos_desde_footers),
+        ("Excel del dataset", test_excel_dataset),
+        ("Endpoint sin DATASET_DIR", test_endpoint_sin_dataset_dir),
+        ("Tipos mezclados", test_tipos_mezclados),
+        ("Tareas resumen y vaciar", test_tareas_resumen_y_vaciar),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
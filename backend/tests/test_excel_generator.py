@@ -0,0 +1,113 @@
+"""
+Tests básicos para el generador de Excel Mougli
+
+Valida que:
+1. El Excel completo tenga las 3 hojas con metadatos y headers
+2. Las tablas más grandes que una hoja sigan en hojas de continuación
+"""
+
+import os
+import sys
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd  # noqa: E402
+
+from app.processors import excel_writer  # noqa: E402
+from app.processors.excel_generator import generar_excel_mougli_completo  # noqa: E402
+
+
+def _crear_dataframes():
+    """DataFrames procesados mínimos de Monitor y OutView"""
+    df_monitor = pd.DataFrame({
+        'DIA': pd.to_datetime(['2023-03-01', '2023-03-02', None]),
+        'MEDIO': ['TV', 'RADIO', 'CABLE'],
+        'MARCA': ['MARCA A', 'MARCA B', None],
+        'INVERSION': [255.0, 850.5, 12.0],
+        'SECTOR': ['BEBIDAS', 'BEBIDAS', 'BANCA'],
+    })
+    df_outview = pd.DataFrame({
+        'Fecha': pd.to_datetime(['2023-03-05', '2023-03-06']),
+        'Marca': ['MARCA C', 'MARCA A'],
+        'Latitud': [-12.1, -12.2],
+        'Longitud': [-77.0, -77.1],
+        'Tarifa Real ($)': [120.5, 80.0],
+    })
+    return df_monitor, df_outview
+
+
+def test_excel_tres_hojas():
+    """Test que con ambos archivos se generan Monitor, OutView y Consolidado"""
+    from openpyxl import load_workbook
+
+    df_monitor, df_outview = _crear_dataframes()
+    excel = generar_excel_mougli_completo(df_monitor, df_outview)
+    wb = load_workbook(excel)
+
+    assert wb.sheetnames == ['Monitor', 'OutView', 'Consolidado']
+    assert wb['Monitor'].cell(row=9, column=1).value == 'DIA'
+    assert wb['Monitor'].cell(row=10, column=4).number_format == '#,##0.00'
+    assert wb['OutView'].cell(row=10, column=3).number_format == '0.000000'
+    assert wb['Consolidado'].max_row == 9 + len(df_monitor) + len(df_outview)
+    print("✓ 3 hojas con header en fila 9 y formatos por columna")
+
+
+def test_hojas_de_continuacion():
+    """Test que con más filas que FILAS_POR_HOJA se reparte en Hoja, Hoja_2, …"""
+    from openpyxl import load_workbook
+
+    df_monitor, df_outview = _crear_dataframes()
+    df_monitor = pd.concat([df_monitor] * 3, ignore_index=True)  # 9 filas
+
+    original = excel_writer.FILAS_POR_HOJA
+    excel_writer.FILAS_POR_HOJA = 4
+    try:
+        excel = generar_excel_mougli_completo(df_monitor, df_outview)
+    finally:
+        excel_writer.FILAS_POR_HOJA = original
+
+    wb = load_workbook(excel)
+    assert wb.sheetnames == [
+        'Monitor', 'Monitor_2', 'Monitor_3', 'OutView',
+        'Consolidado', 'Consolidado_2', 'Consolidado_3'
+    ]
+    assert [wb[h].max_row - 9 for h in ('Monitor', 'Monitor_2', 'Monitor_3')] == [4, 4, 1]
+    assert wb['Monitor_3'].cell(row=9, column=1).value == 'DIA'
+    assert wb['Monitor_2'].cell(row=2, column=3).value == (
+        'Monitor: filas 1-4; Monitor_2: filas 5-8; Monitor_3: filas 9-9'
+    )
+    assert wb['OutView'].cell(row=2, column=3).value is None
+    assert wb['Consolidado_3'].max_row - 9 == 11 - 8
+
+    print(f"✓ {len(wb.sheetnames)} hojas con header repetido y rangos en los metadatos")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Generador Excel Mougli")
+    print("=" * 60)
+
+    tests = [
+        ("Excel con 3 hojas", test_excel_tres_hojas),
+        ("Hojas de continuación", test_hojas_de_continuacion),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
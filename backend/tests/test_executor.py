@@ -0,0 +1,161 @@
+"""
+Tests básicos para CPUExecutor
+
+Valida que el pool:
+1. Corra tareas Mougli en otro proceso y deje el Excel en la ruta pedida
+2. Re-lance los errores de las tareas (ValueError, ErrorTarea)
+3. Responda 503 con Retry-After cuando la cola está llena
+4. Reparta un lote más grande que la capacidad sin rechazarlo a mitad de camino
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.core.executor import CPUExecutor  # noqa: E402
+from app.core.output_sink import OutputSink, borrar_temporal, ruta_temporal  # noqa: E402
+from app.processors.mougli_tareas import ErrorTarea, tarea_consolidado, tarea_monitor  # noqa: E402
+
+MONITOR_TXT = '\n'.join([
+    'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+    '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+    '1|TV|01/03/2023|MARCA A|1000|BEBIDAS|GASEOSAS|LIMA',
+])
+
+
+def test_tarea_en_pool():
+    """Test que tarea_monitor corre en el pool y el Excel se sirve desde la ruta temporal"""
+    from openpyxl import load_workbook
+
+    executor = CPUExecutor(max_workers=1, max_cola=0)
+    ruta = ruta_temporal()
+    try:
+        tamano = asyncio.run(executor.ejecutar(tarea_monitor, MONITOR_TXT.encode('utf-8'), ruta))
+    finally:
+        executor.shutdown()
+
+    sink = OutputSink.desde_archivo(ruta)
+    assert not os.path.exists(ruta)
+    assert sink.tamano == tamano > 0
+    assert load_workbook(sink, read_only=True).sheetnames == ['Monitor']
+    sink.close()
+    assert executor.en_curso == 0
+    print("✓ Excel generado en el worker y servido desde disco")
+
+
+def test_errores_de_tarea():
+    """Test que ValueError y ErrorTarea cruzan el pool con su status"""
+    sin_header = '\n'.join(['linea'] * 12).encode()
+
+    async def correr():
+        try:
+            await executor.ejecutar(tarea_monitor, sin_header, ruta)
+        except ValueError as e:
+            assert 'Header #|MEDIO| no encontrado' in str(e)
+        else:
+            raise AssertionError("Se esperaba ValueError")
+
+        try:
+            await executor.ejecutar(tarea_consolidado, sin_header, None, ruta)
+        except ErrorTarea as e:
+            assert e.status_code == 400
+            assert e.detail.startswith('Monitor inválido:')
+        else:
+            raise AssertionError("Se esperaba ErrorTarea")
+
+    executor = CPUExecutor(max_workers=1, max_cola=0)
+    ruta = ruta_temporal()
+    try:
+        asyncio.run(correr())
+    finally:
+        executor.shutdown()
+        borrar_temporal(ruta)
+    print("✓ Errores de validación re-lanzados en el proceso principal")
+
+
+def test_cola_llena_503():
+    """Test que con la capacidad ocupada se responde 503 + Retry-After"""
+    async def correr():
+        primera = asyncio.ensure_future(executor.ejecutar(time.sleep, 0.5))
+        await asyncio.sleep(0)
+        assert executor.en_curso == 1
+
+        try:
+            await executor.ejecutar(time.sleep, 0)
+        except HTTPException as e:
+            assert e.status_code == 503
+            assert e.headers == {'Retry-After': '7'}
+        else:
+            raise AssertionError("Se esperaba HTTPException 503")
+
+        await primera
+        executor.verificar_capacidad()
+
+    executor = CPUExecutor(max_workers=1, max_cola=0, retry_after=7)
+    try:
+        asyncio.run(correr())
+    finally:
+        executor.shutdown()
+    print("✓ 503 con Retry-After cuando el pool está lleno")
+
+
+def test_ejecutar_varios():
+    """Test que ejecutar_varios admite el lote una vez y re-lanza el primer error"""
+    async def correr():
+        resultados = await executor.ejecutar_varios(pow, [(2, i) for i in range(5)])
+        assert resultados == [1, 2, 4, 8, 16]
+        assert executor.en_curso == 0
+
+        try:
+            await executor.ejecutar_varios(pow, [(2, 1), (0, -1), (2, 3)])
+        except ZeroDivisionError:
+            pass
+        else:
+            raise AssertionError("Se esperaba ZeroDivisionError")
+        assert executor.en_curso == 0
+
+    # Capacidad 1 con 5 tareas: se envían de a una, sin 503
+    executor = CPUExecutor(max_workers=1, max_cola=0)
+    try:
+        asyncio.run(correr())
+    finally:
+        executor.shutdown()
+    print("✓ Lote repartido en el pool, en orden y con el error de la tarea")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - CPUExecutor")
+    print("=" * 60)
+
+    tests = [
+        ("Tarea en pool", test_tarea_en_pool),
+        ("Errores de tarea", test_errores_de_tarea),
+        ("Cola llena 503", test_cola_llena_503),
+        ("Ejecutar varios", test_ejecutar_varios),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,112 @@
+"""
+Tests básicos para la simplificación de geometrías GADM
+
+Valida que:
+1. Douglas-Peucker elimine puntos dentro de la tolerancia y conserve esquinas
+2. Los anillos se cuantizen y los que colapsan se descarten
+3. Una geometría que colapsa entera se conserve solo cuantizada
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.gadm_simplificacion import (  # noqa: E402
+    douglas_peucker,
+    simplificar_anillo,
+    simplificar_geometria,
+)
+
+
+def _cuadrado_denso(x: float, y: float, lado: float, puntos_por_lado: int) -> list:
+    """Anillo cerrado de un cuadrado con puntos intermedios y algo de ruido"""
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, lado, puntos_por_lado, endpoint=False)
+    lados = [
+        np.column_stack([x + t, np.full_like(t, y)]),
+        np.column_stack([np.full_like(t, x + lado), y + t]),
+        np.column_stack([x + lado - t, np.full_like(t, y + lado)]),
+        np.column_stack([np.full_like(t, x), y + lado - t]),
+    ]
+    anillo = np.vstack(lados) + rng.normal(0, lado / 10_000, (4 * puntos_por_lado, 2))
+    return np.vstack([anillo, anillo[:1]]).tolist()
+
+
+def test_douglas_peucker():
+    """Test que los puntos casi alineados se eliminan y las esquinas quedan"""
+    linea = np.array([[0.0, 0.0], [1.0, 0.001], [2.0, -0.001], [3.0, 0.0], [3.0, 3.0]])
+    simplificada = douglas_peucker(linea, 0.01)
+    assert simplificada.tolist() == [[0.0, 0.0], [3.0, 0.0], [3.0, 3.0]]
+    assert len(douglas_peucker(linea, 0.0001)) == 5
+
+    anillo = np.array(_cuadrado_denso(-77.0, -12.0, 1.0, 50))
+    simplificado = douglas_peucker(anillo, 0.01)
+    assert len(simplificado) == 5
+    assert (simplificado[0] == simplificado[-1]).all()
+    print("✓ Douglas-Peucker conserva esquinas y quita puntos intermedios")
+
+
+def test_anillos_cuantizados():
+    """Test de cuantización y descarte de anillos que colapsan"""
+    anillo = simplificar_anillo(_cuadrado_denso(-77.0, -12.0, 1.0, 50), 0.01, 2)
+    assert len(anillo) == 5
+    assert all(round(c, 2) == c for punto in anillo for c in punto)
+
+    assert simplificar_anillo(_cuadrado_denso(-77.0, -12.0, 0.001, 10), 0.01, 2) is None
+
+    poligono = {
+        "type": "Polygon",
+        "coordinates": [_cuadrado_denso(-77.0, -12.0, 1.0, 50), _cuadrado_denso(-76.5, -11.5, 0.001, 10)],
+    }
+    simplificado = simplificar_geometria(poligono, 0.01, 2)
+    assert len(simplificado["coordinates"]) == 1  # el hueco diminuto se descarta
+    assert len(poligono["coordinates"][0]) == 201  # la original no se modifica
+    print("✓ Anillos cuantizados y colapsados descartados")
+
+
+def test_geometria_colapsada():
+    """Test que una geometría que colapsa entera no queda vacía"""
+    diminuta = {"type": "MultiPolygon", "coordinates": [[_cuadrado_denso(-77.0, -12.0, 0.001, 10)]]}
+    simplificada = simplificar_geometria(diminuta, 0.01, 2)
+    assert simplificada["type"] == "MultiPolygon"
+    assert simplificada["coordinates"][0][0]
+
+    punto = simplificar_geometria({"type": "Point", "coordinates": [-77.12345, -12.06789]}, 0.01, 3)
+    assert punto == {"type": "Point", "coordinates": [-77.123, -12.068]}
+    assert simplificar_geometria(None, 0.01, 2) is None
+    print("✓ Geometrías colapsadas conservadas cuantizadas")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Simplificación GADM")
+    print("=" * 60)
+
+    tests = [
+        ("Douglas-Peucker", test_douglas_peucker),
+        ("Anillos cuantizados", test_anillos_cuantizados),
+        ("Geometría colapsada", test_geometria_colapsada),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,211 @@
+"""
+Tests básicos para el store GADM de Mapito
+
+Valida que:
+1. Cada nivel se parsee una sola vez y se reutilice entre llamadas
+2. Un cambio de mtime del archivo recargue el nivel
+3. Los índices de nombres respondan regiones, provincias y distritos
+4. El índice de posiciones resuelva selecciones en el orden del archivo
+5. Los bounding boxes precalculados den los límites de la selección
+6. Las variantes de detalle compartan ids y build_map elija el detalle
+7. build_map use el store y no requiera el nivel 3 sin distritos
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.gadm_store import ARCHIVOS_GADM, GadmStore, gadm_store  # noqa: E402
+
+
+def _cuadrado(x: float, y: float) -> dict:
+    return {"type": "Polygon", "coordinates": [[[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1], [x, y]]]}
+
+
+def _escribir_nivel(data_dir: Path, level: int, nombres: list) -> None:
+    """nombres: tuplas (NAME_1, ..., NAME_level)"""
+    features = [
+        {
+            "type": "Feature",
+            "properties": {f"NAME_{i + 1}": nombre for i, nombre in enumerate(fila)},
+            "geometry": _cuadrado(-77 + n, -12),
+        }
+        for n, fila in enumerate(nombres)
+    ]
+    (data_dir / ARCHIVOS_GADM[level]).write_text(
+        json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8"
+    )
+
+
+def _crear_datos(data_dir: Path) -> None:
+    _escribir_nivel(data_dir, 1, [("Lima",), ("Cusco",)])
+    _escribir_nivel(data_dir, 2, [("Lima", "Lima"), ("Lima", "Cañete"), ("Cusco", "Urubamba")])
+
+
+def test_carga_unica():
+    """Test que el nivel se parsea una vez y se comparte"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+        store = GadmStore(data_dir)
+
+        assert store.coleccion(1) is store.coleccion(1)
+        assert gadm_store(data_dir) is gadm_store(Path(tmp))
+        assert store.precargar() == [1, 2]
+        assert all("id" in f for f in store.coleccion(2)["features"])
+    print("✓ Nivel parseado una vez y compartido")
+
+
+def test_invalida_por_mtime():
+    """Test que al cambiar el archivo se recarga el nivel"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+        store = GadmStore(data_dir)
+        assert store.regiones() == ["Cusco", "Lima"]
+
+        ruta = data_dir / ARCHIVOS_GADM[1]
+        anterior = os.stat(ruta).st_mtime_ns
+        _escribir_nivel(data_dir, 1, [("Lima",), ("Cusco",), ("Puno",)])
+        os.utime(ruta, ns=(anterior + 10**9, anterior + 10**9))
+
+        assert store.regiones() == ["Cusco", "Lima", "Puno"]
+    print("✓ Recarga al cambiar el mtime")
+
+
+def test_indices_de_nombres():
+    """Test de los índices región → provincias y (región, provincia) → distritos"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+        _escribir_nivel(data_dir, 3, [("Lima", "Lima", "Miraflores"), ("Lima", "Lima", "Barranco")])
+        store = GadmStore(data_dir)
+
+        assert store.provincias("LIMA ") == ["Cañete", "Lima"]
+        assert store.provincias("Tacna") == []
+        assert store.distritos("lima", "lima") == ["Barranco", "Miraflores"]
+    print("✓ Listados como búsquedas en diccionario")
+
+
+def test_seleccion_por_indice():
+    """Test que seleccionar devuelve las features pedidas en orden de archivo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+        store = GadmStore(data_dir)
+
+        fc = store.seleccionar(2, [("cusco", "urubamba"), ("lima", "lima"), ("lima", "lima"), ("x", "y")])
+        assert [f["id"] for f in fc["features"]] == ["2.0", "2.2"]
+        assert fc["features"][0] is store.coleccion(2)["features"][0]
+        assert len(store.coleccion(2)["features"]) == 3
+
+        assert store.seleccionar(1, []) == {"type": "FeatureCollection", "features": []}
+        assert [f["properties"]["NAME_1"] for f in store.seleccionar(1, {("cusco",)})["features"]] == ["Cusco"]
+    print("✓ Selección resuelta con el índice de posiciones")
+
+
+def test_limites_precalculados():
+    """Test de los límites de una selección a partir de los bounding boxes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+        store = GadmStore(data_dir)
+
+        # Cuadrados de 1x1 con esquina en (-77 + n, -12)
+        assert store.limites(2, [("lima", "cañete")]) == [[-12.0, -76.0], [-11.0, -75.0]]
+        assert store.limites(2, [("lima", "lima"), ("cusco", "urubamba")]) == [[-12.0, -77.0], [-11.0, -74.0]]
+        assert store.limites(1) == [[-12.0, -77.0], [-11.0, -75.0]]
+        assert store.limites(2, [("x", "y")]) is None
+    print("✓ Límites como min/max sobre las filas seleccionadas")
+
+
+def test_variantes_de_detalle():
+    """Test de las variantes simplificadas y del detalle automático"""
+    from app.processors import mapito_processor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+        store = GadmStore(data_dir)
+
+        bajo = store.coleccion(2, "bajo")
+        assert bajo is store.coleccion(2, "bajo")
+        assert store.coleccion(2, "alto") is store.coleccion(2)
+        assert [f["id"] for f in bajo["features"]] == [f["id"] for f in store.coleccion(2)["features"]]
+        assert [f["id"] for f in store.seleccionar(2, [("lima", "cañete")], "medio")["features"]] == ["2.1"]
+        try:
+            store.coleccion(2, "maximo")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Se esperaba ValueError con un detalle desconocido")
+
+        assert mapito_processor.elegir_detalle(None) == "bajo"
+        assert mapito_processor.elegir_detalle([[-18.0, -81.0], [0.0, -69.0]]) == "bajo"
+        assert mapito_processor.elegir_detalle([[-13.0, -77.5], [-10.5, -76.0]]) == "medio"
+        assert mapito_processor.elegir_detalle([[-13.0, -76.5], [-12.5, -76.0]]) == "alto"
+
+        _, meta = mapito_processor.build_map(data_dir)
+        assert meta["detalle"] == "bajo"
+    print("✓ Variantes simplificadas con los mismos ids y detalle automático")
+
+
+def test_build_map_sin_nivel_3():
+    """Test que build_map por regiones/provincias no necesita distritos"""
+    from app.processors import mapito_processor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+
+        html, meta = mapito_processor.build_map(data_dir, selections={"provinces": [("Lima", "Cañete")]})
+        assert meta == {"n_regions": 1, "n_selected": 1, "detalle": "bajo"}
+        assert "Cañete" in html or "Ca\\u00f1ete" in html
+
+        try:
+            mapito_processor.build_map(data_dir, selections={"districts": [("Lima", "Lima", "Miraflores")]})
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("Se esperaba FileNotFoundError sin el archivo de distritos")
+    print("✓ build_map carga solo los niveles que usa")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Store GADM")
+    print("=" * 60)
+
+    tests = [
+        ("Carga única", test_carga_unica),
+        ("Invalidación por mtime", test_invalida_por_mtime),
+        ("Índices de nombres", test_indices_de_nombres),
+        ("Selección por índice", test_seleccion_por_indice),
+        ("Límites precalculados", test_limites_precalculados),
+        ("Variantes de detalle", test_variantes_de_detalle),
+        ("build_map sin nivel 3", test_build_map_sin_nivel_3),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
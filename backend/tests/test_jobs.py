@@ -0,0 +1,160 @@
+"""
+Tests básicos para los jobs asíncronos de Mougli
+
+Valida que:
+1. Los procesadores reporten sus pasos a la función de progreso
+2. Un job corra en el pool, deje progress.json en done y el Excel en su directorio
+3. Un archivo inválido deje el job en error con el mensaje de validación
+4. Los jobs sin actividad por más del TTL se borren
+5. Un job activo sin tarea (cortado por un reinicio) pase a error
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.executor import cpu_executor  # noqa: E402
+from app.core.jobs import MENSAJE_INTERRUMPIDO, JobStore  # noqa: E402
+from app.processors.monitor_processor import MonitorProcessor  # noqa: E402
+from app.processors.mougli_tareas import ErrorTarea, tarea_job  # noqa: E402
+
+MONITOR_TXT = '\n'.join([
+    'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+    '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+    '1|TV|01/03/2023|MARCA A|1000|BEBIDAS|GASEOSAS|LIMA',
+    '2|RADIO|02/03/2023|MARCA B|500|BEBIDAS|GASEOSAS|LIMA',
+])
+
+
+def _mensaje_error(e: Exception) -> str:
+    return e.detail if isinstance(e, ErrorTarea) else str(e)
+
+
+def _correr_job(store: JobStore, contenido: bytes) -> str:
+    """Crea un job con un Monitor, lo corre hasta el final y devuelve su id"""
+    async def correr():
+        job_id = store.crear(7, "SiReset_Mougli.xlsx")
+        job_dir = store.ruta(job_id)
+        ruta_monitor = job_dir / "uploads" / "monitor.txt"
+        ruta_monitor.write_bytes(contenido)
+
+        store.lanzar(
+            job_id, tarea_job, str(ruta_monitor), None, str(job_dir / "SiReset_Mougli.xlsx"), None,
+            errores=_mensaje_error
+        )
+        assert store.en_curso(job_id)
+        await store._tareas[job_id]
+        return job_id
+
+    try:
+        return asyncio.run(correr())
+    finally:
+        cpu_executor.shutdown()
+
+
+def test_progreso_monitor():
+    """Test que MonitorProcessor reporta sus 14 pasos en orden"""
+    pasos = []
+    MonitorProcessor(progreso=lambda paso, total, mensaje: pasos.append((paso, total))).procesar(MONITOR_TXT)
+
+    assert [p for p, _ in pasos] == sorted(p for p, _ in pasos)
+    assert pasos[-1] == (14, 14)
+    assert {t for _, t in pasos} == {MonitorProcessor.TOTAL_PASOS}
+    print(f"✓ {len(pasos)} reportes de progreso hasta el paso 14/14")
+
+
+def test_job_completo():
+    """Test que el job termina en done con el Excel en su directorio"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(tmp, ttl_horas=1)
+        job_id = _correr_job(store, MONITOR_TXT.encode('latin-1'))
+
+        progreso = store.leer_progreso(job_id)
+        assert progreso['status'] == 'done', progreso
+        assert progreso['step'] == progreso['total'] == MonitorProcessor.TOTAL_PASOS + 1
+        assert progreso['tamano'] == store.ruta_resultado(job_id).stat().st_size > 0
+        assert store.leer_meta(job_id)['dueno'] == 7
+        assert not store.en_curso(job_id)
+    print("✓ Job terminado con progreso 15/15 y Excel generado")
+
+
+def test_job_con_error():
+    """Test que un Monitor inválido deja el job en error"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(tmp, ttl_horas=1)
+        job_id = _correr_job(store, '\n'.join(['linea'] * 12).encode())
+
+        progreso = store.leer_progreso(job_id)
+        assert progreso['status'] == 'error'
+        assert progreso['message'].startswith('Monitor inválido:')
+        assert not store.ruta_resultado(job_id).exists()
+    print("✓ Job con archivo inválido en estado error")
+
+
+def test_limpiar_expirados():
+    """Test que solo se borran los jobs sin actividad por más del TTL"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(tmp, ttl_horas=1)
+        viejo = store.crear(1, "SiReset_Mougli.xlsx")
+        nuevo = store.crear(1, "SiReset_Mougli.xlsx")
+
+        hace_dos_horas = time.time() - 2 * 3600
+        os.utime(store.ruta(viejo) / "progress.json", (hace_dos_horas, hace_dos_horas))
+
+        assert store.limpiar_expirados() == 1
+        assert store.ruta(viejo) is None
+        assert store.ruta(nuevo) is not None
+        assert store.ruta('../' + nuevo) is None
+    print("✓ Job expirado eliminado, job reciente conservado")
+
+
+def test_job_interrumpido():
+    """Test que un job queued/running de un proceso anterior queda en error"""
+    with tempfile.TemporaryDirectory() as tmp:
+        anterior = JobStore(tmp, ttl_horas=1)
+        job_id = anterior.crear(1, "SiReset_Mougli.xlsx")
+
+        reiniciado = JobStore(tmp, ttl_horas=1)
+        progreso = reiniciado.leer_progreso(job_id)
+        assert progreso['status'] == 'error'
+        assert progreso['message'] == MENSAJE_INTERRUMPIDO
+        assert reiniciado.leer_progreso(job_id)['status'] == 'error'  # quedó escrito
+    print("✓ Job cortado por reinicio marcado como error")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Jobs Mougli")
+    print("=" * 60)
+
+    tests = [
+        ("Progreso Monitor", test_progreso_monitor),
+        ("Job completo", test_job_completo),
+        ("Job con error", test_job_con_error),
+        ("Limpiar expirados", test_limpiar_expirados),
+        ("Job interrumpido", test_job_interrumpido),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
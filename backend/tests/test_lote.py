@@ -0,0 +1,154 @@
+"""
+Tests básicos para la consolidación por lotes de Mougli
+
+Valida que tarea_lote:
+1. Una varias entregas Monitor resolviendo fechas solapadas
+2. Genere el Consolidado con Monitor y OutView
+3. Indique el archivo que falló en el mensaje de error
+4. Dé el mismo Excel con las entregas ya procesadas por tarea_entrega
+"""
+
+import os
+import sys
+import tempfile
+
+from openpyxl import load_workbook
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.mougli_tareas import ErrorTarea, tarea_entrega, tarea_lote  # noqa: E402
+
+ENCABEZADO = [
+    'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+    '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+]
+
+
+def _monitor(ruta: str, dias: range, marca: str) -> str:
+    filas = [f'{i}|TV|{dia:02d}/03/2023|{marca}|1000|BEBIDAS|GASEOSAS|LIMA' for i, dia in enumerate(dias, 1)]
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(ENCABEZADO + filas))
+    return ruta
+
+
+def _filas_hoja(ruta: str, hoja: str) -> int:
+    """Filas de datos de una hoja Mougli (headers en la fila 9)"""
+    libro = load_workbook(ruta, read_only=True)
+    try:
+        return libro[hoja].max_row - 9
+    finally:
+        libro.close()
+
+
+def test_lote_monitor_solapado():
+    """Test que dos entregas con días en común no duplican filas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        primera = _monitor(os.path.join(tmp, 'm1.txt'), range(1, 16), 'MARCA A')
+        segunda = _monitor(os.path.join(tmp, 'm2.txt'), range(10, 31), 'MARCA B')
+        salida = os.path.join(tmp, 'lote.xlsx')
+
+        pasos = []
+        tarea_lote([primera, segunda], [], salida, progreso=lambda paso, total, mensaje: pasos.append((paso, total)))
+
+        # Días 1-9 de la primera entrega + 10-30 de la segunda
+        assert _filas_hoja(salida, 'Monitor') == 9 + 21
+        assert pasos[-1] == (3, 3)
+    print("✓ Entregas solapadas unidas sin duplicar días")
+
+
+def test_lote_con_outview():
+    """Test que con Monitor y OutView se generan las 3 hojas"""
+    sys.path.insert(0, os.path.dirname(__file__))
+    from test_outview_processor import _crear_outview_crudo, _crear_xlsx_outview
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = _monitor(os.path.join(tmp, 'm.txt'), range(1, 6), 'MARCA A')
+        outview = os.path.join(tmp, 'o.xlsx')
+        with open(outview, 'wb') as f:
+            f.write(_crear_xlsx_outview(_crear_outview_crudo(20)))
+        salida = os.path.join(tmp, 'lote.xlsx')
+
+        tarea_lote([monitor], [outview, outview], salida)
+
+        libro = load_workbook(salida, read_only=True)
+        assert libro.sheetnames == ['Monitor', 'OutView', 'Consolidado']
+        libro.close()
+        assert _filas_hoja(salida, 'Consolidado') == _filas_hoja(salida, 'Monitor') + _filas_hoja(salida, 'OutView')
+    print("✓ Lote Monitor + OutView con hoja Consolidado")
+
+
+def test_lote_archivo_invalido():
+    """Test que el error indica qué archivo del lote es inválido"""
+    with tempfile.TemporaryDirectory() as tmp:
+        valido = _monitor(os.path.join(tmp, 'marzo.txt'), range(1, 6), 'MARCA A')
+        invalido = os.path.join(tmp, 'abril.txt')
+        with open(invalido, 'w') as f:
+            f.write('\n'.join(['linea'] * 12))
+
+        try:
+            tarea_lote([valido, invalido], [], os.path.join(tmp, 'lote.xlsx'))
+        except ErrorTarea as e:
+            assert e.status_code == 400
+            assert e.detail.startswith('Monitor abril.txt inválido:'), e.detail
+        else:
+            raise AssertionError("Se esperaba ErrorTarea")
+    print("✓ Error con el nombre del archivo inválido")
+
+
+def test_lote_entregas_procesadas():
+    """Test que procesar cada archivo aparte (como el endpoint) da el mismo Excel"""
+    with tempfile.TemporaryDirectory() as tmp:
+        primera = _monitor(os.path.join(tmp, 'm1.txt'), range(1, 16), 'MARCA A')
+        segunda = _monitor(os.path.join(tmp, 'm2.txt'), range(10, 31), 'MARCA B')
+
+        entregas = [
+            tarea_entrega('Monitor', ruta, os.path.join(tmp, f'entrega{i}.parquet'))
+            for i, ruta in enumerate((primera, segunda))
+        ]
+        assert entregas[1].filename == 'm2.txt'
+
+        directo = os.path.join(tmp, 'directo.xlsx')
+        en_partes = os.path.join(tmp, 'en_partes.xlsx')
+        tarea_lote([primera, segunda], [], directo)
+        tarea_lote(entregas, [], en_partes)
+
+        filas = []
+        for ruta in (directo, en_partes):
+            libro = load_workbook(ruta, read_only=True)
+            filas.append(list(libro['Monitor'].iter_rows(min_row=9, values_only=True)))
+            libro.close()
+        assert filas[0] == filas[1]
+    print("✓ Entregas procesadas aparte dan el mismo Excel")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Lotes Mougli")
+    print("=" * 60)
+
+    tests = [
+        ("Lote Monitor solapado", test_lote_monitor_solapado),
+        ("Lote con OutView", test_lote_con_outview),
+        ("Archivo inválido", test_lote_archivo_invalido),
+        ("Entregas procesadas", test_lote_entregas_procesadas),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
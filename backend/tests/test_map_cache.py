@@ -0,0 +1,153 @@
+"""
+Tests básicos para la caché de mapas renderizados de Mapito
+
+Valida que:
+1. La caché desaloje por tamaño (LRU) y venza por TTL
+2. La clave no dependa del orden ni mayúsculas de las selecciones
+3. El endpoint sirva aciertos de caché y responda 304 con If-None-Match
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.map_cache import MapCache, coincide_etag  # noqa: E402
+from tests.test_gadm_store import _crear_datos  # noqa: E402
+
+
+class _Usuario:
+    """Usuario de prueba con acceso a todos los módulos"""
+    id = 1
+
+    def has_module(self, modulo: str) -> bool:
+        return True
+
+
+def test_lru_y_ttl():
+    """Test de desalojo por tamaño y vencimiento por TTL"""
+    cache = MapCache(max_bytes=25, ttl_s=60)
+    cache.guardar("a", "x" * 10, {})
+    cache.guardar("b", "y" * 10, {})
+    assert cache.obtener("a").contenido == b"x" * 10  # renueva "a"
+    cache.guardar("c", "z" * 10, {})
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") is not None and cache.obtener("c") is not None
+
+    assert cache.guardar("grande", "g" * 100, {"n": 1}).meta == {"n": 1}
+    assert cache.obtener("grande") is None
+
+    vencida = MapCache(max_bytes=1000, ttl_s=0.05)
+    vencida.guardar("a", "html", {})
+    time.sleep(0.1)
+    assert vencida.obtener("a") is None
+
+    assert MapCache(max_bytes=0, ttl_s=60).guardar("a", "html", {}).contenido == b"html"
+    print("✓ LRU por tamaño y TTL")
+
+
+def test_clave_y_etag():
+    """Test de la clave canónica y la comparación de ETags"""
+    from app.api.routes.mapito import MapRequest, _parametros_mapa
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+
+        a = MapRequest(regions=["Lima", "Cusco"], color_general="#ABCDEF")
+        b = MapRequest(regions=["cusco ", "LIMA", "Lima"], color_general="#abcdef")
+        c = MapRequest(regions=["Lima"])
+        clave_a = MapCache.clave(_parametros_mapa(a, data_dir))
+        assert clave_a == MapCache.clave(_parametros_mapa(b, data_dir))
+        assert clave_a != MapCache.clave(_parametros_mapa(c, data_dir))
+
+    etag = MapCache.etag(clave_a)
+    assert coincide_etag(etag, etag)
+    assert coincide_etag(f'"otro", {etag.removeprefix("W/")}', etag)
+    assert coincide_etag("*", etag)
+    assert not coincide_etag('W/"otro"', etag)
+    assert not coincide_etag(None, etag)
+    print("✓ Clave canónica y ETag débil")
+
+
+def test_endpoint_con_cache():
+    """Test del endpoint: MISS, HIT y 304 con If-None-Match"""
+    from app.api.deps import get_current_user
+    from app.api.routes import mapito
+    from app.core import map_cache as modulo_cache
+    from app.core.config import settings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _crear_datos(data_dir)
+
+        app = FastAPI()
+        app.include_router(mapito.router, prefix="/api/mapito")
+        app.dependency_overrides[get_current_user] = lambda: _Usuario()
+        client = TestClient(app)
+
+        anterior = settings.GADM_DATA_DIR
+        settings.GADM_DATA_DIR = str(data_dir)
+        modulo_cache.map_cache.vaciar()
+        try:
+            cuerpo = {"provinces": [["Lima", "Cañete"]]}
+            primera = client.post("/api/mapito/generate", json=cuerpo)
+            assert primera.status_code == 200
+            assert primera.headers["X-Map-Cache"] == "MISS"
+            assert primera.headers["X-Map-Selected"] == "1"
+
+            segunda = client.post("/api/mapito/generate", json={"provinces": [["lima", "CAÑETE"]]})
+            assert segunda.headers["X-Map-Cache"] == "HIT"
+            assert segunda.content == primera.content
+            assert segunda.headers["ETag"] == primera.headers["ETag"]
+
+            no_modificado = client.post(
+                "/api/mapito/generate", json=cuerpo, headers={"If-None-Match": primera.headers["ETag"]}
+            )
+            assert no_modificado.status_code == 304
+            assert no_modificado.content == b""
+
+            otro = client.post("/api/mapito/generate", json={"regions": ["Cusco"]})
+            assert otro.headers["ETag"] != primera.headers["ETag"]
+        finally:
+            settings.GADM_DATA_DIR = anterior
+            modulo_cache.map_cache.vaciar()
+    print("✓ Endpoint con caché y revalidación 304")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Caché de mapas")
+    print("=" * 60)
+
+    tests = [
+        ("LRU y TTL", test_lru_y_ttl),
+        ("Clave y ETag", test_clave_y_etag),
+        ("Endpoint con caché", test_endpoint_con_cache),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
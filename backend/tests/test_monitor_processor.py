@@ -0,0 +1,195 @@
+"""
+Tests básicos para MonitorProcessor
+
+Valida que el procesador pueda:
+1. Aplicar factores de conversión por MEDIO
+2. Usar factor 1.0 para medios desconocidos
+3. Parsear archivos .txt en modo streaming por bloques
+   (encoding detectado y decodificación incremental)
+4. Generar el Excel de salida con el layout de metadatos + header
+"""
+
+import io
+import sys
+import os
+
+import pandas as pd
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.monitor_processor import MonitorProcessor  # noqa: E402
+
+
+def test_aplicar_factores():
+    """Test que INVERSION se multiplica por el factor de su MEDIO"""
+    processor = MonitorProcessor(factores_custom={'TV': 0.255, 'RADIO': 0.425})
+    processor.df = pd.DataFrame({
+        'MEDIO': ['TV', 'RADIO', 'TV', 'INTERNET'],
+        'INVERSION': [1000.0, 200.0, 333.33, 50.0]
+    })
+
+    processor._aplicar_factores()
+
+    assert processor.df['INVERSION'].tolist() == [255.0, 85.0, 85.0, 50.0]
+    print("✓ Factores aplicados correctamente (INTERNET usa 1.0)")
+
+
+def test_aplicar_factores_igual_a_fila_a_fila():
+    """Test que el motor columnar coincide con la versión fila a fila"""
+    processor = MonitorProcessor()
+    df = pd.DataFrame({
+        'MEDIO': ['TV', 'CABLE', 'RADIO', 'REVISTA', 'DIARIOS', None, 'OTRO'] * 50,
+        'INVERSION': [i * 13.37 for i in range(350)]
+    })
+    esperado = df.apply(
+        lambda row: row['INVERSION'] * processor.FACTORES.get(row['MEDIO'], 1.0),
+        axis=1
+    ).round(2)
+
+    processor.df = df.copy()
+    processor._aplicar_factores()
+
+    assert processor.df['INVERSION'].tolist() == esperado.tolist()
+    print("✓ Resultado idéntico a df.apply(axis=1)")
+
+
+def _crear_txt_monitor(filas: list) -> str:
+    """Arma un archivo Monitor mínimo: 4 líneas de metadatos + header + datos"""
+    lineas = [
+        'Kantar IBOPE Media',
+        'Reporte Monitor',
+        'Periodo: 01/03/2023 - 31/03/2023',
+        'Usuario: test',
+        '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO'
+    ]
+    return '\r\n'.join(lineas + filas) + '\r\n'
+
+
+def test_procesar_stream_por_bloques():
+    """Test que el parser streaming descarta líneas mal formadas y parsea por bloques"""
+    contenido = _crear_txt_monitor([
+        '1|TV|01/03/2023|MARCA A|1000|BEBIDAS|GASEOSAS|LIMA',
+        '2|RADIO|02/03/2023|MARCA B|2,000|BEBIDAS|GASEOSAS|LIMA',
+        '',
+        '3|TV|03/03/2023|MARCA A|500',
+        '4|SUPLEMENTO|04/03/2023|MARCA C|100|BANCA|AHORRO|PROVINCIAS',
+    ])
+
+    processor = MonitorProcessor()
+    processor.FILAS_POR_BLOQUE = 2
+    df = processor.procesar_stream(io.BytesIO(contenido.encode('utf-8')))
+
+    assert len(df) == 3
+    assert processor.filas_descartadas == 1
+    assert processor.lineas_descartadas == [9]
+    assert df['MEDIO'].tolist() == ['TV', 'RADIO', 'DIARIOS']
+    assert df['INVERSION'].tolist() == [255.0, 850.0, 14.88]
+    assert len(processor.metadatos_originales) == 4
+    print("✓ Streaming por bloques con línea 9 descartada")
+
+
+def test_procesar_stream_detecta_encoding():
+    """Test que el encoding se detecta del prefijo y se corrige si falla más adelante"""
+    from app.processors import monitor_processor
+    from app.processors.decodificacion import iter_lineas
+
+    contenido = _crear_txt_monitor([
+        f'{i}|TV|01/03/2023|MARCA Ñ{i % 3}|1000|BEBIDAS|GASEOSAS|REGIÓN' for i in range(1, 40)
+    ])
+    utf8 = contenido.encode('utf-8')
+
+    # UTF-8 partido en chunks de 7 bytes (corta secuencias multibyte)
+    assert ''.join(iter_lineas(io.BytesIO(utf8), 'utf-8', chunk_bytes=7)) == contenido
+
+    processor = MonitorProcessor()
+    df = processor.procesar_stream(io.BytesIO(utf8))
+    assert processor.encoding == 'utf-8'
+    assert df['MARCA'].iloc[0] == 'MARCA Ñ1'
+
+    # Latin-1 con el primer byte no UTF-8 después del prefijo de detección
+    latin1 = contenido.encode('latin-1')
+    prefijo = latin1.index('Ñ'.encode('latin-1')) - 1
+    original = monitor_processor.BYTES_DETECCION
+    monitor_processor.BYTES_DETECCION = prefijo
+    try:
+        processor = MonitorProcessor()
+        df_latin1 = processor.procesar_stream(io.BytesIO(latin1))
+    finally:
+        monitor_processor.BYTES_DETECCION = original
+
+    assert processor.encoding == 'latin-1'
+    pd.testing.assert_frame_equal(df_latin1, df)
+    print("✓ UTF-8 detectado; Latin-1 detectado tras fallar UTF-8 fuera del prefijo")
+
+
+def test_procesar_sin_header():
+    """Test que un archivo sin header #|MEDIO| es rechazado"""
+    contenido = '\n'.join(['linea'] * 12)
+
+    try:
+        MonitorProcessor().procesar(contenido)
+    except ValueError as e:
+        assert 'Header #|MEDIO| no encontrado' in str(e)
+        print("✓ Archivo sin header rechazado")
+        return
+
+    raise AssertionError("Se esperaba ValueError")
+
+
+def test_generar_excel_streaming():
+    """Test que el Excel mantiene metadatos (1-8), headers (9) y formato de fecha por columna"""
+    from openpyxl import load_workbook
+
+    contenido = _crear_txt_monitor([
+        '1|TV|01/03/2023|MARCA A|1000|BEBIDAS|GASEOSAS|LIMA',
+        '2|RADIO|99/99/2023|MARCA B|2,000|BEBIDAS|GASEOSAS|LIMA',
+    ])
+
+    processor = MonitorProcessor()
+    processor.procesar(contenido)
+    ws = load_workbook(processor.generar_excel()).active
+
+    assert ws.title == 'Monitor'
+    assert [ws.cell(row=r, column=1).value for r in (1, 2)] == ['Descripción', 'Filas']
+    assert ws.cell(row=1, column=1).font.b
+    assert [c.value for c in ws[9]] == list(processor.df.columns)
+    assert ws.cell(row=10, column=1).value.strftime('%d/%m/%Y') == '01/03/2023'
+    assert ws.cell(row=10, column=1).number_format == 'DD/MM/YYYY'
+    assert ws.cell(row=11, column=1).value is None  # fecha inválida → celda vacía
+    assert ws.max_row == 11
+    print("✓ Excel con layout de 8 filas de metadatos y header en fila 9")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - MonitorProcessor")
+    print("=" * 60)
+
+    tests = [
+        ("Aplicar factores", test_aplicar_factores),
+        ("Factores igual a fila a fila", test_aplicar_factores_igual_a_fila_a_fila),
+        ("Procesar stream por bloques", test_procesar_stream_por_bloques),
+        ("Procesar stream detecta encoding", test_procesar_stream_detecta_encoding),
+        ("Procesar sin header", test_procesar_sin_header),
+        ("Generar Excel streaming", test_generar_excel_streaming),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,96 @@
+"""
+Tests básicos para OutputSink
+
+Valida que el sink:
+1. Tome el archivo escrito por la tarea y lo saque del directorio
+2. Se envíe en chunks con Content-Length y quede cerrado al terminar
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.output_sink import OutputSink, ruta_temporal  # noqa: E402
+from app.processors.monitor_processor import MonitorProcessor  # noqa: E402
+
+
+def _excel_monitor(destino) -> None:
+    """Escribe un Excel Monitor mínimo en destino"""
+    contenido = '\n'.join([
+        'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+        '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+    ] + [f'{i}|TV|01/03/2023|MARCA {i % 7}|{i * 10}|BEBIDAS|GASEOSAS|LIMA' for i in range(300)])
+
+    processor = MonitorProcessor()
+    processor.procesar(contenido)
+    processor.generar_excel(destino)
+
+
+def test_sink_desde_archivo():
+    """Test que el Excel escrito en la ruta temporal se envía desde el sink"""
+    from openpyxl import load_workbook
+
+    ruta = ruta_temporal()
+    with open(ruta, 'wb') as destino:
+        _excel_monitor(destino)
+
+    sink = OutputSink.desde_archivo(ruta, chunk_bytes=4096)
+    assert not os.path.exists(ruta)
+    assert sink.tell() == 0
+
+    datos = b''.join(sink.iter_chunks())
+    assert len(datos) > 4096
+    assert sink.closed
+    assert load_workbook(io.BytesIO(datos), read_only=True).active.max_row == 309
+    print(f"✓ Excel de {len(datos)} bytes enviado desde disco")
+
+
+def test_streaming_response():
+    """Test que la respuesta tiene Content-Length y cierra el sink al terminar"""
+    sink = OutputSink(io.BytesIO(b'x' * 2500), chunk_bytes=1000)
+
+    respuesta = sink.streaming_response('Prueba.xlsx')
+    assert respuesta.headers['content-length'] == '2500'
+    assert 'filename=Prueba.xlsx' in respuesta.headers['content-disposition']
+
+    async def consumir():
+        return [chunk async for chunk in respuesta.body_iterator]
+
+    chunks = asyncio.run(consumir())
+    assert [len(c) for c in chunks] == [1000, 1000, 500]
+    assert sink.closed
+    print("✓ 3 chunks enviados y sink cerrado")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - OutputSink")
+    print("=" * 60)
+
+    tests = [
+        ("Sink desde archivo", test_sink_desde_archivo),
+        ("Streaming response", test_streaming_response),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -6,6 +6,8 @@ Valida que el procesador pueda:
 2. Instanciar la clase
 3. Tener los métodos esperados
 4. Tener las constantes configuradas
+5. Calcular Tarifa Real ($) idéntica a la versión fila a fila
+6. Calcular denominadores sobre la clave de ubicación factorizada
 """
 
 import sys
@@ -130,6 +132,199 @@ def test_procesar_outview_excel_exists():
         return False
 
 
+def _crear_outview_crudo(filas: int = 400):
+    """Crea un DataFrame con la forma de un OutView recién leído"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(11)
+    tipos = ['PANTALLA LED', 'PANEL', 'PALETA', 'VALLA', 'TIPO NUEVO']
+    distritos = ['MIRAFLORES', 'SAN ISIDRO', 'SURCO']
+    dias = rng.integers(1, 28, size=filas)
+    meses = rng.choice(['MAR', 'ABR'], size=filas)
+
+    return pd.DataFrame({
+        'Fecha': [f"{d:02d}/{3 if m == 'MAR' else 4:02d}/2023" for d, m in zip(dias, meses)],
+        'NombreBase': [f"OPW09{m}2023" for m in meses],
+        'Medio': 'VIA PUBLICA',
+        'Proveedor': rng.choice(['CLEAR CHANNEL', 'JCDECAUX'], size=filas),
+        'Cod.Proveedor': rng.integers(100, 105, size=filas),
+        'Tipo Elemento': rng.choice(tipos, size=filas),
+        'Distrito': rng.choice(distritos, size=filas),
+        'Avenida': rng.choice(['AV. LARCO', 'AV. ARAMBURU'], size=filas),
+        'Nro Calle/Cuadra': rng.integers(1, 4, size=filas),
+        'Orientación de Vía': rng.choice(['N-S', 'S-N'], size=filas),
+        'Sector': 'BEBIDAS',
+        'Categoría': 'GASEOSAS',
+        'Item': 'GASEOSA',
+        'Marca': rng.choice(['COCA COLA', 'INCA KOLA', None], size=filas, p=[0.45, 0.45, 0.10]),
+        'Producto': 'PRODUCTO',
+        'Versión': rng.choice(['V1', 'V2', 'V3'], size=filas),
+        'Agencia': 'AGENCIA',
+        'Anunciante': 'ANUNCIANTE',
+        'Región': 'LIMA',
+        'Tipo Tarifa': 'NORMAL',
+        'Duración (Seg)': 0,
+        'Latitud': rng.choice([-12.1, -12.2], size=filas),
+        'Longitud': rng.choice([-77.0, -77.1], size=filas),
+        'EstadoAviso': 'ACTIVO',
+        'RUC': '20100000001',
+        'Tarifa S/.': rng.choice([1500.0, 9000.0, 30000.0, 123.45], size=filas)
+    })
+
+
+def _tarifas_fila_a_fila(df, processor):
+    """Implementación anterior de _calcular_tarifas (df.apply axis=1), como referencia"""
+    df = df.copy()
+    df['Tarifa_USD'] = df['Tarifa S/.'] / processor.TIPO_CAMBIO_USD
+    df['Tarifa_1'] = df.apply(
+        lambda row: row['Tarifa_USD'] / row['Denominador_1'] if row['Denominador_1'] > 0 else 0,
+        axis=1
+    )
+    df['Tarifa_2'] = df.groupby([
+        'Mes', 'Proveedor', 'Tipo Elemento', 'Distrito', 'Avenida',
+        'Nro Calle/Cuadra', 'Orientación de Vía', 'Marca'
+    ])['Tarifa_1'].transform('sum')
+    df['Tarifa_3'] = df.apply(
+        lambda row: min(row['Tarifa_2'], processor.TOPES_TARIFA.get(row['Tipo Elemento'], float('inf'))),
+        axis=1
+    )
+    df['Tarifa_4'] = df.apply(
+        lambda row: row['Tarifa_3'] / row['Denominador_2'] if row['Denominador_2'] > 0 else 0,
+        axis=1
+    )
+    df['Tarifa Real ($)'] = df.apply(
+        lambda row: row['Tarifa_4'] * (
+            processor.FACTOR_LED if row['Tipo Elemento'] == 'PANTALLA LED' else processor.FACTOR_OTROS
+        ),
+        axis=1
+    ).round(2)
+    return df['Tarifa Real ($)']
+
+
+def test_tarifa_real_igual_a_fila_a_fila():
+    """Test de regresión: Tarifa Real ($) vectorizada es bit a bit igual a la versión fila a fila"""
+    import numpy as np
+    from processors.outview_processor import OutViewProcessor
+
+    processor = OutViewProcessor()
+    df = _crear_outview_crudo()
+    df = processor._procesar_fechas(df)
+    df = processor._extraer_mes_nombrebase(df)
+    df = processor._calcular_denominador_1(df)
+    df = processor._calcular_denominador_2(df)
+
+    esperado = _tarifas_fila_a_fila(df, processor).to_numpy()
+    obtenido = processor._calcular_tarifas(df.copy())['Tarifa Real ($)'].to_numpy()
+
+    assert np.array_equal(esperado, obtenido, equal_nan=True), "Tarifa Real ($) difiere"
+    assert esperado.tobytes() == obtenido.tobytes(), "Tarifa Real ($) no es bit a bit igual"
+    print(f"✓ Tarifa Real ($) idéntica en {len(obtenido)} filas")
+    return True
+
+
+def test_denominadores_igual_a_groupby():
+    """Test que los denominadores por códigos coinciden con groupby().transform('size')"""
+    import numpy as np
+    from processors.outview_processor import OutViewProcessor
+
+    processor = OutViewProcessor()
+    df = _crear_outview_crudo()
+    df = processor._procesar_fechas(df)
+    df = processor._extraer_mes_nombrebase(df)
+    df = processor._codificar_ubicacion(df)
+    df = processor._calcular_denominador_1(df)
+    df = processor._calcular_denominador_2(df)
+
+    ubicacion = processor.COLUMNAS_UBICACION
+    esperado_1 = df.groupby(['Fecha'] + ubicacion)['Fecha'].transform('size')
+    esperado_2 = df.groupby(['Mes'] + ubicacion)['Mes'].transform('size')
+
+    assert np.array_equal(esperado_1.to_numpy(float), df['Denominador_1'].to_numpy(float), equal_nan=True)
+    assert np.array_equal(esperado_2.to_numpy(float), df['Denominador_2'].to_numpy(float), equal_nan=True)
+    print(f"✓ Denominadores idénticos ({df['Grupo_Ubicacion'].nunique()} ubicaciones)")
+    return True
+
+
+def test_codigos_compuestos_modo_debug():
+    """Test que los ids enteros agrupan igual que los códigos legibles '|'-joined"""
+    from processors.outview_processor import OutViewProcessor
+
+    processor = OutViewProcessor(debug_codigos=True)
+    df = _crear_outview_crudo()
+    df = processor._procesar_fechas(df)
+    df = processor._extraer_mes_nombrebase(df)
+    df = processor._crear_codigo_unico(df)
+    df = processor._crear_codigo_pieza(df)
+
+    for codigo in ('Codigo_Unico', 'Codigo_Pieza'):
+        pares = df[[codigo, f'{codigo}_Texto']].drop_duplicates()
+        assert len(pares) == df[codigo].nunique() == df[f'{codigo}_Texto'].nunique()
+        assert df[codigo].max() + 1 == df[codigo].nunique()
+
+    sin_debug = OutViewProcessor()._crear_codigo_unico(df.drop(columns=['Codigo_Unico_Texto']))
+    assert 'Codigo_Unico_Texto' not in sin_debug.columns
+    print(f"✓ Ids consistentes con texto ({df['Codigo_Pieza'].nunique()} piezas)")
+    return True
+
+
+def _crear_xlsx_outview(df, fila_vacia: bool = True) -> bytes:
+    """Escribe el DataFrame como .xlsx OutView (fila 1 vacía opcional + columna extra)"""
+    import io
+    import pandas as pd
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    if fila_vacia:
+        ws.append([])
+    ws.append(list(df.columns) + ['Columna no usada'])
+    for fila in df.itertuples(index=False):
+        ws.append([None if pd.isna(v) else getattr(v, 'item', lambda: v)() for v in fila] + ['x'])
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def test_leer_excel_igual_a_read_excel():
+    """Test que el lector de una pasada coincide con pd.read_excel y detecta el header"""
+    import io
+    import tempfile
+    import pandas as pd
+    from processors.outview_processor import OutViewProcessor
+
+    df = _crear_outview_crudo(50)
+
+    for fila_vacia in (True, False):
+        contenido = _crear_xlsx_outview(df, fila_vacia=fila_vacia)
+        esperado = pd.read_excel(io.BytesIO(contenido), engine='openpyxl', skiprows=int(fila_vacia))
+        esperado = esperado.drop(columns=['Columna no usada'])
+
+        processor = OutViewProcessor()
+        leido = processor._leer_excel(contenido)
+
+        assert leido.equals(esperado)
+        assert processor.estadisticas_lectura['fila_header'] == 1 + int(fila_vacia)
+        assert processor.estadisticas_lectura['filas_por_segundo_lectura'] > 0
+
+        # Desde la ruta del upload en disco
+        with tempfile.NamedTemporaryFile(suffix='.xlsx') as f:
+            f.write(contenido)
+            f.flush()
+            assert OutViewProcessor()._leer_excel(f.name).equals(esperado)
+
+    try:
+        OutViewProcessor()._leer_excel(_crear_xlsx_outview(df.drop(columns=['NombreBase'])))
+    except ValueError as e:
+        assert 'Columnas faltantes: NombreBase' in str(e)
+    else:
+        raise AssertionError("Se esperaba ValueError por columna faltante")
+
+    print("✓ Header detectado en fila 1 y 2 (bytes y ruta), columnas no usadas descartadas")
+    return True
+
+
 def run_all_tests():
     """Ejecuta todos los tests y muestra resumen"""
     print("=" * 60)
@@ -143,6 +338,10 @@ def run_all_tests():
         ("Verificar constantes", test_outview_processor_constants),
         ("Verificar métodos", test_outview_processor_methods),
         ("Verificar función procesar_outview_excel", test_procesar_outview_excel_exists),
+        ("Regresión Tarifa Real ($)", test_tarifa_real_igual_a_fila_a_fila),
+        ("Denominadores por códigos de ubicación", test_denominadores_igual_a_groupby),
+        ("Códigos compuestos en modo debug", test_codigos_compuestos_modo_debug),
+        ("Lector Excel de una pasada", test_leer_excel_igual_a_read_excel),
     ]
 
     results = []
@@ -0,0 +1,160 @@
+"""
+Tests básicos para ResultCache
+
+Valida que la caché:
+1. Devuelva el mismo DataFrame y metadatos que el procesamiento original
+2. Cambie de clave al cambiar los factores
+3. Desaloje las entradas menos usadas al superar el límite
+4. Sea usada por tarea_consolidado tras procesar el Monitor solo
+5. Guarde el OutView procesado con columnas de tipos mezclados sin perderlos
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.result_cache import ResultCache, huella  # noqa: E402
+from app.processors.monitor_processor import MonitorProcessor  # noqa: E402
+from app.processors.mougli_tareas import tarea_consolidado, tarea_monitor  # noqa: E402
+
+MONITOR_TXT = '\n'.join([
+    'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+    '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+    '1|TV|01/03/2023|MARCA A|1000|BEBIDAS|GASEOSAS|LIMA',
+    '2|RADIO|99/99/2023|MARCA B|500|BEBIDAS|GASEOSAS|LIMA',
+    '3|SUPLEMENTO|03/03/2023|MARCA A|80|BANCA|AHORRO|PROVINCIAS',
+]).encode('utf-8')
+
+
+def test_ida_y_vuelta():
+    """Test que el DataFrame y los metadatos vuelven idénticos de la caché"""
+    processor = MonitorProcessor()
+    df = processor.procesar(MONITOR_TXT.decode('utf-8'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp, 10 * 1024 * 1024)
+        clave = cache.clave('Monitor', huella(MONITOR_TXT), processor.firma_factores())
+
+        assert cache.obtener(clave) is None
+        assert cache.guardar(clave, df, processor.metadatos)
+
+        df_cache, metadatos = cache.obtener(clave)
+        pd.testing.assert_frame_equal(df_cache, df)
+        assert metadatos == processor.metadatos
+    print("✓ DataFrame (dtypes, NaT, categorías) y metadatos idénticos")
+
+
+def test_clave_depende_de_factores():
+    """Test que otros factores u otro archivo dan otra clave"""
+    cache = ResultCache('/nada', 1)
+    base = cache.clave('Monitor', huella(MONITOR_TXT), {'FACTORES': {'TV': 0.255}})
+
+    assert base == cache.clave('Monitor', huella(MONITOR_TXT), {'FACTORES': {'TV': 0.255}})
+    assert base != cache.clave('Monitor', huella(MONITOR_TXT), {'FACTORES': {'TV': 0.3}})
+    assert base != cache.clave('Monitor', huella(MONITOR_TXT + b'\n'), {'FACTORES': {'TV': 0.255}})
+    assert base != cache.clave('OutView', huella(MONITOR_TXT), {'FACTORES': {'TV': 0.255}})
+    print("✓ Clave cambia con factores, contenido y origen")
+
+
+def test_desalojo_lru():
+    """Test que al superar el límite se borra la entrada usada hace más tiempo"""
+    df = pd.DataFrame({'x': range(1000)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp, 10 ** 9)
+        for clave in ('a', 'b', 'c'):
+            cache.guardar(clave, df, {})
+        tamano = os.path.getsize(os.path.join(tmp, 'a.parquet'))
+
+        # 'a' es la más vieja pero se usa: la menos usada pasa a ser 'b'
+        for i, clave in enumerate(('a', 'b', 'c')):
+            os.utime(os.path.join(tmp, f'{clave}.parquet'), (1000 + i, 1000 + i))
+        assert cache.obtener('a') is not None
+
+        cache.max_bytes = 3 * tamano
+        cache.guardar('d', df, {})
+
+        assert sorted(os.listdir(tmp)) == ['a.parquet', 'c.parquet', 'd.parquet']
+    print("✓ Desalojada la entrada menos usada")
+
+
+def test_consolidado_reutiliza_monitor():
+    """Test que tarea_consolidado toma de la caché el Monitor ya procesado solo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, 'cache'), 10 * 1024 * 1024)
+        tarea_monitor(MONITOR_TXT, os.path.join(tmp, 'monitor.xlsx'), cache)
+        assert len(os.listdir(cache.directorio)) == 1
+
+        pasos = []
+        tarea_consolidado(
+            MONITOR_TXT, None, os.path.join(tmp, 'consolidado.xlsx'),
+            progreso=lambda paso, total, mensaje: pasos.append(mensaje),
+            cache=cache
+        )
+
+        assert pasos[0] == 'Monitor: Resultado reutilizado de caché'
+        assert len(os.listdir(cache.directorio)) == 1
+    print("✓ Consolidado reutiliza el Monitor procesado")
+
+
+def test_outview_tipos_mezclados():
+    """Test que un OutView con Nro Calle/Cuadra mezclado (12 y '3A') se cachea"""
+    sys.path.insert(0, os.path.dirname(__file__))
+    from test_outview_processor import _crear_outview_crudo, _crear_xlsx_outview
+    from app.processors.outview_processor import OutViewProcessor
+
+    crudo = _crear_outview_crudo(30)
+    crudo['Nro Calle/Cuadra'] = crudo['Nro Calle/Cuadra'].astype(object)
+    crudo.loc[::3, 'Nro Calle/Cuadra'] = '3A'
+    crudo.loc[1, 'Nro Calle/Cuadra'] = None
+
+    processor = OutViewProcessor()
+    df = processor.procesar(_crear_xlsx_outview(crudo))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp, 10 * 1024 * 1024)
+        assert cache.guardar('outview', df, processor.metadatos)
+
+        df_cache, metadatos = cache.obtener('outview')
+        pd.testing.assert_frame_equal(df_cache, df)
+        assert metadatos == processor.metadatos
+        assert {type(v) for v in df_cache['Nro Calle/Cuadra'].dropna()} == {int, str}
+    print("✓ OutView con columnas mezcladas vuelve con sus tipos")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - ResultCache")
+    print("=" * 60)
+
+    tests = [
+        ("Ida y vuelta", test_ida_y_vuelta),
+        ("Clave depende de factores", test_clave_depende_de_factores),
+        ("Desalojo LRU", test_desalojo_lru),
+        ("Consolidado reutiliza Monitor", test_consolidado_reutiliza_monitor),
+        ("OutView con tipos mezclados", test_outview_tipos_mezclados),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,135 @@
+"""
+Tests básicos para la exportación Parquet / Arrow IPC de Mougli
+
+Valida que:
+1. Monitor se exporte a Parquet (zstd) y Arrow IPC sin perder filas ni tipos
+2. Con Monitor y OutView se genere un zip con las 3 tablas
+3. tarea_consolidado y tarea_lote acepten formato
+"""
+
+import os
+import sys
+import tempfile
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.processors.monitor_processor import MonitorProcessor  # noqa: E402
+from app.processors.mougli_tareas import tarea_consolidado, tarea_lote  # noqa: E402
+
+MONITOR_TXT = '\n'.join([
+    'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+    '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+] + [
+    f'{i}|TV|{i:02d}/03/2023|MARCA {i % 3}|{i * 100}|BEBIDAS|GASEOSAS|LIMA'
+    for i in range(1, 21)
+])
+
+
+def _outview_xlsx(ruta: str) -> str:
+    sys.path.insert(0, os.path.dirname(__file__))
+    from test_outview_processor import _crear_outview_crudo, _crear_xlsx_outview
+
+    with open(ruta, 'wb') as f:
+        f.write(_crear_xlsx_outview(_crear_outview_crudo(20)))
+    return ruta
+
+
+def test_exportar_monitor():
+    """Test que Parquet y Arrow conservan filas, columnas y fechas"""
+    processor = MonitorProcessor()
+    df = processor.procesar(MONITOR_TXT)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_parquet = os.path.join(tmp, 'monitor.parquet')
+        processor.exportar_tabla(ruta_parquet, 'parquet')
+
+        metadata = pq.ParquetFile(ruta_parquet).metadata
+        assert metadata.row_group(0).column(0).compression == 'ZSTD'
+        leido = pq.read_table(ruta_parquet).to_pandas()
+        assert list(leido.columns) == list(df.columns)
+        assert len(leido) == len(df)
+        assert pd.api.types.is_datetime64_any_dtype(leido['DIA'])
+
+        ruta_arrow = os.path.join(tmp, 'monitor.arrow')
+        processor.exportar_tabla(ruta_arrow, 'arrow')
+        with pa.memory_map(ruta_arrow) as fuente:
+            tabla = pa.ipc.open_file(fuente).read_all()
+        assert tabla.num_rows == len(df)
+        assert tabla.column_names == list(df.columns)
+    print("✓ Monitor exportado a Parquet (zstd) y Arrow IPC")
+
+
+def test_consolidado_zip():
+    """Test que con ambos archivos se genera un zip con las 3 tablas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = os.path.join(tmp, 'm.txt')
+        with open(monitor, 'w', encoding='utf-8') as f:
+            f.write(MONITOR_TXT)
+        outview = _outview_xlsx(os.path.join(tmp, 'o.xlsx'))
+        salida = os.path.join(tmp, 'salida.zip')
+
+        pasos = []
+        tarea_consolidado(monitor, outview, salida, progreso=lambda p, t, m: pasos.append(m), formato='parquet')
+
+        with zipfile.ZipFile(salida) as zf:
+            assert zf.namelist() == ['Monitor.parquet', 'OutView.parquet', 'Consolidado.parquet']
+            with zf.open('Monitor.parquet') as f:
+                filas_monitor = pq.read_table(f).num_rows
+            with zf.open('OutView.parquet') as f:
+                filas_outview = pq.read_table(f).num_rows
+            with zf.open('Consolidado.parquet') as f:
+                assert pq.read_table(f).num_rows == filas_monitor + filas_outview
+        assert pasos[-1] == "Parquet generado"
+    print("✓ Zip con Monitor, OutView y Consolidado")
+
+
+def test_lote_arrow_una_tabla():
+    """Test que con un solo tipo la salida es un único archivo Arrow"""
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = os.path.join(tmp, 'm.txt')
+        with open(monitor, 'w', encoding='utf-8') as f:
+            f.write(MONITOR_TXT)
+        salida = os.path.join(tmp, 'salida.arrow')
+
+        tarea_lote([monitor], [], salida, formato='arrow')
+
+        with pa.memory_map(salida) as fuente:
+            assert pa.ipc.open_file(fuente).read_all().num_rows == 20
+    print("✓ Lote de un tipo exportado a un archivo Arrow")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Exportación Parquet / Arrow")
+    print("=" * 60)
+
+    tests = [
+        ("Exportar Monitor", test_exportar_monitor),
+        ("Consolidado zip", test_consolidado_zip),
+        ("Lote Arrow una tabla", test_lote_arrow_una_tabla),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
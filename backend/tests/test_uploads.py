@@ -0,0 +1,233 @@
+"""
+Tests básicos para la ingesta de uploads a disco
+
+Valida que:
+1. El upload se copie a un temporal con su tamaño y SHA-256
+2. Un archivo más grande que el límite se rechace y no deje temporal
+3. La dependencia valide la extensión y borre el temporal al terminar
+   (también la variante de varios archivos por campo)
+4. El Content-Length se compare contra MAX_UPLOAD_SIZE_MB
+5. El middleware corte con 413 mientras recibe el body (también chunked)
+6. tarea_monitor use el SHA-256 de la ingesta como clave de caché
+"""
+
+import asyncio
+import glob
+import hashlib
+import io
+import os
+import sys
+import tempfile
+
+from fastapi import Depends, FastAPI, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+# Agregar el directorio backend al path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings  # noqa: E402
+from app.core.result_cache import ResultCache  # noqa: E402
+from app.core.uploads import (  # noqa: E402
+    LimiteUploadMiddleware, UploadEnDisco, content_length_excedido, guardar_upload, upload_en_disco,
+    uploads_en_disco
+)
+from app.processors.mougli_tareas import tarea_monitor  # noqa: E402
+
+MONITOR_TXT = '\n'.join([
+    'Kantar IBOPE Media', 'Reporte Monitor', 'Periodo', 'Usuario',
+    '#|MEDIO|DIA|MARCA|INVERSION|SECTOR|CATEGORIA|REGION/ÁMBITO',
+    '1|TV|01/03/2023|MARCA A|1000|BEBIDAS|GASEOSAS|LIMA',
+]).encode('utf-8')
+
+
+def _temporales():
+    return set(glob.glob(os.path.join(settings.UPLOAD_TMP_DIR or tempfile.gettempdir(), 'sireset_upload_*')))
+
+
+def test_guardar_upload():
+    """Test que el upload queda en disco con tamaño y SHA-256 correctos"""
+    contenido = os.urandom(3 * settings.UPLOAD_CHUNK_KB * 1024 + 17)
+    upload = UploadFile(io.BytesIO(contenido), filename='datos.txt')
+
+    archivo = asyncio.run(guardar_upload(upload, max_mb=10, origen='Monitor'))
+    try:
+        assert archivo.tamano == len(contenido)
+        assert archivo.sha256 == hashlib.sha256(contenido).hexdigest()
+        assert archivo.ruta.endswith('.txt')
+        with open(archivo.ruta, 'rb') as f:
+            assert f.read() == contenido
+    finally:
+        archivo.borrar()
+
+    assert not os.path.exists(archivo.ruta)
+    print("✓ Upload copiado por chunks con tamaño y SHA-256")
+
+
+def test_rechazo_por_tamano():
+    """Test que al superar el límite se corta con 400 sin dejar temporal"""
+    antes = _temporales()
+    upload = UploadFile(io.BytesIO(b'x' * (2 * 1024 * 1024)), filename='grande.txt')
+
+    try:
+        asyncio.run(guardar_upload(upload, max_mb=1, origen='Monitor'))
+    except HTTPException as e:
+        assert e.status_code == 400
+        assert 'Monitor muy grande' in e.detail
+    else:
+        raise AssertionError("Se esperaba HTTPException 400")
+
+    assert _temporales() == antes
+    print("✓ Upload demasiado grande rechazado y temporal borrado")
+
+
+def test_dependencia():
+    """Test que la dependencia valida extensión y borra el temporal al terminar"""
+    app = FastAPI()
+    rutas = []
+
+    @app.post("/subir")
+    async def subir(monitor: UploadEnDisco = Depends(upload_en_disco("monitor", [".txt"], 1, "Monitor"))):
+        rutas.append(monitor.ruta)
+        assert os.path.exists(monitor.ruta)
+        return {"tamano": monitor.tamano, "sha256": monitor.sha256}
+
+    client = TestClient(app)
+
+    r = client.post("/subir", files={"monitor": ("m.txt", MONITOR_TXT)})
+    assert r.status_code == 200
+    assert r.json() == {"tamano": len(MONITOR_TXT), "sha256": hashlib.sha256(MONITOR_TXT).hexdigest()}
+    assert not os.path.exists(rutas[0])
+
+    r = client.post("/subir", files={"monitor": ("m.csv", MONITOR_TXT)})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Monitor debe ser .txt"
+
+    r = client.post("/subir", files={"monitor": ("m.txt", b'x' * (1024 * 1024 + 1))})
+    assert r.status_code == 400
+    assert len(rutas) == 1
+    print("✓ Extensión y tamaño validados, temporal borrado tras el request")
+
+
+def test_dependencia_varios_archivos():
+    """Test que el campo repetido llega como lista, en orden y con límite de archivos"""
+    app = FastAPI()
+
+    @app.post("/lote")
+    async def lote(monitores=Depends(uploads_en_disco("monitor", [".txt"], 1, "Monitor", max_archivos=2))):
+        return [m.filename for m in monitores]
+
+    client = TestClient(app)
+
+    r = client.post("/lote", files=[("monitor", ("enero.txt", b"a")), ("monitor", ("febrero.txt", b"b"))])
+    assert r.json() == ["enero.txt", "febrero.txt"]
+
+    r = client.post("/lote", data={"otro": "x"})
+    assert r.json() == []
+
+    r = client.post("/lote", files=[("monitor", (f"{i}.txt", b"a")) for i in range(3)])
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Demasiados archivos Monitor (3). Máximo: 2"
+    print("✓ Lista de uploads en orden, vacía si no se envían, con máximo de archivos")
+
+
+def test_content_length_excedido():
+    """Test que el límite global compara el Content-Length declarado"""
+    limite = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+    assert content_length_excedido(str(limite + 1))
+    assert not content_length_excedido(str(limite))
+    assert not content_length_excedido(None)
+    assert not content_length_excedido('abc')
+    print("✓ Content-Length comparado contra MAX_UPLOAD_SIZE_MB")
+
+
+def test_middleware_limite():
+    """Test que el límite global se aplica al recibir el body, con o sin Content-Length"""
+    anterior = settings.MAX_UPLOAD_SIZE_MB
+    settings.MAX_UPLOAD_SIZE_MB = 1
+    try:
+        app = FastAPI()
+        app.add_middleware(LimiteUploadMiddleware)
+        llamadas = []
+
+        @app.post("/subir")
+        async def subir(monitor: UploadEnDisco = Depends(upload_en_disco("monitor", [".txt"], 5, "Monitor"))):
+            llamadas.append(monitor.tamano)
+            return {"tamano": monitor.tamano}
+
+        client = TestClient(app)
+
+        def multipart(datos: bytes):
+            yield b'--limite\r\nContent-Disposition: form-data; name="monitor"; filename="m.txt"\r\n\r\n'
+            for i in range(0, len(datos), 64 * 1024):
+                yield datos[i:i + 64 * 1024]
+            yield b'\r\n--limite--\r\n'
+
+        cabeceras = {"Content-Type": "multipart/form-data; boundary=limite"}
+
+        r = client.post("/subir", content=multipart(b'x' * 1000), headers=cabeceras)
+        assert r.status_code == 200 and r.json() == {"tamano": 1000}
+
+        # Chunked (sin Content-Length): se corta al pasar el límite mientras se recibe
+        r = client.post("/subir", content=multipart(b'x' * (2 * 1024 * 1024)), headers=cabeceras)
+        assert r.status_code == 413
+        assert r.json()["detail"].startswith("Request muy grande")
+
+        # Con Content-Length declarado: se rechaza sin recibir el body
+        r = client.post("/subir", files={"monitor": ("m.txt", b'x' * (2 * 1024 * 1024))})
+        assert r.status_code == 413
+        assert llamadas == [1000]
+    finally:
+        settings.MAX_UPLOAD_SIZE_MB = anterior
+    print("✓ 413 al recibir más de MAX_UPLOAD_SIZE_MB, con o sin Content-Length")
+
+
+def test_tarea_usa_sha256_de_la_ingesta():
+    """Test que tarea_monitor lee desde la ruta y reutiliza el SHA-256 como clave"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, 'monitor.txt')
+        with open(ruta, 'wb') as f:
+            f.write(MONITOR_TXT)
+
+        cache = ResultCache(os.path.join(tmp, 'cache'), 10 * 1024 * 1024)
+        archivo = UploadEnDisco(ruta, 'monitor.txt', len(MONITOR_TXT), hashlib.sha256(MONITOR_TXT).hexdigest())
+
+        assert tarea_monitor(archivo, os.path.join(tmp, 'a.xlsx'), cache) > 0
+        assert tarea_monitor(ruta, os.path.join(tmp, 'b.xlsx'), cache) > 0
+        assert len(os.listdir(cache.directorio)) == 1
+    print("✓ Misma entrada de caché con el SHA-256 de la ingesta o hasheando la ruta")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests y muestra resumen"""
+    print("=" * 60)
+    print("TESTS BÁSICOS - Ingesta de uploads")
+    print("=" * 60)
+
+    tests = [
+        ("Guardar upload", test_guardar_upload),
+        ("Rechazo por tamaño", test_rechazo_por_tamano),
+        ("Dependencia FastAPI", test_dependencia),
+        ("Dependencia varios archivos", test_dependencia_varios_archivos),
+        ("Content-Length excedido", test_content_length_excedido),
+        ("Middleware de límite", test_middleware_limite),
+        ("Tarea usa SHA-256 de la ingesta", test_tarea_usa_sha256_de_la_ingesta),
+    ]
+
+    fallidos = 0
+    for name, test_func in tests:
+        print(f"\n{name}:")
+        print("-" * 60)
+        try:
+            test_func()
+        except AssertionError as e:
+            fallidos += 1
+            print(f"✗ FAIL: {e}")
+
+    print()
+    print(f"Total: {len(tests) - fallidos}/{len(tests)} tests pasaron")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())